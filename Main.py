@@ -1,22 +1,42 @@
-from PyQt5.QtWidgets import QApplication, QMessageBox
-from gestores.GestorVentanas import GestorVentanas
+# La traza se importa primero para que sus tiempos cuenten desde el inicio del programa
+from motor.TrazaArranque import TRAZA
+
+import argparse
+import sys
+
+with TRAZA.etapa('importar PyQt5'):
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+with TRAZA.etapa('importar GestorVentanas y vistas'):
+    from gestores.GestorVentanas import GestorVentanas
 
 def main():
     """
     Punto de entrada principal para la aplicación.
     Inicializa la aplicación, configura el gestor de ventanas y maneja errores críticos.
 
+    Opciones:
+        - --startup-report: Imprime cuánto tarda cada etapa del arranque (importaciones,
+          lectura de los CSV, construcción del modelo y primer pintado).
+
     Excepciones manejadas:
         - Exception: Cualquier error inesperado durante el arranque de la aplicación.
     """
+    parser = argparse.ArgumentParser(description="Sistema de recomendación de películas.")
+    parser.add_argument('--startup-report', action='store_true', help="Imprime el desglose del tiempo de arranque.")
+    args, argumentos_qt = parser.parse_known_args()
+    TRAZA.imprimir = args.startup_report
+
     try:
-        app = QApplication([])
+        with TRAZA.etapa('crear QApplication'):
+            app = QApplication(sys.argv[:1] + argumentos_qt)
 
-        # Crear instancia del gestor de ventanas
-        gestor = GestorVentanas()
+        # Crear instancia del gestor de ventanas (reutiliza la aplicación creada)
+        with TRAZA.etapa('crear GestorVentanas'):
+            gestor = GestorVentanas()
 
         # Mostrar la ventana de login al inicio
-        gestor.mostrar_login()
+        with TRAZA.etapa('crear la ventana de inicio de sesión'):
+            gestor.mostrar_login()
 
         # Ejecutar la aplicación
         app.exec_()
@@ -0,0 +1,599 @@
+import argparse
+import http.client
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from urllib.parse import urlencode, urlsplit
+import pandas as pd
+from benchmarks.Rendimiento import preparar_escala, resumir
+
+# Mezcla de sesiones por defecto: cada sesión es una secuencia de pasos y se elige según su peso.
+# Los pasos pueden fijar sus parámetros (`texto`, `titulo`, `puntuacion`, `cantidad`, `espera`);
+# los que faltan se eligen al azar durante la prueba.
+MEZCLA = [
+    {'nombre': 'navegacion', 'peso': 5, 'pasos': [
+        {'op': 'login'}, {'op': 'azar'}, {'op': 'detalles'}, {'op': 'azar'}, {'op': 'detalles'},
+        {'op': 'buscar'}, {'op': 'similares'}
+    ]},
+    {'nombre': 'votacion', 'peso': 3, 'pasos': [
+        {'op': 'login'}, {'op': 'azar'}, {'op': 'buscar'}, {'op': 'detalles'}, {'op': 'votar'},
+        {'op': 'votar'}, {'op': 'recomendar'}, {'op': 'valoraciones'}
+    ]},
+    {'nombre': 'recomendaciones', 'peso': 2, 'pasos': [
+        {'op': 'login'}, {'op': 'recomendar'}, {'op': 'detalles'}
+    ]}
+]
+
+class ErrorCarga(Exception):
+    """
+    Respuesta incorrecta de una operación durante la prueba de carga.
+    """
+
+# Método para extraer los títulos de un resultado
+"""
+Parámetros:
+    - resultado (list): Lista de títulos o de diccionarios con `titulo` o `title`.
+
+Retorno:
+    - List[str]: Títulos del resultado.
+"""
+def _titulos(resultado):
+    titulos = []
+    for elemento in resultado or []:
+        if isinstance(elemento, str):
+            titulos.append(elemento)
+        elif isinstance(elemento, dict) and (elemento.get('titulo') or elemento.get('title')):
+            titulos.append(elemento.get('titulo') or elemento.get('title'))
+    return titulos
+
+class ClienteMotor:
+    """
+    Cliente que llama directamente a un `Motor` compartido por todos los usuarios virtuales.
+    Cada método devuelve los títulos del resultado (para elegir los pasos siguientes) o lanza
+    `ErrorCarga` si la operación no se completó.
+    """
+
+    def __init__(self, motor):
+        self.motor = motor
+
+    def login(self, usuario, password):
+        valido, mensaje = self.motor.validar_usuario(usuario, password)
+        if not valido:
+            raise ErrorCarga(mensaje)
+        return []
+
+    def azar(self, cantidad):
+        return _titulos(self.motor.al_azar(cantidad))
+
+    def detalles(self, titulo):
+        if self.motor.detalles(titulo) is None:
+            raise ErrorCarga(f"La película '{titulo}' no existe.")
+        return []
+
+    def buscar(self, texto):
+        return _titulos(self.motor.buscar(texto))
+
+    def similares(self, titulo):
+        return _titulos(self.motor.similares(titulo))
+
+    def votar(self, usuario, titulo, puntuacion):
+        mensaje = self.motor.votar(usuario, titulo, puntuacion)
+        if not mensaje.startswith("Votación registrada"):
+            raise ErrorCarga(mensaje)
+        return []
+
+    def recomendar(self, usuario, cantidad):
+        return _titulos(self.motor.recomendar(usuario, cantidad))
+
+    def valoraciones(self, usuario):
+        return _titulos(self.motor.valoraciones(usuario))
+
+class ClienteHTTP:
+    """
+    Cliente del servicio HTTP (`motor.Servidor` o `motor.ServidorMultiproceso`). Cada usuario
+    virtual tiene su propia conexión persistente, que se vuelve a abrir si se pierde.
+    """
+
+    def __init__(self, url, espera_maxima=30.0):
+        partes = urlsplit(url)
+        self.host = partes.hostname or '127.0.0.1'
+        self.puerto = partes.port or 80
+        self.espera_maxima = espera_maxima
+        self.conexion = None
+
+    # Método privado para hacer una petición
+    """
+    Parámetros:
+        - metodo (str): 'GET' o 'POST'.
+        - ruta (str): Ruta del servicio.
+        - parametros (dict): Consulta (GET) o cuerpo JSON (POST).
+
+    Retorno:
+        - Cuerpo JSON de la respuesta.
+
+    Excepciones:
+        - ErrorCarga: Si la respuesta no es 200.
+    """
+    def _pedir(self, metodo, ruta, parametros):
+        if self.conexion is None:
+            self.conexion = http.client.HTTPConnection(self.host, self.puerto, timeout=self.espera_maxima)
+        try:
+            if metodo == 'GET':
+                self.conexion.request('GET', f"{ruta}?{urlencode(parametros)}")
+            else:
+                self.conexion.request('POST', ruta, body=json.dumps(parametros),
+                                      headers={'Content-Type': 'application/json'})
+            respuesta = self.conexion.getresponse()
+            cuerpo = respuesta.read()
+            if respuesta.getheader('Connection', '').lower() == 'close':
+                self.cerrar()
+        except (OSError, http.client.HTTPException):
+            self.cerrar()
+            raise
+        datos = json.loads(cuerpo) if cuerpo else None
+        if respuesta.status != 200:
+            error = datos.get('error') if isinstance(datos, dict) else ''
+            raise ErrorCarga(f"HTTP {respuesta.status}: {error}")
+        return datos
+
+    def cerrar(self):
+        if self.conexion is not None:
+            self.conexion.close()
+            self.conexion = None
+
+    def login(self, usuario, password):
+        datos = self._pedir('POST', '/validar', {'usuario': usuario, 'password': password})
+        if not datos.get('valido'):
+            raise ErrorCarga(datos.get('mensaje'))
+        return []
+
+    def azar(self, cantidad):
+        return _titulos(self._pedir('GET', '/azar', {'cantidad': cantidad}))
+
+    def detalles(self, titulo):
+        self._pedir('GET', '/detalles', {'titulo': titulo})
+        return []
+
+    def buscar(self, texto):
+        return _titulos(self._pedir('GET', '/buscar', {'q': texto}))
+
+    def similares(self, titulo):
+        return _titulos(self._pedir('GET', '/similares', {'titulo': titulo}))
+
+    def votar(self, usuario, titulo, puntuacion):
+        datos = self._pedir('POST', '/votar', {'usuario': usuario, 'titulo': titulo, 'puntuacion': puntuacion})
+        if not datos.get('mensaje', '').startswith("Votación registrada"):
+            raise ErrorCarga(datos.get('mensaje'))
+        return []
+
+    def recomendar(self, usuario, cantidad):
+        return _titulos(self._pedir('GET', '/recomendaciones', {'usuario': usuario, 'cantidad': cantidad}))
+
+    def valoraciones(self, usuario):
+        return _titulos(self._pedir('GET', '/valoraciones', {'usuario': usuario}))
+
+class GeneradorCarga:
+    """
+    Generador de carga: `concurrencia` usuarios virtuales (hilos) repiten sesiones de la mezcla
+    durante `duracion` segundos, con un tiempo de reflexión aleatorio entre pasos (distribución
+    exponencial de media `espera`). Cada usuario virtual inicia sesión con un usuario real del
+    archivo de usuarios.
+
+    Con `grabar=True` se guardan las sesiones ejecutadas con todos sus parámetros resueltos,
+    de modo que se pueden repetir exactamente pasándolas como mezcla.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - fabrica_cliente (callable): Crea el cliente de cada usuario virtual.
+        - sesiones (List[dict]): Mezcla de sesiones (ver `MEZCLA`).
+        - credenciales (dict): Usuario -> contraseña.
+        - titulos (List[str]): Títulos del catálogo.
+        - concurrencia (int, opcional): Usuarios virtuales simultáneos.
+        - duracion (float, opcional): Segundos de prueba.
+        - espera (float, opcional): Media del tiempo de reflexión entre pasos, en segundos.
+        - semilla (int, opcional): Semilla de las elecciones aleatorias.
+        - grabar (bool, opcional): Si se guardan las sesiones ejecutadas.
+    """
+    def __init__(self, fabrica_cliente, sesiones, credenciales, titulos, concurrencia=8, duracion=30.0,
+                 espera=0.5, semilla=0, grabar=False):
+        self.fabrica_cliente = fabrica_cliente
+        self.sesiones = sesiones
+        self.pesos = [float(s.get('peso', 1)) for s in sesiones]
+        self.credenciales = credenciales
+        self.usuarios = list(credenciales)
+        self.titulos = list(titulos)
+        self.concurrencia = concurrencia
+        self.duracion = duracion
+        self.espera = espera
+        self.semilla = semilla
+        self.grabar = grabar
+
+        self.cerrojo = threading.Lock()
+        # operación -> duraciones de las llamadas correctas y fallidas
+        self.tiempos = {}
+        self.errores = Counter()
+        self.mensajes_error = {}
+        self.sesiones_completadas = Counter()
+        self.grabadas = []
+
+    # Método privado para completar los parámetros de un paso
+    """
+    Parámetros:
+        - paso (dict): Paso de la sesión.
+        - estado (dict): Usuario de la sesión y títulos vistos en el paso anterior.
+        - rng (random.Random): Generador de la sesión.
+
+    Retorno:
+        - dict: Paso con todos sus parámetros.
+    """
+    def _resolver(self, paso, estado, rng):
+        paso = dict(paso)
+        op = paso['op']
+        if op in ('detalles', 'similares', 'votar') and 'titulo' not in paso:
+            paso['titulo'] = rng.choice(estado['vistos'] or self.titulos)
+        if op == 'votar' and 'puntuacion' not in paso:
+            paso['puntuacion'] = rng.randint(1, 5)
+        if op == 'buscar' and 'texto' not in paso:
+            titulo = rng.choice(self.titulos)
+            largo = rng.randint(3, 8)
+            inicio = rng.randint(0, max(0, len(titulo) - largo))
+            paso['texto'] = titulo[inicio:inicio + largo].strip() or titulo
+        if op in ('azar', 'recomendar') and 'cantidad' not in paso:
+            paso['cantidad'] = 12 if op == 'azar' else 10
+        return paso
+
+    # Método privado para ejecutar un paso
+    """
+    Parámetros:
+        - cliente: Cliente del usuario virtual.
+        - paso (dict): Paso con todos sus parámetros.
+        - usuario (str): Usuario de la sesión.
+
+    Retorno:
+        - List[str]: Títulos devueltos por la operación.
+    """
+    def _ejecutar_paso(self, cliente, paso, usuario):
+        op = paso['op']
+        if op == 'login':
+            return cliente.login(usuario, self.credenciales.get(usuario, ''))
+        if op == 'azar':
+            return cliente.azar(paso['cantidad'])
+        if op == 'detalles':
+            return cliente.detalles(paso['titulo'])
+        if op == 'buscar':
+            return cliente.buscar(paso['texto'])
+        if op == 'similares':
+            return cliente.similares(paso['titulo'])
+        if op == 'votar':
+            return cliente.votar(usuario, paso['titulo'], paso['puntuacion'])
+        if op == 'recomendar':
+            return cliente.recomendar(usuario, paso['cantidad'])
+        if op == 'valoraciones':
+            return cliente.valoraciones(usuario)
+        raise ErrorCarga(f"Operación desconocida: {op}")
+
+    # Método privado con el bucle de un usuario virtual
+    """
+    Parámetros:
+        - indice (int): Número del usuario virtual.
+        - fin (float): Instante (`time.monotonic`) en que termina la prueba.
+    """
+    def _usuario_virtual(self, indice, fin):
+        rng = random.Random(self.semilla * 1000003 + indice)
+        cliente = self.fabrica_cliente()
+        tiempos, errores, mensajes = {}, Counter(), {}
+        completadas, grabadas = Counter(), []
+        try:
+            while time.monotonic() < fin:
+                sesion = rng.choices(self.sesiones, self.pesos)[0]
+                usuario = sesion.get('usuario') or rng.choice(self.usuarios)
+                estado = {'vistos': []}
+                pasos = []
+                for paso in sesion['pasos']:
+                    if time.monotonic() >= fin:
+                        break
+                    paso = self._resolver(paso, estado, rng)
+                    pasos.append(paso)
+                    inicio = time.perf_counter()
+                    try:
+                        vistos = self._ejecutar_paso(cliente, paso, usuario)
+                        if vistos:
+                            estado['vistos'] = vistos
+                    except Exception as e:
+                        errores[paso['op']] += 1
+                        mensajes.setdefault(paso['op'], f"{type(e).__name__}: {e}")
+                    tiempos.setdefault(paso['op'], []).append(time.perf_counter() - inicio)
+
+                    espera = paso.get('espera', rng.expovariate(1 / self.espera) if self.espera > 0 else 0)
+                    paso['espera'] = espera
+                    if espera > 0:
+                        time.sleep(min(espera, max(0.0, fin - time.monotonic())))
+                else:
+                    completadas[sesion.get('nombre', 'sesion')] += 1
+                if self.grabar and pasos:
+                    grabadas.append({'nombre': sesion.get('nombre', 'sesion'), 'usuario': usuario, 'pasos': pasos})
+        finally:
+            if hasattr(cliente, 'cerrar'):
+                cliente.cerrar()
+            with self.cerrojo:
+                for op, lista in tiempos.items():
+                    self.tiempos.setdefault(op, []).extend(lista)
+                self.errores.update(errores)
+                for op, mensaje in mensajes.items():
+                    self.mensajes_error.setdefault(op, mensaje)
+                self.sesiones_completadas.update(completadas)
+                self.grabadas.extend(grabadas)
+
+    # Método para ejecutar la prueba
+    """
+    Lanza los usuarios virtuales, espera a que terminen y resume los resultados.
+
+    Retorno:
+        - dict: Duración, sesiones completadas, resumen de cada operación (percentiles,
+          errores y operaciones por segundo de reloj) y totales.
+    """
+    def ejecutar(self):
+        inicio = time.monotonic()
+        fin = inicio + self.duracion
+        hilos = [threading.Thread(target=self._usuario_virtual, args=(i, fin), name=f'usuario-{i}')
+                 for i in range(self.concurrencia)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        segundos = time.monotonic() - inicio
+
+        operaciones = {}
+        for op, tiempos in sorted(self.tiempos.items()):
+            resumen = resumir(tiempos)
+            resumen['errores'] = self.errores[op]
+            resumen['tasa_error'] = self.errores[op] / len(tiempos)
+            resumen['rendimiento'] = len(tiempos) / segundos
+            if op in self.mensajes_error:
+                resumen['ejemplo_error'] = self.mensajes_error[op]
+            operaciones[op] = resumen
+
+        total = sum(len(t) for t in self.tiempos.values())
+        errores = sum(self.errores.values())
+        return {
+            'segundos': segundos,
+            'concurrencia': self.concurrencia,
+            'espera_s': self.espera,
+            'sesiones_completadas': dict(self.sesiones_completadas),
+            'operaciones': operaciones,
+            'total': {
+                'n': total,
+                'errores': errores,
+                'tasa_error': errores / total if total else 0.0,
+                'rendimiento': total / segundos,
+                'latencia': resumir([t for lista in self.tiempos.values() for t in lista])
+            }
+        }
+
+# Método para leer las credenciales del archivo de usuarios
+"""
+Parámetros:
+    - ruta_usuarios (str): Archivo CSV de usuarios.
+
+Retorno:
+    - dict: Usuario -> contraseña.
+"""
+def leer_credenciales(ruta_usuarios):
+    from motor.AlmacenUsuarios import AlmacenUsuarios
+    usuarios_df, _ = AlmacenUsuarios(ruta_usuarios).leer()
+    usuarios_df = usuarios_df.dropna(subset=['Nombre de usuario'])
+    return dict(zip(usuarios_df['Nombre de usuario'].astype(str), usuarios_df['Contraseña'].fillna('').astype(str)))
+
+# Método para medir la contención del almacén de usuarios
+"""
+Resume las escrituras en el archivo de usuarios durante la prueba, por separado de las
+latencias de las sesiones: escrituras confirmadas (por la generación del archivo, de
+cualquier proceso) y, en la prueba en proceso, los conflictos de escritura optimista, el
+tiempo dentro de `AlmacenUsuarios.modificar` y la espera por el bloqueo del archivo.
+
+Parámetros:
+    - ruta_usuarios (str): Archivo de usuarios usado en la prueba.
+    - generacion_inicial (int): Generación del archivo al empezar.
+    - almacenes (list, opcional): Almacenes del motor en proceso, con sus contadores ya a cero.
+    - votaciones (dict, opcional): Resumen de la operación `votar`.
+
+Retorno:
+    - dict: Estadísticas de contención del almacén.
+"""
+def contencion_almacen(ruta_usuarios, generacion_inicial, almacenes=None, votaciones=None):
+    from motor.AlmacenUsuarios import AlmacenUsuarios
+    from motor.Instrumentacion import REGISTRO
+
+    generacion = AlmacenUsuarios(ruta_usuarios).generacion()
+    contencion = {
+        'archivo': ruta_usuarios,
+        'escrituras_confirmadas': generacion - generacion_inicial if generacion is not None else None
+    }
+    if almacenes is None:
+        return contencion
+
+    escrituras = sum(a.escrituras for a in almacenes)
+    conflictos = sum(a.conflictos for a in almacenes)
+    metricas = REGISTRO.como_json()['operaciones']
+    modificar = metricas.get('AlmacenUsuarios.modificar', {})
+    bloqueo = metricas.get('AlmacenUsuarios.espera_bloqueo', {})
+    contencion.update({
+        'escrituras': escrituras,
+        'conflictos': conflictos,
+        'conflictos_por_escritura': conflictos / escrituras if escrituras else 0.0,
+        # Los percentiles del registro son el límite superior de su intervalo del histograma
+        'modificar_media_ms': modificar.get('media_ms'),
+        'modificar_p95_ms': modificar.get('p95_ms'),
+        'modificar_p99_ms': modificar.get('p99_ms'),
+        'espera_bloqueo_p95_ms': bloqueo.get('p95_ms'),
+        'espera_bloqueo_total_s': bloqueo.get('segundos_total', 0.0)
+    })
+    # Fracción del tiempo de las votaciones que se pasa escribiendo en el archivo
+    if votaciones and votaciones.get('n') and modificar.get('llamadas'):
+        contencion['fraccion_votar_en_almacen'] = modificar['segundos_total'] / (votaciones['media_ms'] / 1000 * votaciones['n'])
+    return contencion
+
+# Método para ejecutar la prueba contra el motor en proceso
+"""
+Copia los datos de la escala a un directorio temporal (las votaciones no modifican los archivos
+del proyecto), construye el motor y lanza la carga con un cliente por usuario virtual.
+
+Parámetros:
+    - escala (str): 'real' o '<películas>x<usuarios>' (ver `benchmarks.Rendimiento`).
+    - **opciones: Argumentos de `GeneradorCarga` (salvo el cliente, las credenciales y los títulos).
+
+Retorno:
+    - dict: Resultados de la prueba, el tiempo de construcción del modelo y la contención del almacén.
+"""
+def probar_en_proceso(escala, **opciones):
+    from motor.Instrumentacion import REGISTRO
+    from motor.Motor import Motor
+
+    with tempfile.TemporaryDirectory(prefix='carga-') as directorio:
+        ruta_peliculas, ruta_usuarios = preparar_escala(escala, directorio, opciones.get('semilla', 0))
+        inicio = time.perf_counter()
+        motor = Motor(ruta_peliculas, ruta_usuarios).precargar()
+        segundos_modelo = time.perf_counter() - inicio
+
+        almacenes = [motor.peliculas.almacen, motor.usuarios.almacen]
+        for almacen in almacenes:
+            almacen.escrituras = almacen.conflictos = 0
+        REGISTRO.reiniciar()
+        generacion_inicial = almacenes[0].generacion() or 0
+
+        generador = GeneradorCarga(
+            lambda: ClienteMotor(motor), credenciales=leer_credenciales(ruta_usuarios),
+            titulos=motor.peliculas.peliculas_df['title'].dropna().astype(str).tolist(), **opciones
+        )
+        resultados = generador.ejecutar()
+        resultados.update({
+            'modo': 'proceso',
+            'escala': escala,
+            'segundos_modelo': segundos_modelo,
+            'almacen': contencion_almacen(ruta_usuarios, generacion_inicial, almacenes,
+                                          resultados['operaciones'].get('votar'))
+        })
+        return resultados, generador
+
+# Método para ejecutar la prueba contra un servicio HTTP
+"""
+Parámetros:
+    - url (str): Dirección del servicio, por ejemplo `http://127.0.0.1:8000`.
+    - ruta_catalogo (str): CSV de películas del servicio (para elegir títulos).
+    - ruta_usuarios (str): CSV de usuarios del servicio (credenciales y contención).
+    - **opciones: Argumentos de `GeneradorCarga`.
+
+Retorno:
+    - dict: Resultados de la prueba y la contención del almacén.
+"""
+def probar_http(url, ruta_catalogo, ruta_usuarios, **opciones):
+    from motor.AlmacenUsuarios import AlmacenUsuarios
+
+    titulos = pd.read_csv(ruta_catalogo, usecols=['title'])['title'].dropna().astype(str).tolist()
+    generacion_inicial = AlmacenUsuarios(ruta_usuarios).generacion() or 0
+    generador = GeneradorCarga(
+        lambda: ClienteHTTP(url), credenciales=leer_credenciales(ruta_usuarios), titulos=titulos, **opciones
+    )
+    resultados = generador.ejecutar()
+    resultados.update({
+        'modo': 'http',
+        'url': url,
+        'almacen': contencion_almacen(ruta_usuarios, generacion_inicial)
+    })
+    return resultados, generador
+
+# Método para mostrar los resultados
+"""
+Parámetros:
+    - resultados (dict): Resultados de `probar_en_proceso` o `probar_http`.
+"""
+def imprimir(resultados):
+    destino = resultados.get('url') or f"motor en proceso, escala {resultados.get('escala')}"
+    print(f"\n== {destino}: {resultados['concurrencia']} usuarios virtuales, {resultados['segundos']:.1f} s, "
+          f"espera media {resultados['espera_s']} s")
+    if 'segundos_modelo' in resultados:
+        print(f"Modelo construido en {resultados['segundos_modelo']:.2f} s (no cuenta en la prueba).")
+    sesiones = ', '.join(f"{nombre} {n}" for nombre, n in sorted(resultados['sesiones_completadas'].items()))
+    print(f"Sesiones completadas: {sesiones or 'ninguna'}")
+
+    print(f"{'operación':14} {'n':>7} {'errores':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'op/s':>9}")
+    for op, datos in resultados['operaciones'].items():
+        print(f"{op:14} {datos['n']:>7} {datos['errores']:>8} {datos['p50_ms']:>9.2f} {datos['p95_ms']:>9.2f} "
+              f"{datos['p99_ms']:>9.2f} {datos['rendimiento']:>9.1f}")
+    total = resultados['total']
+    if total['n']:
+        print(f"{'total':14} {total['n']:>7} {total['errores']:>8} {total['latencia']['p50_ms']:>9.2f} "
+              f"{total['latencia']['p95_ms']:>9.2f} {total['latencia']['p99_ms']:>9.2f} {total['rendimiento']:>9.1f}")
+    print(f"Tasa de error: {total['tasa_error']:.2%}")
+    for op, datos in resultados['operaciones'].items():
+        if 'ejemplo_error' in datos:
+            print(f"  {op}: {datos['ejemplo_error']}")
+
+    almacen = resultados['almacen']
+    print(f"\nAlmacén de usuarios ({almacen['archivo']}):")
+    print(f"  escrituras confirmadas: {almacen['escrituras_confirmadas']}")
+    if 'conflictos' in almacen:
+        print(f"  conflictos: {almacen['conflictos']} ({almacen['conflictos_por_escritura']:.2f} por escritura)")
+        if almacen['modificar_media_ms'] is not None:
+            print(f"  modificar: media {almacen['modificar_media_ms']:.2f} ms, p95 <= {almacen['modificar_p95_ms']:.0f} ms, "
+                  f"p99 <= {almacen['modificar_p99_ms']:.0f} ms")
+        if almacen['espera_bloqueo_p95_ms'] is not None:
+            print(f"  espera por el bloqueo: p95 <= {almacen['espera_bloqueo_p95_ms']:.1f} ms, "
+                  f"total {almacen['espera_bloqueo_total_s']:.3f} s")
+        if 'fraccion_votar_en_almacen' in almacen:
+            print(f"  tiempo de las votaciones dentro del almacén: {almacen['fraccion_votar_en_almacen']:.0%}")
+
+# Punto de entrada: python -m benchmarks.CargaSesiones
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Prueba de carga con sesiones de usuario simultáneas.")
+    parser.add_argument('--url', help="Servicio HTTP a probar (por defecto, el motor en este proceso).")
+    parser.add_argument('--escala', default='real', help="Datos del motor en proceso: 'real' o '<películas>x<usuarios>'.")
+    parser.add_argument('--catalogo', default='peliculas_final_imagenes.csv', help="CSV de películas del servicio HTTP.")
+    parser.add_argument('--usuarios', default='usuarios.csv', help="CSV de usuarios del servicio HTTP.")
+    parser.add_argument('--concurrencia', type=int, default=8, help="Usuarios virtuales simultáneos.")
+    parser.add_argument('--duracion', type=float, default=30.0, help="Segundos de prueba.")
+    parser.add_argument('--espera', type=float, default=0.5, help="Tiempo medio de reflexión entre pasos (0 sin espera).")
+    parser.add_argument('--mezcla', help="JSON con la lista de sesiones a repetir (por defecto, la mezcla incluida).")
+    parser.add_argument('--grabar', help="Archivo JSON donde guardar las sesiones ejecutadas, para repetirlas con --mezcla.")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla de las elecciones aleatorias.")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados.")
+    args = parser.parse_args()
+
+    sesiones = MEZCLA
+    if args.mezcla:
+        with open(args.mezcla, encoding='utf-8') as f:
+            sesiones = json.load(f)
+        sesiones = sesiones.get('sesiones', []) if isinstance(sesiones, dict) else sesiones
+        if not sesiones:
+            sys.exit(f"'{args.mezcla}' no contiene sesiones.")
+
+    opciones = {
+        'sesiones': sesiones,
+        'concurrencia': args.concurrencia,
+        'duracion': args.duracion,
+        'espera': args.espera,
+        'semilla': args.semilla,
+        'grabar': bool(args.grabar)
+    }
+    if args.url:
+        resultados, generador = probar_http(args.url, args.catalogo, args.usuarios, **opciones)
+    else:
+        resultados, generador = probar_en_proceso(args.escala, **opciones)
+    resultados['fecha'] = datetime.now().isoformat(timespec='seconds')
+    imprimir(resultados)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en '{args.salida}'.")
+    if args.grabar:
+        with open(args.grabar, 'w', encoding='utf-8') as f:
+            json.dump({'sesiones': generador.grabadas}, f, indent=2, ensure_ascii=False)
+        print(f"Sesiones grabadas en '{args.grabar}' ({len(generador.grabadas)}).")
@@ -0,0 +1,283 @@
+import argparse
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+
+# Catálogo real del que se toma el vocabulario de las sinopsis, si existe
+CATALOGO = 'peliculas_final_imagenes.csv'
+
+# Filas generadas y escritas de cada vez; forma parte de la semilla de cada bloque,
+# así que cambiarla cambia los datos generados
+BLOQUE = 50_000
+
+# Columnas de `peliculas_final_imagenes.csv`, en su orden
+COLUMNAS_CATALOGO = [
+    'Unnamed: 0', 'title', 'year', 'synopsis', 'critic_score', 'people_score', 'consensus',
+    'total_reviews', 'total_ratings', 'type', 'rating', 'genre', 'original_language', 'director',
+    'producer', 'writer', 'release_date_(theaters)', 'release_date_(streaming)',
+    'box_office_(gross_usa)', 'runtime', 'production_co', 'sound_mix', 'aspect_ratio',
+    'view_the_collection', 'crew', 'link', 'poster_image_x', 'poster_image_y'
+]
+
+# Géneros del catálogo real, de más a menos frecuente
+GENEROS = [
+    'drama', 'documentary', 'comedy', 'adventure', 'mystery and thriller', 'fantasy',
+    'kids and family', 'horror', 'action', 'animation', 'romance', 'western', 'sci fi',
+    'crime', 'history', 'biography', 'musical', 'gay and lesbian', 'war', 'music', 'anime',
+    'other', 'sports and fitness'
+]
+
+NOMBRES = [
+    'James', 'Mary', 'John', 'Patricia', 'Robert', 'Jennifer', 'Michael', 'Linda', 'David',
+    'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica', 'Thomas', 'Sarah',
+    'Carlos', 'Lucía', 'Akira', 'Agnès', 'Pedro', 'Sofia', 'Ingmar', 'Greta', 'Wong', 'Chloé'
+]
+APELLIDOS = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez',
+    'Martinez', 'Hernandez', 'Lopez', 'Wilson', 'Anderson', 'Taylor', 'Moore', 'Jackson', 'Martin',
+    'Kurosawa', 'Varda', 'Almodóvar', 'Bergman', 'Gerwig', 'Kar-wai', 'Zhao', 'Campion', 'Lee'
+]
+CLASIFICACIONES = ['G', 'PG', 'PG-13', 'R', 'NR']
+IDIOMAS = ['English', 'English', 'English', 'English', 'French', 'Spanish', 'Japanese', 'Korean', 'German']
+MESES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# Probabilidad de cada puntuación (1 a 5): los usuarios votan sobre todo lo que les gusta
+PROBABILIDAD_PUNTUACION = [0.05, 0.10, 0.25, 0.35, 0.25]
+
+# Método para construir el modelo de vocabulario
+"""
+Obtiene las palabras de las sinopsis y su frecuencia relativa. Si existe el catálogo real,
+se usa su vocabulario; si no, se generan palabras con sílabas y frecuencias de Zipf.
+El resultado es el mismo en cada ejecución.
+
+Parámetros:
+    - catalogo (str): CSV del que leer las sinopsis.
+    - tamano (int): Número de palabras del vocabulario.
+
+Retorno:
+    - Tuple[np.ndarray, np.ndarray]: Palabras (de más a menos frecuente) y sus probabilidades.
+"""
+def modelo_vocabulario(catalogo=CATALOGO, tamano=5000):
+    frecuencias = Counter()
+    if os.path.exists(catalogo):
+        for sinopsis in pd.read_csv(catalogo, usecols=['synopsis'])['synopsis'].dropna():
+            frecuencias.update(re.findall(r"[a-z']+", sinopsis.lower()))
+    if len(frecuencias) >= 100:
+        comunes = sorted(frecuencias.items(), key=lambda par: (-par[1], par[0]))[:tamano]
+        palabras = np.array([p for p, _ in comunes], dtype=object)
+        pesos = np.array([n for _, n in comunes], dtype=float)
+    else:
+        silabas = ['ka', 'lo', 'mi', 'ra', 'te', 'su', 'no', 'vi', 'da', 'pe', 'zo', 'ri', 'an', 'el']
+        palabras = np.array([
+            silabas[i % 14] + silabas[(i // 14) % 14] + (silabas[(i // 196) % 14] if i >= 196 else '')
+            for i in range(tamano)
+        ], dtype=object)
+        pesos = 1 / np.arange(1, tamano + 1)
+    return palabras, pesos / pesos.sum()
+
+# Método privado para muestrear rangos con una ley de Zipf acotada
+"""
+Devuelve rangos en [0, n) con probabilidad aproximadamente proporcional a 1/(rango + 1),
+por inversión de la distribución continua, sin tablas del tamaño de `n`.
+"""
+def _zipf_acotada(rng, n, tamano):
+    return np.minimum(np.floor(np.power(n + 1.0, rng.random(tamano))).astype(np.int64) - 1, n - 1)
+
+# Método privado para dispersar rangos
+"""
+Convierte un rango de popularidad en un índice, de modo que las películas populares no sean
+siempre las primeras del catálogo. Es una permutación de [0, n).
+"""
+def _dispersar(rangos, n):
+    paso = 1_000_003
+    while math.gcd(paso, n) != 1:
+        paso += 2
+    return (rangos * paso + 7919) % n
+
+# Método para obtener los títulos de las películas
+"""
+Calcula el título de cada película a partir de su índice, sin estado: el catálogo y las
+votaciones de los usuarios obtienen los mismos títulos sin guardarlos en memoria.
+El índice al final garantiza que sean únicos.
+
+Parámetros:
+    - indices (np.ndarray): Índices de las películas.
+    - palabras (np.ndarray): Vocabulario del que tomar las palabras.
+    - semilla (int): Semilla de la generación.
+
+Retorno:
+    - List[str]: Títulos.
+"""
+def titulos(indices, palabras, semilla=0):
+    indices = np.asarray(indices, dtype=np.int64)
+    # Se saltan las palabras más frecuentes (artículos, preposiciones...)
+    candidatas = [p.capitalize() for p in palabras[100:] if len(p) >= 4][:2000] or ['Film']
+    candidatas = np.array(candidatas, dtype=object)
+    primera = candidatas[(indices * 2654435761 + semilla) % len(candidatas)]
+    segunda = candidatas[(indices * 40503 + 97 * semilla + 1) % len(candidatas)]
+    return [f"{a} {b} {i}" for a, b, i in zip(primera, segunda, indices)]
+
+# Método privado para generar nombres de personas
+"""
+Devuelve el nombre de cada persona a partir de su índice en una población de nombres.
+"""
+def _nombres(indices):
+    combinaciones = len(NOMBRES) * len(APELLIDOS)
+    return [
+        f"{NOMBRES[i % len(NOMBRES)]} {APELLIDOS[(i // len(NOMBRES)) % len(APELLIDOS)]}"
+        + (f" {i // combinaciones + 1}" if i >= combinaciones else '')
+        for i in indices
+    ]
+
+# Método para escribir un catálogo sintético
+"""
+Genera un catálogo con las columnas de `peliculas_final_imagenes.csv` y lo escribe por
+bloques, sin tenerlo entero en memoria. Las sinopsis se muestrean del modelo de vocabulario
+y los directores y géneros siguen distribuciones de Zipf.
+
+Parámetros:
+    - ruta (str): CSV de destino.
+    - peliculas (int): Número de películas.
+    - semilla (int): Semilla de la generación.
+    - modelo (tuple, opcional): Resultado de `modelo_vocabulario`.
+"""
+def escribir_catalogo(ruta, peliculas, semilla=0, modelo=None):
+    palabras, probabilidades = modelo if modelo is not None else modelo_vocabulario()
+    num_directores = max(50, peliculas // 8)
+
+    for numero, inicio in enumerate(range(0, peliculas, BLOQUE)):
+        rng = np.random.default_rng([semilla, 1, numero])
+        indices = np.arange(inicio, min(inicio + BLOQUE, peliculas))
+        n = len(indices)
+
+        # Sinopsis: entre 15 y 150 palabras del vocabulario
+        largos = np.clip(rng.normal(55, 20, n).astype(int), 15, 150)
+        muestra = palabras[rng.choice(len(palabras), int(largos.sum()), p=probabilidades)]
+        sinopsis = [' '.join(trozo).capitalize() + '.' for trozo in np.split(muestra, np.cumsum(largos)[:-1])]
+
+        # Géneros: de uno a tres, los más comunes con más probabilidad
+        num_generos = rng.integers(1, 4, n)
+        generos = _zipf_acotada(rng, len(GENEROS), (n, 3))
+        genero = [', '.join(dict.fromkeys(GENEROS[g] for g in fila[:k])) for fila, k in zip(generos, num_generos)]
+
+        directores = _nombres(_dispersar(_zipf_acotada(rng, num_directores, n), num_directores))
+        anios = rng.integers(1920, 2025, n)
+        minutos = rng.integers(75, 200, n)
+        critica = rng.integers(0, 101, n)
+        bloque = pd.DataFrame({
+            'Unnamed: 0': indices,
+            'title': titulos(indices, palabras, semilla),
+            'year': anios,
+            'synopsis': sinopsis,
+            'critic_score': critica,
+            'people_score': np.clip(critica + rng.normal(0, 15, n), 0, 100).round(),
+            'consensus': '',
+            'total_reviews': rng.integers(5, 500, n),
+            'total_ratings': [f"{10 ** int(e):,}+" for e in rng.integers(2, 6, n)],
+            'type': [g.split(', ')[0].title() for g in genero],
+            'rating': np.array(CLASIFICACIONES)[rng.integers(0, len(CLASIFICACIONES), n)],
+            'genre': genero,
+            'original_language': np.array(IDIOMAS)[rng.integers(0, len(IDIOMAS), n)],
+            'director': directores,
+            'producer': _nombres(rng.integers(0, 10 * num_directores, n)),
+            'writer': directores,
+            'release_date_(theaters)': [f"{MESES[m]} {d}, {a} wide" for m, d, a in zip(rng.integers(0, 12, n), rng.integers(1, 29, n), anios)],
+            'release_date_(streaming)': [f"{MESES[m]} {d}, {a + 1}" for m, d, a in zip(rng.integers(0, 12, n), rng.integers(1, 29, n), anios)],
+            'box_office_(gross_usa)': [f"${v:.1f}M" for v in rng.lognormal(2, 1.5, n)],
+            'runtime': [f"{m // 60}h {m % 60}m" if m % 60 else f"{m // 60}h" for m in minutos],
+            'production_co': '',
+            'sound_mix': '',
+            'aspect_ratio': '',
+            'view_the_collection': '',
+            'crew': _nombres(rng.integers(0, 10 * num_directores, n)),
+            'link': [f"http://www.rottentomatoes.com/m/sintetica_{i}" for i in indices],
+            'poster_image_x': '',
+            'poster_image_y': ''
+        }, columns=COLUMNAS_CATALOGO)
+        bloque.to_csv(ruta, index=False, mode='w' if numero == 0 else 'a', header=numero == 0)
+
+# Método para escribir una población de usuarios sintética
+"""
+Genera usuarios con las columnas de `usuarios.csv` y los escribe por bloques. El número de
+votaciones de cada usuario sigue una ley de potencias (muchos votan poco y pocos mucho) y
+las películas votadas, una ley de Zipf (unas pocas reciben la mayoría de los votos).
+
+Parámetros:
+    - ruta (str): CSV de destino.
+    - usuarios (int): Número de usuarios.
+    - peliculas (int): Número de películas del catálogo al que se refieren las votaciones.
+    - semilla (int): Semilla de la generación (la misma que la del catálogo).
+    - modelo (tuple, opcional): Resultado de `modelo_vocabulario` (el mismo que el del catálogo).
+    - max_votos (int): Máximo de votaciones por usuario.
+"""
+def escribir_usuarios(ruta, usuarios, peliculas, semilla=0, modelo=None, max_votos=1000):
+    palabras, _ = modelo if modelo is not None else modelo_vocabulario()
+
+    for numero, inicio in enumerate(range(0, usuarios, BLOQUE)):
+        rng = np.random.default_rng([semilla, 2, numero])
+        ids = np.arange(inicio, min(inicio + BLOQUE, usuarios)) + 1
+        num_votos = np.minimum(rng.zipf(1.8, len(ids)), min(max_votos, peliculas))
+
+        votadas = _dispersar(_zipf_acotada(rng, peliculas, int(num_votos.sum())), peliculas)
+        puntuaciones = rng.choice(5, len(votadas), p=PROBABILIDAD_PUNTUACION) + 1
+        titulos_votados = titulos(votadas, palabras, semilla)
+
+        votaciones = []
+        posicion = 0
+        for n in num_votos:
+            # Una película votada varias veces por el mismo usuario conserva la última puntuación
+            unicas = dict(zip(titulos_votados[posicion:posicion + n], puntuaciones[posicion:posicion + n]))
+            votaciones.append(str([{'title': t, 'rating': int(r)} for t, r in unicas.items()]))
+            posicion += n
+
+        bloque = pd.DataFrame({
+            'ID': ids,
+            'Nombre de usuario': [f"usuario{i}" for i in ids],
+            'Contraseña': [f"clave{i}" for i in ids],
+            'votaciones': votaciones,
+            'version': 1
+        })
+        bloque.to_csv(ruta, index=False, mode='w' if numero == 0 else 'a', header=numero == 0)
+
+# Método para generar un conjunto de datos completo
+"""
+Escribe en un directorio un catálogo y una población de usuarios coherentes entre sí.
+
+Parámetros:
+    - directorio (str): Directorio de destino (se crea si no existe).
+    - peliculas (int): Número de películas.
+    - usuarios (int): Número de usuarios.
+    - semilla (int): Semilla de la generación.
+
+Retorno:
+    - Tuple[str, str]: Rutas del catálogo y del archivo de usuarios.
+"""
+def generar(directorio, peliculas, usuarios, semilla=0):
+    os.makedirs(directorio, exist_ok=True)
+    ruta_peliculas = os.path.join(directorio, 'peliculas_final_imagenes.csv')
+    ruta_usuarios = os.path.join(directorio, 'usuarios.csv')
+    modelo = modelo_vocabulario()
+    escribir_catalogo(ruta_peliculas, peliculas, semilla, modelo)
+    escribir_usuarios(ruta_usuarios, usuarios, peliculas, semilla, modelo)
+    return ruta_peliculas, ruta_usuarios
+
+# Punto de entrada: python -m benchmarks.GeneradorDatos
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Genera un catálogo y usuarios sintéticos para pruebas de escala.")
+    parser.add_argument('--peliculas', type=int, default=10_000, help="Número de películas.")
+    parser.add_argument('--usuarios', type=int, default=10_000, help="Número de usuarios.")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla de la generación.")
+    parser.add_argument('--directorio', default='datos_sinteticos', help="Directorio de destino.")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    rutas = generar(args.directorio, args.peliculas, args.usuarios, args.semilla)
+    segundos = time.perf_counter() - inicio
+    for ruta in rutas:
+        print(f"'{ruta}': {os.path.getsize(ruta) / 1e6:.1f} MB", file=sys.stderr)
+    print(f"Generados {args.peliculas} películas y {args.usuarios} usuarios en {segundos:.1f} s.", file=sys.stderr)
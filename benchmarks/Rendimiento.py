@@ -0,0 +1,309 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+from benchmarks.GeneradorDatos import generar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Archivos reales del proyecto, usados para la escala 'real'
+CATALOGO = 'peliculas_final_imagenes.csv'
+USUARIOS = 'usuarios.csv'
+
+# Escalas por defecto: 'real' o '<películas>x<usuarios>'
+ESCALAS = ['real', '4000x1000']
+
+# Método para preparar los datos de una escala
+"""
+Escribe en `directorio` un catálogo y un archivo de usuarios del tamaño indicado.
+La escala 'real' copia los archivos del proyecto; el resto se genera con `GeneradorDatos`.
+
+Parámetros:
+    - escala (str): 'real' o '<películas>x<usuarios>', por ejemplo '4000x1000'.
+    - directorio (str): Directorio de destino.
+    - semilla (int): Semilla de los datos aleatorios.
+
+Retorno:
+    - Tuple[str, str]: Rutas del catálogo y del archivo de usuarios.
+"""
+def preparar_escala(escala, directorio, semilla=0):
+    if escala != 'real':
+        peliculas, usuarios = (int(n) for n in escala.lower().split('x'))
+        return generar(directorio, peliculas, usuarios, semilla)
+
+    ruta_peliculas = os.path.join(directorio, CATALOGO)
+    ruta_usuarios = os.path.join(directorio, USUARIOS)
+    shutil.copy(CATALOGO, ruta_peliculas)
+    shutil.copy(USUARIOS, ruta_usuarios)
+    return ruta_peliculas, ruta_usuarios
+
+# Método para resumir una serie de latencias
+"""
+Calcula los percentiles, la media y el rendimiento de una serie de medidas.
+
+Parámetros:
+    - tiempos (List[float]): Duración de cada llamada, en segundos.
+
+Retorno:
+    - dict: `n`, `p50_ms`, `p95_ms`, `p99_ms`, `media_ms` y `por_segundo`.
+"""
+def resumir(tiempos):
+    tiempos = np.asarray(tiempos, dtype=float)
+    if len(tiempos) == 0:
+        return {'n': 0}
+    p50, p95, p99 = np.percentile(tiempos, [50, 95, 99]) * 1000
+    total = float(tiempos.sum())
+    return {
+        'n': len(tiempos),
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99),
+        'media_ms': float(tiempos.mean() * 1000),
+        'por_segundo': len(tiempos) / total if total > 0 else float('inf')
+    }
+
+# Método para medir una operación
+"""
+Llama a una función con cada juego de argumentos y mide cada llamada.
+Las primeras llamadas sirven de calentamiento y no se cuentan.
+
+Parámetros:
+    - funcion (callable): Operación a medir.
+    - argumentos (List[tuple]): Argumentos de cada llamada.
+    - calentamiento (int): Llamadas iniciales que no se miden.
+
+Retorno:
+    - dict: Resumen de `resumir`.
+"""
+def medir(funcion, argumentos, calentamiento=3):
+    for args in argumentos[:calentamiento]:
+        funcion(*args)
+    tiempos = []
+    for args in argumentos[calentamiento:]:
+        inicio = time.perf_counter()
+        funcion(*args)
+        tiempos.append(time.perf_counter() - inicio)
+    return resumir(tiempos)
+
+# Método para obtener la memoria residente máxima del proceso
+"""
+Retorno:
+    - float: Pico de memoria residente en MB, o `None` si el sistema no lo permite.
+"""
+def rss_maximo_mb():
+    if resource is None:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB y macOS en bytes
+    return maximo / (1024 * 1024) if sys.platform == 'darwin' else maximo / 1024
+
+# Método para ejecutar las pruebas de una escala
+"""
+Prepara los datos de una escala en un directorio temporal y mide las operaciones
+principales de GestorPeliculas y GestorUsuarios. Se ejecuta en un proceso propio
+para que el pico de memoria corresponda solo a esta escala.
+
+Parámetros:
+    - escala (str): Escala a medir.
+    - repeticiones (int): Llamadas por operación de lectura.
+    - repeticiones_inicio (int): Construcciones de GestorPeliculas a medir.
+    - repeticiones_escritura (int): Votaciones a medir (cada una reescribe el archivo de usuarios).
+    - semilla (int): Semilla de los datos y de las consultas.
+
+Retorno:
+    - dict: Escala, tamaños, pico de memoria y resumen de cada operación.
+"""
+def ejecutar_escala(escala, repeticiones, repeticiones_inicio, repeticiones_escritura, semilla=0):
+    # Las importaciones van aquí para que el pico de memoria incluya la carga de las librerías
+    from motor.GestorPeliculas import GestorPeliculas
+    from motor.GestorUsuarios import GestorUsuarios
+
+    with tempfile.TemporaryDirectory(prefix='bench-') as directorio:
+        ruta_peliculas, ruta_usuarios = preparar_escala(escala, directorio, semilla)
+        rng = np.random.default_rng(semilla)
+        operaciones = {}
+
+        tiempos = []
+        for _ in range(repeticiones_inicio):
+            inicio = time.perf_counter()
+            gestor_peliculas = GestorPeliculas(ruta_peliculas, ruta_usuarios)
+            tiempos.append(time.perf_counter() - inicio)
+        operaciones['GestorPeliculas.__init__'] = resumir(tiempos)
+
+        titulos = gestor_peliculas.peliculas_df['title'].to_numpy()
+        usuarios_df = gestor_peliculas.usuarios_df
+        usuarios = usuarios_df['Nombre de usuario'].to_numpy()
+        claves = dict(zip(usuarios_df['Nombre de usuario'], usuarios_df['Contraseña'].astype(str)))
+
+        operaciones['recomendar_peliculas'] = medir(
+            gestor_peliculas.recomendar_peliculas,
+            [(titulos[i],) for i in rng.integers(0, len(titulos), repeticiones)]
+        )
+        operaciones['recomendar_peliculas_por_usuario'] = medir(
+            gestor_peliculas.recomendar_peliculas_por_usuario,
+            [(usuarios[i],) for i in rng.integers(0, len(usuarios), repeticiones)]
+        )
+
+        # Consultas de búsqueda: de 3 a 8 caracteres desde el inicio de una palabra de un título
+        consultas = []
+        for i in rng.integers(0, len(titulos), repeticiones):
+            titulo = str(titulos[i])
+            largo = int(rng.integers(3, 9))
+            palabras = [m.start() for m in re.finditer(r'\w+', titulo)] or [0]
+            inicio = palabras[int(rng.integers(0, len(palabras)))]
+            consultas.append((titulo[inicio:inicio + largo],))
+        operaciones['buscar_peliculas2'] = medir(gestor_peliculas.buscar_peliculas2, consultas)
+
+        operaciones['votar_pelicula'] = medir(
+            gestor_peliculas.votar_pelicula,
+            [(usuarios[u], titulos[t], int(r)) for u, t, r in zip(
+                rng.integers(0, len(usuarios), repeticiones_escritura),
+                rng.integers(0, len(titulos), repeticiones_escritura),
+                rng.integers(1, 6, repeticiones_escritura)
+            )],
+            calentamiento=1
+        )
+
+        gestor_usuarios = GestorUsuarios(ruta_usuarios)
+        operaciones['GestorUsuarios.validar_usuario'] = medir(
+            gestor_usuarios.validar_usuario,
+            [(usuarios[i], claves[usuarios[i]]) for i in rng.integers(0, len(usuarios), repeticiones)]
+        )
+
+        return {
+            'escala': escala,
+            'peliculas': len(titulos),
+            'usuarios': len(usuarios),
+            'rss_max_mb': rss_maximo_mb(),
+            'operaciones': operaciones
+        }
+
+# Método para ejecutar todas las escalas
+"""
+Ejecuta cada escala en un proceso nuevo y reúne los resultados.
+
+Parámetros:
+    - escalas (List[str]): Escalas a medir.
+    - **opciones: Argumentos de `ejecutar_escala`.
+
+Retorno:
+    - dict: Resultados con la fecha, el entorno y la lista de escalas.
+"""
+def ejecutar(escalas, **opciones):
+    contexto = multiprocessing.get_context('spawn')
+    resultados = []
+    for escala in escalas:
+        print(f"Midiendo escala {escala}...", file=sys.stderr)
+        with contexto.Pool(1) as pool:
+            resultados.append(pool.apply(ejecutar_escala, (escala,), opciones))
+    return {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'opciones': opciones,
+        'escalas': resultados
+    }
+
+# Método para comparar resultados con una línea base
+"""
+Compara el p95 de cada operación y el pico de memoria con los de una línea base.
+
+Parámetros:
+    - actual (dict): Resultados de `ejecutar`.
+    - base (dict): Resultados guardados con los que comparar.
+    - tolerancia (float): Empeoramiento relativo permitido (0.2 = 20 %).
+
+Retorno:
+    - Tuple[List[dict], List[dict]]: Todas las comparaciones y las que superan la tolerancia.
+"""
+def comparar(actual, base, tolerancia=0.2):
+    escalas_base = {e['escala']: e for e in base.get('escalas', [])}
+    comparaciones = []
+    for escala in actual['escalas']:
+        previa = escalas_base.get(escala['escala'])
+        if previa is None:
+            continue
+        metricas = [(op, 'p95_ms', datos.get('p95_ms'), previa['operaciones'].get(op, {}).get('p95_ms'))
+                    for op, datos in escala['operaciones'].items()]
+        metricas.append(('memoria', 'rss_max_mb', escala.get('rss_max_mb'), previa.get('rss_max_mb')))
+        for operacion, metrica, valor, valor_base in metricas:
+            if not valor or not valor_base:
+                continue
+            comparaciones.append({
+                'escala': escala['escala'],
+                'operacion': operacion,
+                'metrica': metrica,
+                'base': valor_base,
+                'actual': valor,
+                'cambio': valor / valor_base - 1
+            })
+    regresiones = [c for c in comparaciones if c['cambio'] > tolerancia]
+    return comparaciones, regresiones
+
+# Método para mostrar los resultados
+"""
+Imprime una tabla con los resultados de cada escala.
+
+Parámetros:
+    - resultados (dict): Resultados de `ejecutar`.
+"""
+def imprimir(resultados):
+    for escala in resultados['escalas']:
+        cabecera = f"\n== {escala['escala']}: {escala['peliculas']} películas, {escala['usuarios']} usuarios"
+        if escala['rss_max_mb'] is not None:
+            cabecera += f", RSS máx. {escala['rss_max_mb']:.0f} MB"
+        print(cabecera)
+        print(f"{'operación':36} {'n':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'op/s':>9}")
+        for operacion, datos in escala['operaciones'].items():
+            if not datos['n']:
+                continue
+            print(f"{operacion:36} {datos['n']:>5} {datos['p50_ms']:>9.2f} {datos['p95_ms']:>9.2f} "
+                  f"{datos['p99_ms']:>9.2f} {datos['por_segundo']:>9.1f}")
+
+# Punto de entrada: python -m benchmarks.Rendimiento
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Mide las operaciones principales del sistema a varias escalas.")
+    parser.add_argument('--escalas', nargs='+', default=ESCALAS, help="'real' o '<películas>x<usuarios>'.")
+    parser.add_argument('--repeticiones', type=int, default=200, help="Llamadas por operación de lectura.")
+    parser.add_argument('--repeticiones-inicio', type=int, default=3, help="Construcciones de GestorPeliculas.")
+    parser.add_argument('--repeticiones-escritura', type=int, default=20, help="Votaciones registradas.")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla de los datos y las consultas.")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument('--base', help="Resultados JSON con los que comparar.")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Empeoramiento permitido frente a la base.")
+    args = parser.parse_args()
+
+    resultados = ejecutar(
+        args.escalas,
+        repeticiones=args.repeticiones,
+        repeticiones_inicio=args.repeticiones_inicio,
+        repeticiones_escritura=args.repeticiones_escritura,
+        semilla=args.semilla
+    )
+    imprimir(resultados)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en '{args.salida}'.")
+
+    if args.base:
+        with open(args.base, encoding='utf-8') as f:
+            comparaciones, regresiones = comparar(resultados, json.load(f), args.tolerancia)
+        print(f"\nComparación con '{args.base}' (tolerancia {args.tolerancia:.0%}):")
+        for c in comparaciones:
+            marca = '  REGRESIÓN' if c in regresiones else ''
+            print(f"  {c['escala']:>12} {c['operacion']:36} {c['metrica']:>10} "
+                  f"{c['base']:>9.2f} -> {c['actual']:>9.2f} ({c['cambio']:+.0%}){marca}")
+        sys.exit(1 if regresiones else 0)
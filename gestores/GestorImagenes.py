@@ -0,0 +1,445 @@
+import heapq
+import itertools
+import os
+from collections import OrderedDict
+from PyQt5 import QtCore, QtGui, QtNetwork, sip
+from motor.Instrumentacion import registrar_cache
+from gestores.PaquetePosters import PaquetePosters, RUTA_PAQUETE
+
+# Tamaño de los pósteres en las cuadrículas
+ANCHO_POSTER = 150
+ALTO_POSTER = 225
+
+class _TareaDecodificacion(QtCore.QRunnable):
+    """
+    Tarea que decodifica y escala un póster fuera del hilo de la interfaz.
+    El resultado se entrega con la señal `_decodificada` del gestor, que llega al hilo
+    de la interfaz como señal encolada.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - gestor (GestorImagenes): Gestor que recibe la imagen decodificada.
+        - url (str): URL del póster.
+        - datos (bytes): Contenido descargado.
+    """
+    def __init__(self, gestor, url, datos):
+        super().__init__()
+        self.gestor = gestor
+        self.url = url
+        self.datos = datos
+
+    # Método que se ejecuta en el hilo del pool
+    """
+    Decodifica la imagen, la escala a 150x225 y la convierte al formato nativo de `QPixmap`
+    para que la conversión en el hilo de la interfaz sea inmediata.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al decodificar; se entrega una imagen nula.
+    """
+    def run(self):
+        try:
+            image = QtGui.QImage.fromData(self.datos)
+            if not image.isNull():
+                image = image.scaled(ANCHO_POSTER, ALTO_POSTER, QtCore.Qt.KeepAspectRatio)
+                image = image.convertToFormat(QtGui.QImage.Format_ARGB32_Premultiplied)
+        except Exception as e:
+            print(f"Error al decodificar imagen: {e}")
+            image = QtGui.QImage()
+        self.gestor._decodificada.emit(self.url, image)
+
+class GestorImagenes(QtCore.QObject):
+    """
+    Clase que gestiona la descarga y la caché de los pósteres de las películas.
+    Hay una única instancia compartida por todas las vistas.
+
+    La caché tiene dos niveles, más un paquete opcional de pósteres precalculados:
+        - Memoria: LRU acotado de `QPixmap` ya escalados a 150x225.
+        - Paquete: archivo `posters.pak` proyectado en memoria (ver `PaquetePosters`).
+        - Disco: `QNetworkDiskCache` con expulsión por tamaño, que sobrevive entre ejecuciones.
+
+    Las descargas pasan por un planificador con un único `QNetworkAccessManager`:
+        - Limita las descargas simultáneas por servidor.
+        - Las peticiones de una misma URL se agrupan en una sola descarga.
+        - Cuando queda un hueco libre se lanza primero el póster de una celda visible.
+        - Las peticiones de una cuadrícula se cancelan al limpiarla (`cancelar`).
+
+    La decodificación y el escalado se hacen en un `QThreadPool`; en el hilo de la
+    interfaz solo quedan `QPixmap.fromImage` y `setIcon`.
+    """
+
+    # Señal emitida cuando un póster está disponible (url, pixmap escalado)
+    imagen_lista = QtCore.pyqtSignal(str, QtGui.QPixmap)
+    # Señal emitida cuando un póster no se pudo obtener (url)
+    imagen_fallida = QtCore.pyqtSignal(str)
+    # Señal interna emitida desde el pool de decodificación (url, imagen escalada)
+    _decodificada = QtCore.pyqtSignal(str, QtGui.QImage)
+
+    _instancia = None
+
+    # Método para obtener la instancia compartida
+    """
+    Devuelve la instancia compartida del gestor de imágenes, creándola la primera vez.
+
+    Retorno:
+        - GestorImagenes: Instancia compartida.
+    """
+    @classmethod
+    def instancia(cls):
+        if cls._instancia is None:
+            cls._instancia = cls()
+        return cls._instancia
+
+    # Constructor de la clase
+    """
+    Inicializa las cachés y el gestor de red.
+
+    Parámetros:
+        - capacidad_memoria (int): Número máximo de pósteres en memoria.
+        - tamano_disco (int): Tamaño máximo de la caché en disco, en bytes.
+        - directorio (str, opcional): Carpeta de la caché en disco.
+        - max_por_servidor (int): Descargas simultáneas como máximo por servidor.
+        - ruta_paquete (str, opcional): Paquete de pósteres precalculados; se ignora si no existe.
+    """
+    def __init__(self, capacidad_memoria=500, tamano_disco=200 * 1024 * 1024, directorio=None, max_por_servidor=6,
+                 ruta_paquete=RUTA_PAQUETE):
+        super().__init__()
+        self.capacidad_memoria = capacidad_memoria
+        self.max_por_servidor = max_por_servidor
+
+        # Caché en memoria: url -> QPixmap escalado, en orden de uso
+        self.cache_memoria = OrderedDict()
+
+        # Pósteres precalculados
+        self.paquete = PaquetePosters.abrir(ruta_paquete)
+
+        # Caché en disco
+        if directorio is None:
+            base = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.CacheLocation)
+            directorio = os.path.join(base or os.path.expanduser('~/.cache'), 'posters')
+        self.cache_disco = QtNetwork.QNetworkDiskCache(self)
+        self.cache_disco.setCacheDirectory(directorio)
+        self.cache_disco.setMaximumCacheSize(tamano_disco)
+
+        # Un único gestor de red para todas las descargas
+        self.manager = QtNetwork.QNetworkAccessManager(self)
+        self.manager.setCache(self.cache_disco)
+        self.manager.finished.connect(self.onFinished)
+
+        # url -> descarga: {'servidor', 'orden', 'clave', 'destinos': [(botón o None, texto si falla, grupo)], 'reply'}
+        self.descargas = {}
+        # servidor -> montículo de (clave de prioridad, url) en espera / número de descargas en curso.
+        # Las entradas cuya clave ya no es la de su descarga están obsoletas y se saltan al sacarlas
+        self.colas = {}
+        self.en_curso = {}
+        # reply -> url
+        self.active_requests = {}
+        self._orden = itertools.count()
+
+        # Decodificación en segundo plano: url -> descarga cuya imagen se está decodificando
+        self.pool_decodificacion = QtCore.QThreadPool(self)
+        self.decodificando = {}
+        self._decodificada.connect(self._imagen_decodificada, QtCore.Qt.QueuedConnection)
+
+    # Método para consultar la caché en memoria
+    """
+    Devuelve el póster escalado de una URL si está en memoria o en el paquete.
+
+    Parámetros:
+        - url (str): URL del póster.
+
+    Retorno:
+        - QPixmap: Póster escalado, o `None` si hay que descargarlo.
+    """
+    def obtener(self, url):
+        pixmap = self.cache_memoria.get(url)
+        registrar_cache('posters_memoria', pixmap is not None)
+        if pixmap is not None:
+            self.cache_memoria.move_to_end(url)
+            return pixmap
+        return self._desde_paquete(url)
+
+    # Método privado para guardar un póster en memoria
+    """
+    Guarda un póster escalado en la caché en memoria, expulsando el menos usado si está llena.
+    """
+    def _guardar(self, url, pixmap):
+        self.cache_memoria[url] = pixmap
+        self.cache_memoria.move_to_end(url)
+        while len(self.cache_memoria) > self.capacidad_memoria:
+            self.cache_memoria.popitem(last=False)
+
+    # Método privado para leer un póster del paquete
+    """
+    Carga un póster del paquete precalculado y lo guarda en memoria. El póster ya está
+    escalado, así que solo hay que decodificar un JPEG pequeño.
+
+    Retorno:
+        - QPixmap: Póster, o `None` si no hay paquete o no contiene la URL.
+    """
+    def _desde_paquete(self, url):
+        if self.paquete is None:
+            return None
+        datos = self.paquete.obtener(url)
+        registrar_cache('posters_paquete', datos is not None)
+        if datos is None:
+            return None
+        image = QtGui.QImage()
+        if not image.loadFromData(datos):
+            return None
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self._guardar(url, pixmap)
+        return pixmap
+
+    # Método para asignar un póster a un botón
+    """
+    Muestra el póster de una URL en un botón. Si está en memoria o en el paquete se asigna
+    al momento; si no, se encola su descarga (que se sirve desde disco si ya se descargó). Si la URL
+    ya se está descargando, el botón se añade a esa descarga.
+
+    Parámetros:
+        - url (str): URL del póster.
+        - boton (QPushButton): Botón donde mostrar el póster.
+        - texto_sin_imagen (str): Texto a mostrar si no hay imagen.
+        - grupo (object, opcional): Propietario de la petición (normalmente la vista), para cancelarla con `cancelar`.
+    """
+    def asignar_a_boton(self, url, boton, texto_sin_imagen="Imagen no disponible", grupo=None):
+        if not url or not QtCore.QUrl(url).isValid():
+            boton.setText(texto_sin_imagen)
+            return
+
+        pixmap = self.obtener(url)
+        if pixmap is not None:
+            self._poner_icono(boton, pixmap)
+            return
+        self._encolar(url, (boton, texto_sin_imagen, grupo))
+
+    # Método para pedir un póster sin botón
+    """
+    Pide un póster que no está en memoria para quien lo pinte por su cuenta (por ejemplo,
+    un modelo de `GridPosters`). El resultado se anuncia con `imagen_lista` o
+    `imagen_fallida`. Se considera visible, porque solo se pide al pintarlo.
+
+    Parámetros:
+        - url (str): URL del póster.
+        - grupo (object, opcional): Propietario de la petición, para cancelarla con `cancelar`.
+    """
+    def solicitar(self, url, grupo=None):
+        if not url or not QtCore.QUrl(url).isValid():
+            self.imagen_fallida.emit(url)
+            return
+        self._encolar(url, (None, None, grupo))
+
+    # Método privado para encolar una petición
+    """
+    Añade un destino a la descarga de una URL, creándola si no existe.
+
+    Parámetros:
+        - url (str): URL del póster.
+        - destino (tuple): `(botón o None, texto si falla, grupo)`.
+    """
+    def _encolar(self, url, destino):
+        descarga = self.decodificando.get(url)
+        if descarga is not None:
+            descarga['destinos'].append(destino)
+            return
+
+        descarga = self.descargas.get(url)
+        if descarga is None:
+            descarga = {'servidor': QtCore.QUrl(url).host(), 'orden': next(self._orden), 'clave': None,
+                        'destinos': [], 'reply': None}
+            self.descargas[url] = descarga
+        descarga['destinos'].append(destino)
+
+        # Se encola como visible; si al sacarla no lo es, vuelve a la cola detrás de las visibles.
+        # Un destino nuevo puede hacerla visible, así que una descarga relegada se adelanta otra vez
+        if descarga['reply'] is None and (descarga['clave'] is None or descarga['clave'][0] > 0):
+            self._poner_en_cola(url, (0, descarga['orden']))
+        self._despachar(descarga['servidor'])
+
+    # Método privado para poner una descarga en la cola de su servidor
+    """
+    Parámetros:
+        - url (str): URL en espera.
+        - clave (tuple): Prioridad `(0 visible / 1 no visible, orden de llegada)`; la entrada
+          anterior de la misma descarga, si la hay, queda obsoleta.
+    """
+    def _poner_en_cola(self, url, clave):
+        descarga = self.descargas[url]
+        descarga['clave'] = clave
+        heapq.heappush(self.colas.setdefault(descarga['servidor'], []), (clave, url))
+
+    # Método privado para saber si una entrada de la cola sigue vigente
+    """
+    Retorno:
+        - bool: False si la descarga se canceló, ya se lanzó o se volvió a encolar con otra clave.
+    """
+    def _vigente(self, clave, url):
+        descarga = self.descargas.get(url)
+        return descarga is not None and descarga['reply'] is None and descarga['clave'] == clave
+
+    # Método para cancelar las peticiones de un grupo
+    """
+    Retira los botones de un grupo de las descargas pendientes. Las descargas que se
+    quedan sin botones se sacan de la cola o se abortan si ya estaban en curso.
+
+    Parámetros:
+        - grupo (object): Propietario de las peticiones (normalmente la vista que limpia su cuadrícula).
+        - urls (set, opcional): Solo se cancelan las peticiones de estas URLs; por defecto, todas las del grupo.
+    """
+    def cancelar(self, grupo, urls=None):
+        abortar = []
+        for url, descarga in list(self.descargas.items()):
+            if urls is not None and url not in urls:
+                continue
+            descarga['destinos'] = [d for d in descarga['destinos'] if d[2] is not grupo]
+            if not descarga['destinos']:
+                abortar.append(self._descartar(url))
+        # Las que ya se están decodificando terminan igualmente y quedan en la caché
+        for url, descarga in self.decodificando.items():
+            if urls is None or url in urls:
+                descarga['destinos'] = [d for d in descarga['destinos'] if d[2] is not grupo]
+
+        # Se quitan de las colas las entradas canceladas; cancelar ya recorre todas las descargas
+        for cola in self.colas.values():
+            cola[:] = [(clave, url) for clave, url in cola if self._vigente(clave, url)]
+            heapq.heapify(cola)
+
+        # Se aborta al final para que los huecos liberados no lancen descargas ya canceladas
+        for reply in abortar:
+            if reply is not None and reply.isRunning():
+                reply.abort()
+
+    # Método privado para descartar una descarga
+    """
+    Elimina una descarga de la cola o de las descargas en curso. Su entrada en la cola
+    queda obsoleta y se salta al sacarla.
+
+    Retorno:
+        - QNetworkReply: Petición en curso que el llamador debe abortar, o `None` si estaba en cola.
+    """
+    def _descartar(self, url):
+        return self.descargas.pop(url)['reply']
+
+    # Método privado para calcular la prioridad de una descarga
+    """
+    Las descargas con algún botón visible en pantalla (o pedidas sin botón) van primero;
+    a igualdad, por orden de llegada.
+
+    Retorno:
+        - tuple: Clave de ordenación (menor = más prioritaria).
+    """
+    def _prioridad(self, url):
+        descarga = self.descargas[url]
+        visible = any(
+            boton is None or (not sip.isdeleted(boton) and not boton.visibleRegion().isEmpty())
+            for boton, _, _ in descarga['destinos']
+        )
+        return (0 if visible else 1, descarga['orden'])
+
+    # Método privado para lanzar descargas en espera
+    """
+    Lanza las descargas más prioritarias de un servidor mientras haya huecos libres. Cada
+    descarga se comprueba al sacarla del montículo: si sus botones ya no existen se descarta
+    sin pedirla y si ya no es visible vuelve a la cola con menor prioridad.
+
+    Parámetros:
+        - servidor (str): Servidor cuyas descargas se lanzan.
+    """
+    def _despachar(self, servidor):
+        cola = self.colas.get(servidor, [])
+        while cola and self.en_curso.get(servidor, 0) < self.max_por_servidor:
+            clave, url = heapq.heappop(cola)
+            if not self._vigente(clave, url):
+                continue
+            descarga = self.descargas[url]
+            descarga['destinos'] = [d for d in descarga['destinos'] if d[0] is None or not sip.isdeleted(d[0])]
+            if not descarga['destinos']:
+                self._descartar(url)
+                continue
+            actual = self._prioridad(url)
+            if actual > clave:
+                self._poner_en_cola(url, actual)
+                continue
+
+            request = QtNetwork.QNetworkRequest(QtCore.QUrl(url))
+            request.setAttribute(QtNetwork.QNetworkRequest.CacheLoadControlAttribute, QtNetwork.QNetworkRequest.PreferCache)
+            reply = self.manager.get(request)
+            self.descargas[url]['reply'] = reply
+            self.active_requests[reply] = url
+            self.en_curso[servidor] = self.en_curso.get(servidor, 0) + 1
+
+    # Método privado para poner el icono en un botón
+    """
+    Asigna el póster como icono de un botón, si el botón sigue existiendo.
+    """
+    @staticmethod
+    def _poner_icono(boton, pixmap):
+        if boton is None or sip.isdeleted(boton):
+            return
+        boton.setIcon(QtGui.QIcon(pixmap))
+        boton.setIconSize(boton.size())
+
+    # Método para manejar la finalización de solicitudes de imagen
+    """
+    Envía los datos descargados al pool de decodificación y lanza la siguiente
+    descarga del mismo servidor.
+
+    Parámetros:
+        - reply (QtNetwork.QNetworkReply): Respuesta de la solicitud de imagen.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al leer la respuesta.
+    """
+    @QtCore.pyqtSlot(QtNetwork.QNetworkReply)
+    def onFinished(self, reply):
+        url = self.active_requests.pop(reply, None)
+        if url is None:
+            return
+        servidor = QtCore.QUrl(url).host()
+        self.en_curso[servidor] -= 1
+        try:
+            # Si se canceló (o se volvió a pedir después), esta respuesta ya no tiene destinatarios
+            descarga = self.descargas.get(url)
+            if descarga is None or descarga['reply'] is not reply:
+                return
+            del self.descargas[url]
+
+            desde_disco = reply.attribute(QtNetwork.QNetworkRequest.SourceIsFromCacheAttribute)
+            registrar_cache('posters_disco', bool(desde_disco))
+            self.decodificando[url] = descarga
+            self.pool_decodificacion.start(_TareaDecodificacion(self, url, bytes(reply.readAll())))
+        except Exception as e:
+            print(f"Error al cargar imagen: {e}")
+        finally:
+            reply.deleteLater()
+            self._despachar(servidor)
+
+    # Método para recibir una imagen decodificada
+    """
+    Convierte la imagen decodificada en `QPixmap`, la guarda en memoria y la asigna
+    a todos los botones que la esperaban. Se ejecuta en el hilo de la interfaz.
+
+    Parámetros:
+        - url (str): URL del póster.
+        - image (QtGui.QImage): Imagen ya escalada, o nula si no se pudo decodificar.
+    """
+    @QtCore.pyqtSlot(str, QtGui.QImage)
+    def _imagen_decodificada(self, url, image):
+        descarga = self.decodificando.pop(url, None)
+        if descarga is None:
+            return
+
+        if image.isNull():
+            for boton, texto_sin_imagen, _ in descarga['destinos']:
+                if boton is not None and not sip.isdeleted(boton):
+                    boton.setText(texto_sin_imagen)
+            self.imagen_fallida.emit(url)
+            return
+
+        pixmap = QtGui.QPixmap.fromImage(image)
+        self._guardar(url, pixmap)
+        for boton, _, _ in descarga['destinos']:
+            self._poner_icono(boton, pixmap)
+        self.imagen_lista.emit(url, pixmap)
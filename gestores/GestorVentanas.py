@@ -1,4 +1,8 @@
-from PyQt5.QtWidgets import QApplication, QMessageBox
+import os
+import sys
+from PyQt5.QtWidgets import QApplication, QMessageBox, QMainWindow, QStackedWidget, QAction
+from PyQt5.QtCore import Qt, QEvent, QObject, QUrl, pyqtSignal
+from PyQt5.QtGui import QDesktopServices
 from vistas.VistaLogin import VistaLogin
 from vistas.VistaPrincipal import VistaPrincipal
 from vistas.VistaRecomendaciones import VistaRecomendaciones
@@ -6,12 +10,39 @@ from vistas.VistaRegistro import VistaRegistro
 from vistas.VistaSinopsis import VistaSinopsis
 from vistas.VistaVotaciones import VistaVotaciones
 from vistas.VistaMisValoraciones import VistaMisValoraciones
-from gestores.GestorPeliculas import GestorPeliculas
+from motor.Motor import Motor
+from motor.Perfilador import PERFILADOR
+from motor.TrazaArranque import TRAZA
+
+class _PuenteCambios(QObject):
+    """
+    Lleva los cambios de datos del gestor de películas al hilo de la interfaz.
+    """
+    cambio = pyqtSignal(dict)
+
+class _VigiaPintado(QObject):
+    """
+    Filtro de eventos que marca en la traza de arranque el primer pintado de la ventana
+    y se retira después.
+    """
+
+    def eventFilter(self, objeto, evento):
+        if evento.type() == QEvent.Paint:
+            objeto.removeEventFilter(self)
+            TRAZA.marcar('primer pintado')
+            TRAZA.mostrar_informe()
+        return False
 
 class GestorVentanas:
     """
     Clase para gestionar las ventanas de la aplicación.
     Proporciona métodos para cambiar entre vistas y manejar la navegación.
+
+    Todas las vistas son páginas de un `QStackedWidget` dentro de una única ventana:
+    se crean la primera vez que se visitan y se conservan, así que navegar solo cambia
+    la página visible. Cuando cambian las votaciones, el gestor avisa a cada vista con
+    su método `refrescar(cambio)`, y al volver a mostrar una vista se llama a su método
+    `al_mostrar()`, si lo tiene.
     """
 
     # Constructor de la clase
@@ -23,7 +54,17 @@ class GestorVentanas:
     """
     def __init__(self):
         try:
-            self.app = QApplication([])
+            # Se reutiliza la aplicación si ya la creó Main.py
+            self.app = QApplication.instance() or QApplication(sys.argv[:1])
+
+            # Ventana única con una página por vista
+            self.ventana = QMainWindow()
+            self.ventana.resize(1200, 800)
+            self.pila = QStackedWidget()
+            self.ventana.setCentralWidget(self.pila)
+            self._crear_menu()
+            self.vigia_pintado = _VigiaPintado()
+            self.ventana.installEventFilter(self.vigia_pintado)
 
             # Inicializar vistas
             self.vista_login = None
@@ -37,12 +78,30 @@ class GestorVentanas:
             self.user_id = None
             self.username = None
 
-            # Instancia del GestorPeliculas
-            self.gestor_peliculas = GestorPeliculas()
+            # Motor de recomendación (sin interfaz), compartido por todas las vistas
+            self.motor = Motor()
+
+            # Los cambios de datos llegan a las vistas a través del bucle de eventos
+            self.puente_cambios = _PuenteCambios()
+            self.puente_cambios.cambio.connect(self._propagar_cambio, Qt.QueuedConnection)
+            self.motor.suscribir(self.puente_cambios.cambio.emit)
         except Exception as e:
             print(f"Error al inicializar GestorVentanas: {e}")
             QMessageBox.critical(None, "Error Crítico", f"No se pudo iniciar la aplicación: {e}")
 
+    # Propiedad con el gestor de películas
+    """
+    El gestor de películas del motor, compartido por todas las vistas. Se construye la
+    primera vez que se pide, así que pandas, scikit-learn y el modelo de recomendación
+    no retrasan la ventana de inicio de sesión.
+
+    Retorno:
+        - GestorPeliculas: Instancia compartida por todas las vistas.
+    """
+    @property
+    def gestor_peliculas(self):
+        return self.motor.peliculas
+
     # Método para establecer información del usuario
     """
     Establece el ID y el nombre de usuario del usuario actual.
@@ -58,6 +117,10 @@ class GestorVentanas:
         if not user_id or not username:
             print("Advertencia: user_id o username no válidos.")
             return
+        if self.username is not None and username != self.username:
+            # Las vistas ligadas al usuario anterior se vuelven a crear al visitarlas
+            for nombre in ('vista_votaciones', 'vista_mis_valoraciones', 'vista_recomendaciones'):
+                self._descartar_vista(nombre)
         self.user_id = user_id
         self.username = username
 
@@ -123,7 +186,7 @@ class GestorVentanas:
         try:
             if not self.vista_mis_valoraciones:
                 self.vista_mis_valoraciones = VistaMisValoraciones(self, username)
-            self.vista_mis_valoraciones.show()
+            self._cambiar_ventana(self.vista_mis_valoraciones)
         except Exception as e:
             print(f"Error al mostrar la ventana de mis valoraciones: {e}")
             QMessageBox.critical(None, "Error", f"Error al cargar la ventana de mis valoraciones: {e}")
@@ -169,7 +232,8 @@ class GestorVentanas:
 
     # Método para mostrar la ventana de recomendaciones
     """
-    Muestra la ventana de recomendaciones para el usuario actual.
+    Muestra la ventana de recomendaciones para el usuario actual. La vista se conserva
+    entre visitas; las votaciones nuevas le llegan como cambios de datos.
 
     Parámetros:
         - gestor_peliculas (GestorPeliculas): Instancia del gestor de películas.
@@ -180,8 +244,8 @@ class GestorVentanas:
     """
     def mostrar_recomendaciones(self, gestor_peliculas, username):
         try:
-            # Siempre reinicia la vista de recomendaciones para garantizar datos actualizados
-            self.vista_recomendaciones = VistaRecomendaciones(self, gestor_peliculas, username)
+            if not self.vista_recomendaciones:
+                self.vista_recomendaciones = VistaRecomendaciones(self, gestor_peliculas, username)
             self._cambiar_ventana(self.vista_recomendaciones)
         except Exception as e:
             print(f"Error al mostrar la ventana de recomendaciones: {e}")
@@ -189,33 +253,116 @@ class GestorVentanas:
 
     # Método privado para cambiar entre ventanas
     """
-    Cierra la ventana actual y abre una nueva.
+    Muestra la página de una vista en la ventana principal, añadiéndola a la pila la
+    primera vez. Las demás vistas se conservan ocultas con su estado.
 
     Parámetros:
-        - nueva_ventana: Instancia de la nueva ventana a mostrar.
+        - nueva_ventana: Vista a mostrar.
 
     Excepciones manejadas:
         - Exception: Cualquier error al cambiar entre ventanas.
     """
     def _cambiar_ventana(self, nueva_ventana):
         try:
-            # Cierra todas las ventanas visibles
-            for ventana in [
-                self.vista_login,
-                self.vista_principal,
-                self.vista_registro,
-                self.vista_sinopsis,
-                self.vista_recomendaciones,
-                self.vista_votaciones,
-                self.vista_mis_valoraciones
-            ]:
-                if ventana and ventana.isVisible():
-                    ventana.close()  # Cierra la ventana completamente
-            nueva_ventana.show()  # Muestra la nueva ventana
+            if self.pila.indexOf(nueva_ventana) < 0:
+                self.pila.addWidget(nueva_ventana)
+            self.pila.setCurrentWidget(nueva_ventana)
+            self.ventana.setWindowTitle(nueva_ventana.windowTitle())
+            if hasattr(nueva_ventana, 'al_mostrar'):
+                nueva_ventana.al_mostrar()
+            self.ventana.show()
         except Exception as e:
             print(f"Error al cambiar ventana: {e}")
             QMessageBox.critical(None, "Error", f"Error al cambiar de ventana: {e}")
 
+    # Método privado para crear el menú de la ventana
+    """
+    Crea el menú de herramientas, con el que se activa el perfilado de las operaciones
+    lentas (también con la variable de entorno SR_PERFILADO) y se abre la carpeta de perfiles.
+    """
+    def _crear_menu(self):
+        menu = self.ventana.menuBar().addMenu("Herramientas")
+
+        self.accion_perfilado = QAction("Perfilar operaciones lentas", self.ventana, checkable=True)
+        self.accion_perfilado.setChecked(PERFILADOR.activo)
+        self.accion_perfilado.toggled.connect(PERFILADOR.activar)
+        menu.addAction(self.accion_perfilado)
+
+        accion_carpeta = QAction("Abrir carpeta de perfiles", self.ventana)
+        accion_carpeta.triggered.connect(self._abrir_carpeta_perfiles)
+        menu.addAction(accion_carpeta)
+
+        accion_memoria = QAction("Informe de memoria", self.ventana)
+        accion_memoria.triggered.connect(self._mostrar_informe_memoria)
+        menu.addAction(accion_memoria)
+
+    # Método privado para abrir la carpeta de perfiles
+    """
+    Abre la carpeta de perfiles con el explorador de archivos del sistema.
+    """
+    def _abrir_carpeta_perfiles(self):
+        if not os.path.isdir(PERFILADOR.directorio):
+            QMessageBox.information(self.ventana, "Perfilado",
+                                    "Todavía no hay perfiles. Activa el perfilado y repite la operación lenta.")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(os.path.abspath(PERFILADOR.directorio)))
+
+    # Método privado para mostrar el informe de memoria
+    """
+    Muestra cuánta memoria ocupa cada estructura del gestor de películas y las
+    instancias de gestores que mantienen las vistas abiertas.
+    """
+    def _mostrar_informe_memoria(self):
+        try:
+            from motor.InformeMemoria import informe, texto_informe, formato_bytes
+            datos = informe(self.gestor_peliculas)
+            mensaje = QMessageBox(QMessageBox.Information, "Informe de memoria",
+                                  f"Estructuras del recomendador: {formato_bytes(datos['total_bytes'])}\n"
+                                  f"Instancias duplicadas de gestores: {formato_bytes(datos['duplicados_bytes'])}",
+                                  parent=self.ventana)
+            mensaje.setDetailedText(texto_informe(datos))
+            mensaje.exec_()
+        except Exception as e:
+            print(f"Error al generar el informe de memoria: {e}")
+            QMessageBox.critical(self.ventana, "Error", f"No se pudo generar el informe de memoria: {e}")
+
+    # Método privado para descartar una vista
+    """
+    Quita una vista de la pila y la destruye.
+
+    Parámetros:
+        - nombre (str): Atributo del gestor que guarda la vista.
+    """
+    def _descartar_vista(self, nombre):
+        vista = getattr(self, nombre)
+        if vista is not None:
+            self.pila.removeWidget(vista)
+            vista.deleteLater()
+            setattr(self, nombre, None)
+
+    # Método privado para avisar a las vistas de un cambio de datos
+    """
+    Llama al método `refrescar(cambio)` de las vistas creadas que lo tienen. Cada vista
+    decide si el cambio le afecta y, si no está visible, puede aplazar el refresco hasta
+    que se vuelva a mostrar.
+
+    Parámetros:
+        - cambio (dict): Cambio publicado por el gestor de películas.
+    """
+    def _propagar_cambio(self, cambio):
+        for vista in [
+            self.vista_principal,
+            self.vista_votaciones,
+            self.vista_mis_valoraciones,
+            self.vista_recomendaciones,
+            self.vista_sinopsis
+        ]:
+            if vista is not None and hasattr(vista, 'refrescar'):
+                try:
+                    vista.refrescar(cambio)
+                except Exception as e:
+                    print(f"Error al refrescar la vista {type(vista).__name__}: {e}")
+
     # Método para ejecutar la aplicación
     """
     Ejecuta la aplicación mostrando inicialmente la ventana de login.
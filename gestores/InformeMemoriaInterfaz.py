@@ -0,0 +1,36 @@
+import argparse
+import json
+from gestores.GestorVentanas import GestorVentanas
+from motor.InformeMemoria import informe, texto_informe
+
+# Método para crear la interfaz que se mide
+"""
+Crea el gestor de ventanas y abre las vistas de inicio para que el informe cuente las
+instancias de gestores que guarda cada una (más de una por clase son datos duplicados).
+
+Retorno:
+    - GestorVentanas: Gestor de ventanas con sus vistas creadas.
+"""
+def crear_interfaz():
+    gestor_ventanas = GestorVentanas()
+    gestor_ventanas.mostrar_login()
+    gestor_ventanas.mostrar_registro()
+    return gestor_ventanas
+
+# Punto de entrada: python -m gestores.InformeMemoriaInterfaz
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Informe de memoria del recomendador con la interfaz y sus vistas creadas.")
+    parser.add_argument('--objetivos', type=int, nargs='*', default=[10_000, 100_000, 1_000_000],
+                        help="Tamaños de catálogo a los que proyectar.")
+    parser.add_argument('--usuarios-objetivo', type=int, help="Usuarios de las proyecciones (por defecto, los actuales).")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar el informe.")
+    args = parser.parse_args()
+
+    gestor_ventanas = crear_interfaz()
+    datos = informe(gestor_ventanas.gestor_peliculas, args.objetivos, args.usuarios_objetivo)
+    print(texto_informe(datos))
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+        print(f"\nInforme guardado en '{args.salida}'.")
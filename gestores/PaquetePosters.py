@@ -0,0 +1,271 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Formato del paquete:
+#   cabecera  -> MAGIA (4 bytes), versión, número de pósteres, reservado (uint32 little-endian)
+#   índice    -> hashes de URL (uint64, ordenados), desplazamientos (uint64), longitudes (uint32)
+#   datos     -> JPEG de cada póster ya escalado a 150x225, uno tras otro
+MAGIA = b'PPK1'
+VERSION = 1
+CABECERA = struct.Struct('<4sIII')
+RUTA_PAQUETE = 'posters.pak'
+
+# Tamaño de los pósteres en las cuadrículas (el mismo que usa GestorImagenes)
+ANCHO_POSTER = 150
+ALTO_POSTER = 225
+
+# Método para calcular la clave de una URL
+"""
+Calcula el hash de 64 bits con el que se indexa una URL en el paquete.
+
+Parámetros:
+    - url (str): URL del póster.
+
+Retorno:
+    - int: Hash de la URL.
+"""
+def hash_url(url):
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little')
+
+class PaquetePosters:
+    """
+    Clase para leer un paquete de pósteres precalculado.
+
+    El archivo se proyecta en memoria con `mmap` y el índice se lee como arreglos NumPy
+    sin copiarlo, así que obtener un póster es una búsqueda binaria y un corte del
+    archivo, sin red ni aperturas de archivos por póster.
+    """
+
+    # Constructor de la clase
+    """
+    Abre y proyecta en memoria un paquete de pósteres.
+
+    Parámetros:
+        - ruta (str): Ruta del paquete.
+
+    Excepciones:
+        - ValueError: Si el archivo no es un paquete de pósteres válido.
+    """
+    def __init__(self, ruta=RUTA_PAQUETE):
+        self.ruta = ruta
+        with open(ruta, 'rb') as f:
+            self.mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magia, version, n, _ = CABECERA.unpack_from(self.mapa, 0)
+        if magia != MAGIA or version != VERSION:
+            self.mapa.close()
+            raise ValueError(f"'{ruta}' no es un paquete de pósteres válido.")
+
+        inicio = CABECERA.size
+        self.hashes = np.frombuffer(self.mapa, dtype='<u8', count=n, offset=inicio)
+        self.desplazamientos = np.frombuffer(self.mapa, dtype='<u8', count=n, offset=inicio + 8 * n)
+        self.longitudes = np.frombuffer(self.mapa, dtype='<u4', count=n, offset=inicio + 16 * n)
+
+    # Método para abrir el paquete si existe
+    """
+    Abre el paquete de la ruta indicada si existe y es válido.
+
+    Parámetros:
+        - ruta (str): Ruta del paquete.
+
+    Retorno:
+        - PaquetePosters: Paquete abierto, o `None` si no existe o no se puede leer.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al abrir el paquete.
+    """
+    @classmethod
+    def abrir(cls, ruta=RUTA_PAQUETE):
+        if not ruta or not os.path.exists(ruta):
+            return None
+        try:
+            return cls(ruta)
+        except Exception as e:
+            print(f"Error al abrir el paquete de pósteres: {e}")
+            return None
+
+    # Método para obtener los datos de un póster
+    """
+    Devuelve el JPEG escalado de una URL.
+
+    Parámetros:
+        - url (str): URL del póster.
+
+    Retorno:
+        - bytes: Datos del póster, o `None` si no está en el paquete.
+    """
+    def obtener(self, url):
+        clave = hash_url(url)
+        posicion = int(np.searchsorted(self.hashes, clave))
+        if posicion == len(self.hashes) or self.hashes[posicion] != clave:
+            return None
+        inicio = int(self.desplazamientos[posicion])
+        return self.mapa[inicio:inicio + int(self.longitudes[posicion])]
+
+    # Método para saber cuántos pósteres contiene el paquete
+    """
+    Retorno:
+        - int: Número de pósteres del paquete.
+    """
+    def __len__(self):
+        return len(self.hashes)
+
+# Método para escribir un paquete
+"""
+Escribe un paquete de pósteres con un reemplazo atómico.
+
+Parámetros:
+    - ruta (str): Ruta del paquete.
+    - posters (dict): Diccionario URL -> JPEG ya escalado.
+"""
+def escribir_paquete(ruta, posters):
+    claves = np.array([hash_url(url) for url in posters], dtype='<u8')
+    datos = list(posters.values())
+    orden = np.argsort(claves, kind='stable')
+    claves = claves[orden]
+    if len(claves) > 1 and (claves[1:] == claves[:-1]).any():
+        raise ValueError("Colisión de hash entre URLs de pósteres.")
+
+    n = len(claves)
+    longitudes = np.array([len(datos[i]) for i in orden], dtype='<u4')
+    inicio_datos = CABECERA.size + 20 * n
+    desplazamientos = (inicio_datos + np.concatenate(([0], np.cumsum(longitudes[:-1], dtype=np.uint64)))).astype('<u8')
+
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    fd, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix='.posters-', suffix='.pak')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(CABECERA.pack(MAGIA, VERSION, n, 0))
+        f.write(claves.tobytes())
+        f.write(desplazamientos[:n].tobytes())
+        f.write(longitudes.tobytes())
+        for i in orden:
+            f.write(datos[i])
+    os.chmod(ruta_temporal, 0o644)
+    os.replace(ruta_temporal, ruta)
+
+# Método para escalar un póster
+"""
+Decodifica una imagen, la escala al tamaño de la cuadrícula y la codifica en JPEG.
+
+Parámetros:
+    - datos (bytes): Imagen original.
+    - calidad (int): Calidad JPEG.
+
+Retorno:
+    - bytes: JPEG escalado, o `None` si la imagen no se puede decodificar.
+"""
+def escalar_poster(datos, calidad=85):
+    from PyQt5 import QtCore, QtGui
+
+    image = QtGui.QImage.fromData(datos)
+    if image.isNull():
+        return None
+    image = image.scaled(ANCHO_POSTER, ALTO_POSTER, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+    buffer = QtCore.QBuffer()
+    buffer.open(QtCore.QIODevice.WriteOnly)
+    image.save(buffer, 'JPG', calidad)
+    return bytes(buffer.data())
+
+# Método para obtener el póster original de una película
+"""
+Lee el póster original de una película desde un directorio local, un servidor sustituto
+o la URL del catálogo, por ese orden.
+
+En el directorio local el archivo debe llamarse como el identificador de la película
+(`Unnamed: 0`) o como el hash de la URL en hexadecimal, con cualquier extensión.
+
+Parámetros:
+    - url (str): URL del póster en el catálogo.
+    - movie_id (int): Identificador de la película.
+    - archivos (dict): Nombre sin extensión -> ruta de los archivos del directorio local.
+    - servidor (str, opcional): Origen (`http://host:puerto`) que sustituye al de la URL.
+    - timeout (float): Tiempo máximo de cada descarga, en segundos.
+
+Retorno:
+    - bytes: Imagen original, o `None` si no se encuentra.
+
+Excepciones manejadas:
+    - Exception: Cualquier error al leer o descargar la imagen.
+"""
+def leer_original(url, movie_id, archivos, servidor=None, timeout=20.0):
+    try:
+        ruta = archivos.get(str(movie_id)) or archivos.get(f"{hash_url(url):016x}")
+        if ruta is not None:
+            with open(ruta, 'rb') as f:
+                return f.read()
+        if servidor:
+            partes = urllib.parse.urlsplit(url)
+            url = servidor.rstrip('/') + urllib.parse.urlunsplit(('', '', partes.path, partes.query, ''))
+        with urllib.request.urlopen(url, timeout=timeout) as respuesta:
+            return respuesta.read()
+    except Exception as e:
+        print(f"Advertencia: No se pudo obtener el póster {url}. {e}")
+        return None
+
+# Método para construir el paquete desde el catálogo
+"""
+Obtiene todos los pósteres del catálogo, los escala y los guarda en un paquete.
+
+Parámetros:
+    - catalogo (str): Ruta del CSV de películas.
+    - salida (str): Ruta del paquete a generar.
+    - directorio (str, opcional): Directorio local con los pósteres originales.
+    - servidor (str, opcional): Servidor sustituto desde el que descargar los pósteres.
+    - hilos (int): Descargas simultáneas.
+
+Retorno:
+    - dict: Resumen con el número de pósteres empaquetados, fallidos y el tamaño del paquete.
+"""
+def construir_paquete(catalogo, salida=RUTA_PAQUETE, directorio=None, servidor=None, hilos=16):
+    peliculas_df = pd.read_csv(catalogo)
+    peliculas_df = peliculas_df[peliculas_df['poster_image_y'].notna()]
+    urls = peliculas_df['poster_image_y'].astype(str).tolist()
+    ids = peliculas_df['Unnamed: 0'].tolist() if 'Unnamed: 0' in peliculas_df else list(range(len(urls)))
+
+    archivos = {}
+    if directorio:
+        for nombre in os.listdir(directorio):
+            archivos[os.path.splitext(nombre)[0]] = os.path.join(directorio, nombre)
+
+    # Las descargas van en paralelo; el escalado, con Qt, en este hilo
+    unicas = dict(zip(urls, ids))
+    with ThreadPoolExecutor(max_workers=hilos) as pool:
+        originales = pool.map(lambda par: leer_original(par[0], par[1], archivos, servidor), unicas.items())
+        posters = {}
+        for url, datos in zip(unicas, originales):
+            escalado = escalar_poster(datos) if datos else None
+            if escalado is not None:
+                posters[url] = escalado
+
+    escribir_paquete(salida, posters)
+    resumen = {
+        'empaquetados': len(posters),
+        'fallidos': len(unicas) - len(posters),
+        'bytes': os.path.getsize(salida)
+    }
+    print(f"Paquete '{salida}': {resumen['empaquetados']} pósteres, {resumen['fallidos']} fallidos, {resumen['bytes']} bytes.")
+    return resumen
+
+# Punto de entrada: python -m gestores.PaquetePosters
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Construye el paquete de pósteres escalados del catálogo.")
+    parser.add_argument('--catalogo', default='peliculas_final_imagenes.csv', help="CSV de películas.")
+    parser.add_argument('--salida', default=RUTA_PAQUETE, help="Paquete a generar.")
+    parser.add_argument('--directorio', help="Directorio con los pósteres originales (<id>.* o <hash>.*).")
+    parser.add_argument('--servidor', help="Origen sustituto, por ejemplo http://127.0.0.1:8000.")
+    parser.add_argument('--hilos', type=int, default=16, help="Descargas simultáneas.")
+    args = parser.parse_args()
+
+    from PyQt5.QtGui import QGuiApplication
+    app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])  # Necesaria para los plugins de imagen
+    construir_paquete(args.catalogo, args.salida, args.directorio, args.servidor, args.hilos)
@@ -0,0 +1,271 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+import pandas as pd
+from motor.Instrumentacion import cronometro, medir
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueos consultivos, se mantiene la comprobación de generación
+    fcntl = None
+
+# Columnas del archivo de usuarios
+COLUMNAS_USUARIOS = ['ID', 'Nombre de usuario', 'Contraseña', 'votaciones', 'version']
+
+class AlmacenUsuarios:
+    """
+    Clase para leer y escribir el archivo de usuarios de forma segura cuando varios
+    procesos lo comparten.
+
+    Cada escritura se prepara fuera de cualquier bloqueo sobre una copia reciente del
+    archivo y se confirma con un reemplazo atómico. El bloqueo (`fcntl.flock` sobre
+    `<archivo>.lock`) solo se mantiene para comprobar el número de generación y hacer
+    el reemplazo. Si otro proceso ha escrito entretanto, se vuelve a leer el archivo y
+    se aplican de nuevo los cambios sobre los datos frescos (fusión al escribir).
+    Cada registro lleva un contador `version` que se incrementa al modificarlo.
+    """
+
+    # Constructor de la clase
+    """
+    Inicializa el almacén para un archivo de usuarios.
+
+    Parámetros:
+        - file_path (str): Ruta del archivo CSV de usuarios.
+        - max_reintentos (int): Intentos optimistas antes de escribir con el bloqueo tomado.
+    """
+    def __init__(self, file_path='usuarios.csv', max_reintentos=10):
+        self.file_path = file_path
+        self.ruta_bloqueo = f"{file_path}.lock"
+        self.max_reintentos = max_reintentos
+
+        # Estadísticas de contención
+        self.conflictos = 0
+        self.escrituras = 0
+
+    # Método privado para tomar el bloqueo exclusivo
+    """
+    Abre el archivo de bloqueo y toma un bloqueo exclusivo mientras dura el bloque `with`.
+
+    Retorno:
+        - int: Descriptor del archivo de bloqueo (que también guarda la generación).
+    """
+    @contextmanager
+    def _bloqueo(self):
+        fd = os.open(self.ruta_bloqueo, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                # La espera por el bloqueo mide la contención entre procesos que escriben
+                with cronometro('AlmacenUsuarios.espera_bloqueo'):
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    # Método privado para leer la generación desde un descriptor
+    """
+    Lee el número de generación guardado en el archivo de bloqueo.
+
+    Parámetros:
+        - fd (int): Descriptor del archivo de bloqueo.
+
+    Retorno:
+        - int: Generación actual, o `None` si el contenido no es válido (escritura en curso).
+    """
+    @staticmethod
+    def _leer_generacion_fd(fd):
+        contenido = os.pread(fd, 32, 0) if hasattr(os, 'pread') else os.read(fd, 32)
+        if not contenido:
+            return 0
+        try:
+            return int(contenido)
+        except ValueError:
+            return None
+
+    # Método para obtener la generación actual del archivo
+    """
+    Devuelve la generación actual del archivo de usuarios sin tomar el bloqueo.
+    La generación se incrementa en cada escritura confirmada.
+
+    Retorno:
+        - int: Generación actual, o `None` si se está escribiendo en ese instante.
+    """
+    def generacion(self):
+        try:
+            fd = os.open(self.ruta_bloqueo, os.O_RDONLY)
+        except FileNotFoundError:
+            return 0
+        try:
+            return self._leer_generacion_fd(fd)
+        finally:
+            os.close(fd)
+
+    # Método privado para normalizar un DataFrame de usuarios
+    """
+    Asegura que el DataFrame tenga todas las columnas y que `ID` y `version` sean enteros.
+
+    Parámetros:
+        - usuarios_df (pd.DataFrame): Datos leídos del archivo.
+
+    Retorno:
+        - pd.DataFrame: Datos normalizados.
+    """
+    @staticmethod
+    def _normalizar(usuarios_df):
+        for col in COLUMNAS_USUARIOS:
+            if col not in usuarios_df.columns:
+                usuarios_df[col] = None
+        usuarios_df['ID'] = pd.to_numeric(usuarios_df['ID'], errors='coerce').fillna(0).astype(int)
+        usuarios_df['version'] = pd.to_numeric(usuarios_df['version'], errors='coerce').fillna(0).astype(int)
+        return usuarios_df
+
+    # Método para leer el archivo de usuarios
+    """
+    Lee el archivo de usuarios junto con su generación, reintentando si otro proceso
+    lo reemplaza durante la lectura. Si tras `max_reintentos` intentos la generación sigue
+    sin poder leerse (archivo de bloqueo dañado), se devuelven los datos con generación 0;
+    la siguiente escritura confirmada vuelve a escribir una generación válida.
+
+    Retorno:
+        - Tuple[pd.DataFrame, int]: Datos de usuarios y generación leída.
+
+    Excepciones:
+        - FileNotFoundError: Si el archivo no existe.
+        - pd.errors.EmptyDataError: Si el archivo está vacío.
+    """
+    def leer(self):
+        for _ in range(self.max_reintentos):
+            antes = self.generacion()
+            usuarios_df = pd.read_csv(self.file_path)
+            if antes is not None and antes == self.generacion():
+                return self._normalizar(usuarios_df), antes
+            if antes is None:
+                # Puede haber una escritura en curso: dejamos que termine
+                time.sleep(0.001)
+
+        print(f"Advertencia: No se pudo leer la generación de '{self.ruta_bloqueo}'. Se usa 0.")
+        return self._normalizar(pd.read_csv(self.file_path)), 0
+
+    # Método privado para leer el archivo, devolviendo una estructura vacía si no existe
+    """
+    Igual que `leer`, pero un archivo inexistente o vacío se trata como un almacén sin usuarios.
+
+    Retorno:
+        - Tuple[pd.DataFrame, int]: Datos de usuarios y generación leída.
+    """
+    def _leer_o_vacio(self):
+        try:
+            return self.leer()
+        except (FileNotFoundError, pd.errors.EmptyDataError):
+            return pd.DataFrame(columns=COLUMNAS_USUARIOS), self.generacion() or 0
+
+    # Método privado para escribir un DataFrame en un archivo temporal
+    """
+    Escribe los datos en un archivo temporal junto al archivo de usuarios.
+
+    Parámetros:
+        - usuarios_df (pd.DataFrame): Datos a escribir.
+
+    Retorno:
+        - str: Ruta del archivo temporal.
+    """
+    def _escribir_temporal(self, usuarios_df):
+        directorio = os.path.dirname(os.path.abspath(self.file_path))
+        fd, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix='.usuarios-', suffix='.tmp')
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as f:
+            usuarios_df.to_csv(f, index=False)
+        os.chmod(ruta_temporal, 0o644)
+        return ruta_temporal
+
+    # Método privado para confirmar una escritura
+    """
+    Reemplaza el archivo de usuarios por el temporal si la generación no ha cambiado.
+
+    Parámetros:
+        - ruta_temporal (str): Archivo temporal con los datos nuevos.
+        - generacion_esperada (int): Generación sobre la que se prepararon los datos, o
+          `None` para confirmar sin comprobarla (el llamador ya tiene el bloqueo).
+        - fd (int, opcional): Descriptor del bloqueo si ya está tomado.
+
+    Retorno:
+        - bool: `True` si se confirmó la escritura, `False` si hubo un conflicto.
+    """
+    def _confirmar(self, ruta_temporal, generacion_esperada, fd=None):
+        if fd is None:
+            with self._bloqueo() as fd_bloqueo:
+                return self._confirmar(ruta_temporal, generacion_esperada, fd_bloqueo)
+
+        actual = self._leer_generacion_fd(fd) or 0
+        if generacion_esperada is not None and actual != generacion_esperada:
+            os.remove(ruta_temporal)
+            return False
+        os.replace(ruta_temporal, self.file_path)
+        # Se trunca tras escribir para no dejar restos si el archivo de bloqueo estaba dañado
+        datos = str(actual + 1).encode()
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, datos)
+        os.ftruncate(fd, len(datos))
+        return True
+
+    # Método para modificar el archivo de usuarios
+    """
+    Aplica una modificación sobre los datos más recientes del archivo y la guarda.
+    La función se vuelve a ejecutar sobre datos frescos si otro proceso escribió antes;
+    tras `max_reintentos` conflictos se ejecuta con el bloqueo tomado para garantizar el avance.
+
+    Parámetros:
+        - funcion (callable): Recibe un DataFrame de usuarios y devuelve una tupla
+          `(nuevo_df, resultado)`. Si `nuevo_df` es `None` no se escribe nada.
+
+    Retorno:
+        - Tuple[pd.DataFrame, Any]: Datos confirmados y el resultado devuelto por la función.
+    """
+    @medir()
+    def modificar(self, funcion):
+        for _ in range(self.max_reintentos):
+            usuarios_df, generacion = self._leer_o_vacio()
+            nuevo_df, resultado = funcion(usuarios_df)
+            if nuevo_df is None:
+                return usuarios_df, resultado
+            if self._confirmar(self._escribir_temporal(nuevo_df), generacion):
+                self.escrituras += 1
+                return nuevo_df, resultado
+            self.conflictos += 1
+
+        # Demasiados conflictos: hacemos la lectura y la escritura con el bloqueo tomado
+        with self._bloqueo() as fd:
+            usuarios_df, _ = self._leer_o_vacio()
+            nuevo_df, resultado = funcion(usuarios_df)
+            if nuevo_df is None:
+                return usuarios_df, resultado
+            self._confirmar(self._escribir_temporal(nuevo_df), None, fd)
+            self.escrituras += 1
+            return nuevo_df, resultado
+
+    # Método para incrementar la versión de registros modificados
+    """
+    Incrementa el contador de versión de los usuarios indicados.
+
+    Parámetros:
+        - usuarios_df (pd.DataFrame): Datos de usuarios (se modifican en el sitio).
+        - mascara (pd.Series): Filas modificadas.
+    """
+    @staticmethod
+    def incrementar_version(usuarios_df, mascara):
+        usuarios_df.loc[mascara, 'version'] = usuarios_df.loc[mascara, 'version'] + 1
+
+    # Método para obtener el siguiente ID libre
+    """
+    Calcula el siguiente ID de usuario a partir de los datos más recientes.
+
+    Parámetros:
+        - usuarios_df (pd.DataFrame): Datos de usuarios.
+
+    Retorno:
+        - int: Próximo ID disponible.
+    """
+    @staticmethod
+    def siguiente_id(usuarios_df):
+        return 1 if usuarios_df.empty else int(usuarios_df['ID'].max()) + 1
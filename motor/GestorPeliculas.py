@@ -0,0 +1,949 @@
+import hashlib
+import os
+import threading
+import time
+import numpy as np
+import pandas as pd
+from motor.AlmacenUsuarios import AlmacenUsuarios
+from motor.HistorialVotaciones import HistorialVotaciones
+from motor.IndiceTitulos import IndiceTitulos
+from motor.Instrumentacion import cronometro, medir
+from motor.Perfilador import perfilar
+from motor.PerfilesUsuario import PerfilesUsuario
+from motor.Popularidad import Popularidad
+
+class GestorPeliculas:
+    """
+    Clase para gestionar un sistema de películas. Proporciona funcionalidades para buscar,
+    recomendar y registrar votaciones de películas.
+    """
+
+    # Constructor de la clase
+    """
+    Inicializa la clase, cargando los datos de las películas y usuarios desde archivos CSV.
+    También calcula las similitudes entre películas basadas en sus sinopsis y características combinadas.
+
+    Parámetros:
+        - file_path (str, opcional): Ruta del CSV de películas.
+        - file_path_usuarios (str, opcional): Ruta del CSV de usuarios.
+
+    Excepciones manejadas:
+        - FileNotFoundError: Si los archivos CSV no existen.
+        - Exception: Cualquier otro error durante la inicialización.
+    """
+    @medir()
+    def __init__(self, file_path='peliculas_final_imagenes.csv', file_path_usuarios='usuarios.csv'):
+        # Protege el historial, los perfiles y la popularidad cuando se recomienda desde otro hilo
+        self.cerrojo = threading.RLock()
+
+        # Funciones a las que se avisa cuando cambian las votaciones (ver `suscribir`)
+        self.suscriptores = []
+
+        try:
+            # Definimos las rutas de los archivos
+            self.file_path = file_path
+            self.file_path_usuarios = file_path_usuarios
+
+            # Cargamos los datos de las películas y usuarios
+            with cronometro('GestorPeliculas.cargar_catalogo'):
+                self.peliculas_df = pd.read_csv(self.file_path)
+            self.almacen = AlmacenUsuarios(self.file_path_usuarios)
+            with cronometro('GestorPeliculas.cargar_usuarios'):
+                self.usuarios_df, _ = self.almacen.leer()
+
+            # Asignamos identificadores enteros y convertimos las votaciones una sola vez
+            self._indexar_catalogo()
+            self.historial.cargar(self.usuarios_df)
+
+            # Calculamos las similitudes al cargar los datos
+            self._calcular_similitudes()
+            self._calcular_similitudes_recomendaciones()
+            self._calcular_popularidad()
+        except FileNotFoundError as e:
+            # Si no encontramos el archivo, inicializamos con DataFrames vacíos
+            print(f"Error: Archivo no encontrado. {e}")
+            self.peliculas_df = pd.DataFrame()
+            self.usuarios_df = pd.DataFrame()
+            self.almacen = AlmacenUsuarios(self.file_path_usuarios)
+            self._indexar_catalogo()
+            self.perfiles = None
+            self.popularidad = None
+        except Exception as e:
+            # Manejo de otros errores inesperados
+            print(f"Error inesperado durante la inicialización: {e}")
+            self.peliculas_df = pd.DataFrame()
+            self.usuarios_df = pd.DataFrame()
+            self.almacen = AlmacenUsuarios(self.file_path_usuarios)
+            self._indexar_catalogo()
+            self.perfiles = None
+            self.popularidad = None
+
+    # Método privado para asignar identificadores enteros a las películas
+    """
+    Asigna a cada película un identificador `int32` estable y construye los índices
+    título -> identificador e identificador -> fila, además del índice de búsqueda por título.
+
+    Notas:
+        - El identificador se toma de la columna `Unnamed: 0` del CSV (índice original del
+          catálogo) si es única y no negativa; en otro caso se usa la posición de la fila.
+        - Si un título aparece varias veces, se resuelve a su primera aparición.
+    """
+    @medir()
+    def _indexar_catalogo(self):
+        n = len(self.peliculas_df)
+        columna_id = self.peliculas_df.get('Unnamed: 0')
+        if columna_id is not None and columna_id.is_unique and n and columna_id.min() >= 0:
+            ids = columna_id.to_numpy(dtype=np.int32)
+        else:
+            ids = np.arange(n, dtype=np.int32)
+        if n:
+            self.peliculas_df['movie_id'] = ids
+
+        # Arreglo identificador -> fila (-1 si el identificador no existe)
+        self.fila_por_id = np.full(int(ids.max()) + 1 if n else 0, -1, dtype=np.int32)
+        self.fila_por_id[ids] = np.arange(n, dtype=np.int32)
+
+        titulos = self.peliculas_df['title'].tolist() if n else []
+        self.titulo_por_id = dict(zip(ids.tolist(), titulos))
+        self.id_por_titulo = {}
+        for movie_id, titulo in zip(ids.tolist(), titulos):
+            self.id_por_titulo.setdefault(titulo, movie_id)
+
+        self.indice_titulos = IndiceTitulos(titulos)
+        self.historial = HistorialVotaciones(self.id_por_titulo, self.titulo_por_id)
+
+    # Método público para recargar las votaciones desde el archivo de usuarios
+    """
+    Vuelve a leer el archivo de usuarios y actualiza el historial en memoria.
+    Solo se convierten las votaciones de los usuarios que han cambiado.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al leer el archivo.
+    """
+    @medir()
+    def recargar_usuarios(self):
+        try:
+            with self.cerrojo:
+                self.usuarios_df, _ = self.almacen.leer()
+                self.historial.cargar(self.usuarios_df)
+                if self.popularidad is not None:
+                    self.popularidad.recalcular_agregados(self.historial)
+        except Exception as e:
+            print(f"Error al recargar usuarios: {e}")
+
+    # Método público para suscribirse a los cambios de datos
+    """
+    Registra una función a la que se llamará cada vez que cambien las votaciones
+    a través de este gestor. La función recibe un diccionario con el cambio:
+        - tipo (str): 'votacion' o 'importacion'.
+        - usuarios (List[str]): Usuarios cuyas votaciones han cambiado.
+        - movie_id, puntuacion, anterior: Solo en las votaciones individuales.
+
+    Parámetros:
+        - funcion (callable): Función a llamar con cada cambio.
+    """
+    def suscribir(self, funcion):
+        self.suscriptores.append(funcion)
+
+    # Método privado para avisar de un cambio de datos
+    """
+    Llama a las funciones suscritas con el cambio. Un error en una de ellas no impide
+    avisar a las demás ni afecta a la operación que produjo el cambio.
+
+    Parámetros:
+        - cambio (dict): Descripción del cambio.
+    """
+    def _notificar(self, cambio):
+        for funcion in list(self.suscriptores):
+            try:
+                funcion(cambio)
+            except Exception as e:
+                print(f"Error al notificar un cambio de datos: {e}")
+
+    # Método público para obtener el identificador de una película
+    """
+    Devuelve el identificador entero de una película a partir de su título exacto.
+
+    Parámetros:
+        - titulo (str): Título de la película.
+
+    Retorno:
+        - int: Identificador de la película, o `None` si no está en el catálogo.
+    """
+    @medir()
+    def obtener_id_pelicula(self, titulo):
+        return self.id_por_titulo.get(titulo)
+
+    # Método privado para calcular similitudes basadas en la sinopsis
+    """
+    Calcula las similitudes entre las películas utilizando la sinopsis como base.
+
+    Notas:
+        - Utiliza TF-IDF para convertir el texto en vectores.
+        - Utiliza la similitud coseno para medir la similitud entre vectores.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al calcular las similitudes.
+    """
+    def _calcular_similitudes(self):
+        try:
+            # Verificamos si existe la columna de sinopsis
+            if 'synopsis' not in self.peliculas_df.columns:
+                print("Advertencia: No se encontró la columna 'synopsis'.")
+                self.cosine_sim_synopsis = []
+                return
+
+            # scikit-learn tarda en importarse; se carga al construir el modelo y no al arrancar
+            with cronometro('GestorPeliculas.importar_sklearn'):
+                from sklearn.feature_extraction.text import TfidfVectorizer
+                from sklearn.metrics.pairwise import cosine_similarity
+
+            # Creamos un vectorizador TF-IDF con límites de frecuencia y número de características
+            tfidf_vectorizer = TfidfVectorizer(
+                stop_words='english',
+                max_df=0.9,
+                min_df=0.01,
+                max_features=1000
+            )
+            
+            # Rellenamos los valores nulos de sinopsis con cadenas vacías
+            self.peliculas_df['synopsis'] = self.peliculas_df['synopsis'].fillna('')
+            
+            # Convertimos las sinopsis a una matriz TF-IDF
+            with cronometro('GestorPeliculas.tfidf_sinopsis'):
+                tfidf_matrix = tfidf_vectorizer.fit_transform(self.peliculas_df['synopsis'])
+
+            # Calculamos la matriz de similitud coseno entre las películas
+            with cronometro('GestorPeliculas.similitud_sinopsis'):
+                self.cosine_sim_synopsis = cosine_similarity(tfidf_matrix, tfidf_matrix)
+        except Exception as e:
+            # En caso de error, asignamos una lista vacía
+            print(f"Error al calcular similitudes de sinopsis: {e}")
+            self.cosine_sim_synopsis = []
+
+    # Método privado para calcular el modelo de características combinadas
+    """
+    Vectoriza las características combinadas de sinopsis, director y género y prepara
+    los perfiles de usuario en ese mismo espacio.
+
+    Notas:
+        - Combina múltiples columnas para formar una representación textual única.
+        - Las filas de la matriz TF-IDF están normalizadas (L2), así que el producto escalar
+          de dos filas es su similitud coseno; no se guarda la matriz densa de similitudes.
+        - Los perfiles guardados se descartan si el vocabulario del modelo cambia.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al calcular el modelo.
+    """
+    @perfilar()
+    def _calcular_similitudes_recomendaciones(self):
+        try:
+            # Verificamos que las columnas necesarias existan, si no, las rellenamos con cadenas vacías
+            for col in ['synopsis', 'director', 'genre']:
+                if col not in self.peliculas_df.columns:
+                    print(f"Advertencia: No se encontró la columna '{col}'.")
+                    self.peliculas_df[col] = ''
+
+            # Creamos una nueva columna combinando sinopsis, director y género
+            self.peliculas_df['combined_features'] = self.peliculas_df['synopsis'].fillna('') + ' ' + \
+                                                     self.peliculas_df['director'].fillna('') + ' ' + \
+                                                     self.peliculas_df['genre'].fillna('')
+
+            # Vectorizamos las características combinadas
+            with cronometro('GestorPeliculas.importar_sklearn'):
+                from sklearn.feature_extraction.text import TfidfVectorizer
+            tfidf_vectorizer = TfidfVectorizer(
+                stop_words='english',
+                max_df=0.9,
+                min_df=0.01,
+                max_features=1000
+            )
+            with cronometro('GestorPeliculas.tfidf_recomendaciones'):
+                self.tfidf_recomendaciones = tfidf_vectorizer.fit_transform(self.peliculas_df['combined_features'])
+
+            # Firma del modelo: vocabulario y catálogo sobre los que se calculan los perfiles
+            firma = hashlib.sha1()
+            firma.update(' '.join(tfidf_vectorizer.get_feature_names_out()).encode())
+            firma.update(self.peliculas_df['movie_id'].to_numpy().tobytes())
+
+            # Los perfiles se guardan junto al archivo de usuarios
+            ruta_perfiles = os.path.splitext(self.file_path_usuarios)[0] + '_perfiles.npz'
+            self.perfiles = PerfilesUsuario(self.tfidf_recomendaciones, self.fila_por_id, ruta_perfiles, firma.hexdigest())
+            with cronometro('GestorPeliculas.cargar_perfiles'):
+                self.perfiles.cargar()
+        except Exception as e:
+            print(f"Error al calcular el modelo de características combinadas: {e}")
+            self.tfidf_recomendaciones = None
+            self.perfiles = None
+
+    # Método privado para precalcular la popularidad
+    """
+    Calcula las puntuaciones de popularidad del catálogo y los agregados de las
+    votaciones de la aplicación.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al calcular la popularidad.
+    """
+    @medir()
+    def _calcular_popularidad(self):
+        try:
+            self.popularidad = Popularidad(self.peliculas_df, self.fila_por_id)
+            self.popularidad.recalcular_agregados(self.historial)
+        except Exception as e:
+            print(f"Error al calcular la popularidad: {e}")
+            self.popularidad = None
+
+    # Método público para obtener una lista de películas
+    """
+    Devuelve una lista de películas con sus títulos e imágenes asociadas.
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con las claves `title` y `poster_image_y`.
+
+    Excepciones manejadas:
+        - KeyError: Si las columnas requeridas no están disponibles.
+    """
+    @medir()
+    def obtener_peliculas(self):
+        try:
+            return self.peliculas_df[['title', 'poster_image_y']].to_dict(orient='records')
+        except KeyError as e:
+            print(f"Error: Columnas necesarias no encontradas. {e}")
+            return []
+
+    # Método público para buscar películas por nombres exactos
+    """
+    Busca películas que coincidan exactamente con los nombres proporcionados.
+
+    Parámetros:
+        - nombres_peliculas (List[str]): Lista de nombres de películas a buscar.
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con información de las películas encontradas.
+
+    Excepciones manejadas:
+        - KeyError: Si las columnas necesarias no están disponibles.
+    """
+    @medir()
+    def buscar_peliculas(self, nombres_peliculas):
+        try:
+            # Filtramos el DataFrame usando los nombres proporcionados
+            resultado = self.peliculas_df[self.peliculas_df['title'].isin(nombres_peliculas)]
+            return resultado[['title', 'poster_image_y']].to_dict(orient='records') if not resultado.empty else []
+        except KeyError as e:
+            print(f"Error: Columnas necesarias no encontradas. {e}")
+            return []
+
+    # Método público para buscar películas por nombre parcial
+    """
+    Busca películas con alguna palabra del título que empiece por el texto proporcionado
+    (autocompletado). La búsqueda usa el índice de títulos, no distingue mayúsculas ni
+    acentos y devuelve primero los títulos que empiezan por el texto.
+
+    Parámetros:
+        - nombre_pelicula (str): Texto parcial del título de la película.
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con información de las películas encontradas.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante la búsqueda.
+    """
+    @medir()
+    def buscar_peliculas2(self, nombre_pelicula):
+        try:
+            if not nombre_pelicula:
+                # Si no se proporciona un título, devolvemos una lista vacía
+                return []
+            # Buscamos en el índice las filas con una palabra que empiece por el texto proporcionado
+            resultado = self.peliculas_df.iloc[self.indice_titulos.buscar(nombre_pelicula)]
+            return resultado[['title', 'poster_image_y']].to_dict(orient='records') if not resultado.empty else []
+        except Exception as e:
+            print(f"Error al buscar películas: {e}")
+            return []
+
+    # Método público para seleccionar películas al azar
+    """
+    Selecciona una cantidad especificada de películas de forma aleatoria.
+
+    Parámetros:
+        - cantidad (int): Número de películas a seleccionar.
+
+    Retorno:
+        - List[str]: Lista con los títulos de las películas seleccionadas.
+
+    Excepciones manejadas:
+        - ValueError: Si no hay suficientes películas para seleccionar.
+    """
+    @medir()
+    def peliculas_al_azar(self, cantidad=12):
+        try:
+            # Seleccionamos películas de forma aleatoria
+            return self.peliculas_df.sample(n=cantidad)['title'].tolist()
+        except ValueError as e:
+            # Si no hay suficientes películas, devolvemos una lista vacía
+            print(f"Advertencia: No hay suficientes películas para seleccionar. {e}")
+            return []
+
+    # Método público para obtener las películas más populares
+    """
+    Devuelve las películas más populares, opcionalmente de un género.
+
+    Parámetros:
+        - cantidad (int): Número de películas a devolver.
+        - genero (str, opcional): Género por el que filtrar (por ejemplo, `comedy`).
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con las claves `title` y `poster_image_y`.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al obtener las películas.
+    """
+    @medir()
+    def peliculas_populares(self, cantidad=12, genero=None):
+        try:
+            filas = self.popularidad.mejores(genero, cantidad)
+            return self.peliculas_df.iloc[filas][['title', 'poster_image_y']].to_dict(orient='records')
+        except Exception as e:
+            print(f"Error al obtener películas populares: {e}")
+            return []
+
+    # Método público para obtener detalles de una película específica
+    """
+    Devuelve los detalles de una película, dado su nombre parcial. Si el nombre coincide
+    exactamente con un título se devuelve esa película sin recorrer el catálogo.
+
+    Parámetros:
+        - nombre_pelicula (str): Nombre (o parte del nombre) de la película.
+
+    Retorno:
+        - dict: Diccionario con los detalles de la película si se encuentra, de lo contrario `None`.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante la búsqueda.
+    """
+    @medir()
+    def obtener_detalles_pelicula(self, nombre_pelicula):
+        try:
+            # Coincidencia exacta a través del índice de identificadores
+            movie_id = self.id_por_titulo.get(nombre_pelicula)
+            if movie_id is not None:
+                return self.peliculas_df.iloc[self.fila_por_id[movie_id]].to_dict()
+
+            # Filtramos el DataFrame por el título proporcionado
+            resultado = self.peliculas_df[self.peliculas_df['title'].str.contains(nombre_pelicula, case=False, na=False)]
+            # Devolvemos el primer resultado como un diccionario
+            return resultado.iloc[0].to_dict() if not resultado.empty else None
+        except Exception as e:
+            print(f"Error al obtener detalles de la película: {e}")
+            return None
+
+    # Método público para obtener detalles de varias películas a la vez
+    """
+    Devuelve los campos indicados de un lote de películas en una sola pasada vectorizada.
+    A diferencia de `obtener_detalles_pelicula`, los títulos se resuelven de forma exacta
+    a través del índice de identificadores, así que nunca devuelve otra película.
+
+    Parámetros:
+        - ids_o_titulos (iterable): Identificadores enteros (`movie_id`) o títulos exactos.
+        - campos (List[str]): Columnas a devolver; las que no existen se ignoran.
+
+    Retorno:
+        - List[dict]: Un diccionario por elemento, en el mismo orden, o `None` si la película no existe.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante la consulta.
+    """
+    @medir()
+    def obtener_detalles_peliculas(self, ids_o_titulos, campos=('title', 'poster_image_y')):
+        try:
+            claves = list(ids_o_titulos)
+            ids = np.array([
+                clave if isinstance(clave, (int, np.integer)) else self.id_por_titulo.get(clave, -1)
+                for clave in claves
+            ], dtype=np.int64)
+
+            # Identificador -> fila, con -1 para los que no existen
+            validos = (ids >= 0) & (ids < len(self.fila_por_id))
+            filas = np.full(len(ids), -1, dtype=np.int64)
+            filas[validos] = self.fila_por_id[ids[validos]]
+            encontradas = np.flatnonzero(filas >= 0)
+
+            campos = [c for c in campos if c in self.peliculas_df.columns]
+            registros = self.peliculas_df.iloc[filas[encontradas]][campos].to_dict(orient='records')
+            detalles = [None] * len(claves)
+            for posicion, registro in zip(encontradas.tolist(), registros):
+                detalles[posicion] = registro
+            return detalles
+        except Exception as e:
+            print(f"Error al obtener detalles de las películas: {e}")
+            return []
+
+    # Método privado para obtener los pósteres de unas filas
+    """
+    Devuelve las URL de los pósteres de las filas indicadas (cadena vacía si no tienen).
+    """
+    def _posters_filas(self, filas):
+        if 'poster_image_y' not in self.peliculas_df.columns:
+            return np.full(len(filas), '', dtype=object)
+        return self.peliculas_df['poster_image_y'].fillna('').to_numpy()[filas]
+
+    # Método público para recomendar películas basadas en otra película
+    """
+    Genera una lista de películas recomendadas en función de las similitudes con una película dada.
+
+    Parámetros:
+        - title (str): Título de la película base para las recomendaciones.
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con las películas recomendadas y sus similitudes,
+          junto con `movie_id` y `poster_image_y`.
+
+    Excepciones manejadas:
+        - ValueError: Si la película no está en el sistema.
+        - Exception: Cualquier error durante el cálculo de recomendaciones.
+    """
+    @medir()
+    @perfilar()
+    def recomendar_peliculas(self, title):
+        try:
+            # Verificamos que la película esté en el sistema
+            if title not in self.peliculas_df['title'].values:
+                raise ValueError(f"La película '{title}' no se encuentra en el sistema.")
+
+            # Obtenemos el índice de la película
+            idx = self.peliculas_df.index[self.peliculas_df['title'] == title][0]
+
+            # Obtenemos los puntajes de similitud para la película
+            sim_scores = list(enumerate(self.cosine_sim_synopsis[idx]))
+            sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
+
+            # Preparamos la lista de recomendaciones
+            recomendaciones = []
+            for sim_idx, sim_score in sim_scores[1:6]:  # Excluir la película actual
+                recomendaciones.append({
+                    "titulo": self.peliculas_df.iloc[sim_idx]['title'],
+                    "similitud": sim_score,
+                    "movie_id": int(self.peliculas_df['movie_id'].iat[sim_idx]),
+                    "poster_image_y": self._posters_filas([sim_idx])[0]
+                })
+            return recomendaciones
+        except Exception as e:
+            print(f"Error al recomendar películas: {e}")
+            return []
+
+    # Método público para recomendar películas a un usuario
+    """
+    Genera una lista de películas recomendadas basándose en las votaciones del usuario.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - List[dict]: Lista de recomendaciones ajustadas según las votaciones del usuario,
+          junto con `movie_id` y `poster_image_y`.
+
+    Excepciones manejadas:
+        - ValueError: Si el usuario no está en el sistema.
+        - Exception: Cualquier error durante el cálculo de recomendaciones.
+    """
+    @medir()
+    @perfilar()
+    def recomendar_peliculas_por_usuario(self, username):
+        try:
+            # Obtenemos el perfil del usuario (se reconstruye solo si está desactualizado)
+            with self.cerrojo:
+                perfil, excluir = self._perfil_usuario(username)
+
+                # Sin votaciones o sin modelo de contenido recurrimos a las películas más populares
+                if perfil is None:
+                    return self._recomendaciones_populares(excluir)
+
+                # Un único producto disperso puntúa todo el catálogo contra el perfil
+                similitud, similitud_ajustada = self.perfiles.puntuar(perfil)
+
+            # Excluimos las películas que el usuario ya ha votado
+            candidatas = np.ones(len(similitud), dtype=bool)
+            candidatas[excluir] = False
+            candidatas = np.flatnonzero(candidatas)
+            orden = candidatas[np.argsort(-similitud_ajustada[candidatas], kind='stable')]
+            return self._formatear_recomendaciones(orden, similitud[orden], similitud_ajustada[orden])
+        except Exception as e:
+            print(f"Error al recomendar películas para el usuario: {e}")
+            return []
+
+    # Método público para recomendar películas a un usuario por bloques
+    """
+    Igual que `recomendar_peliculas_por_usuario`, pero puntúa el catálogo por bloques y, tras
+    cada bloque, entrega las mejores `cantidad` recomendaciones encontradas hasta el momento.
+    Pensado para ejecutarse en un hilo de trabajo: quien lo consume puede mostrar resultados
+    parciales y abandonar el cálculo entre bloques. El cerrojo solo se toma para copiar el
+    perfil, de modo que las votaciones no esperan a que termine el cálculo.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - cantidad (int): Número de recomendaciones a devolver.
+        - tamano_bloque (int): Películas puntuadas en cada bloque.
+
+    Retorno:
+        - Iterator[List[dict]]: Listas parciales de recomendaciones, ordenadas por similitud
+          ajustada; la última es el resultado definitivo.
+
+    Excepciones:
+        - ValueError: Si el usuario no está en el sistema.
+    """
+    def recomendar_peliculas_por_usuario_por_bloques(self, username, cantidad=10, tamano_bloque=128):
+        with self.cerrojo:
+            perfil, excluir = self._perfil_usuario(username)
+            if perfil is None:
+                populares = self._recomendaciones_populares(excluir)[:cantidad]
+            else:
+                # Copiamos el perfil: una votación posterior lo actualiza en el sitio
+                perfil = [perfil[0].copy(), perfil[1], perfil[2]]
+
+        if perfil is None:
+            yield populares
+            return
+
+        candidatas = np.ones(len(self.peliculas_df), dtype=bool)
+        candidatas[excluir] = False
+        candidatas = np.flatnonzero(candidatas)
+
+        filas = np.empty(0, dtype=np.int64)
+        similitud = np.empty(0)
+        similitud_ajustada = np.empty(0)
+        for inicio in range(0, len(candidatas), tamano_bloque):
+            bloque = candidatas[inicio:inicio + tamano_bloque]
+            sim_bloque, sim_aj_bloque = self.perfiles.puntuar(perfil, bloque)
+
+            # Fusionamos el bloque con las mejores hasta ahora (a igual similitud, orden del catálogo)
+            filas = np.concatenate((filas, bloque))
+            similitud = np.concatenate((similitud, sim_bloque))
+            similitud_ajustada = np.concatenate((similitud_ajustada, sim_aj_bloque))
+            orden = np.lexsort((filas, -similitud_ajustada))[:cantidad]
+            filas, similitud, similitud_ajustada = filas[orden], similitud[orden], similitud_ajustada[orden]
+
+            yield self._formatear_recomendaciones(filas, similitud, similitud_ajustada)
+
+    # Método privado para obtener el perfil de un usuario
+    """
+    Devuelve el perfil de contenido de un usuario (se reconstruye solo si está desactualizado)
+    y las filas de las películas que ya ha votado. Debe llamarse con el cerrojo tomado.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - Tuple[list, np.ndarray]: Perfil, o `None` si no hay votaciones o modelo de contenido,
+          y filas votadas.
+
+    Excepciones:
+        - ValueError: Si el usuario no está en el sistema.
+    """
+    def _perfil_usuario(self, username):
+        if not self.historial.contiene(username):
+            raise ValueError(f"El usuario '{username}' no se encuentra en el sistema.")
+
+        ids, puntuaciones = self.historial.obtener(username)
+        perfil = None
+        if self.perfiles is not None:
+            perfil = self.perfiles.obtener(username, ids, puntuaciones, self.historial.version(username))
+        if perfil is not None and perfil[1] <= 0:
+            perfil = None
+        return perfil, self.fila_por_id[ids]
+
+    # Método privado para dar formato a las recomendaciones
+    """
+    Convierte filas del catálogo y sus similitudes en la lista de recomendaciones.
+
+    Parámetros:
+        - filas (np.ndarray): Filas recomendadas, en orden.
+        - similitud (np.ndarray): Similitud de cada fila.
+        - similitud_ajustada (np.ndarray): Similitud ajustada de cada fila.
+
+    Retorno:
+        - List[dict]: Recomendaciones con `titulo`, `similitud`, `similitud_ajustada`,
+          `movie_id` y `poster_image_y`.
+    """
+    def _formatear_recomendaciones(self, filas, similitud, similitud_ajustada):
+        titulos = self.peliculas_df['title'].to_numpy()
+        ids = self.peliculas_df['movie_id'].to_numpy()
+        return [
+            {'titulo': titulo, 'similitud': float(sim), 'similitud_ajustada': float(sim_aj),
+             'movie_id': int(movie_id), 'poster_image_y': poster}
+            for titulo, sim, sim_aj, movie_id, poster in zip(
+                titulos[filas], similitud, similitud_ajustada, ids[filas], self._posters_filas(filas)
+            )
+        ]
+    
+    # Método privado para recomendar por popularidad
+    """
+    Genera recomendaciones a partir de las películas más populares del catálogo.
+
+    Parámetros:
+        - excluir (np.ndarray): Filas de películas que no deben recomendarse.
+
+    Retorno:
+        - List[dict]: Recomendaciones con la popularidad (escala 0-1) como similitud, junto con
+          `movie_id` y `poster_image_y`.
+    """
+    def _recomendaciones_populares(self, excluir):
+        if self.popularidad is None:
+            return []
+        filas = self.popularidad.mejores(cantidad=self.popularidad.top_k, excluir=excluir)
+        titulos = self.peliculas_df['title'].to_numpy()
+        ids = self.peliculas_df['movie_id'].to_numpy()
+        return [
+            {'titulo': titulo, 'similitud': float(p), 'similitud_ajustada': float(p),
+             'movie_id': int(movie_id), 'poster_image_y': poster}
+            for titulo, p, movie_id, poster in zip(
+                titulos[filas], self.popularidad.puntuacion[filas] / 5, ids[filas], self._posters_filas(filas)
+            )
+        ]
+
+     # Método público para registrar una votación de película por un usuario
+    """
+    Permite a un usuario registrar una votación para una película.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - pelicula (str): Nombre de la película a votar.
+        - puntuacion (int): Puntuación otorgada por el usuario.
+
+    Retorno:
+        - str: Mensaje indicando si la votación fue registrada exitosamente.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante el registro de la votación.
+    """
+    @medir()
+    def votar_pelicula(self, username, pelicula, puntuacion):
+        try:
+            movie_id = self.obtener_id_pelicula(pelicula)
+            if movie_id is None:
+                raise ValueError(f"La película '{pelicula}' no se encuentra en el sistema.")
+
+            # Aplicamos la votación sobre la versión más reciente del archivo de usuarios,
+            # de modo que no se pierdan votaciones escritas por otros procesos
+            def aplicar(usuarios_df):
+                self.historial.cargar(usuarios_df)
+                version_previa = self.historial.version(username)
+                votos_previos = len(self.historial.obtener(username)[0])
+                anterior = self.historial.registrar(username, movie_id, puntuacion)
+                votaciones = self.historial.serializar(username)
+
+                mascara = usuarios_df['Nombre de usuario'] == username
+                if mascara.any():
+                    # Actualizamos la información del usuario
+                    usuarios_df.loc[mascara, 'votaciones'] = votaciones
+                    self.almacen.incrementar_version(usuarios_df, mascara)
+                else:
+                    # Si el usuario no existe, creamos un nuevo registro
+                    nueva_fila = pd.DataFrame([{
+                        'ID': self.almacen.siguiente_id(usuarios_df),
+                        'Nombre de usuario': username,
+                        'votaciones': votaciones,
+                        'version': 1
+                    }])
+                    usuarios_df = pd.concat([usuarios_df, nueva_fila], ignore_index=True)
+                self.historial.versiones[username] = version_previa + 1
+                return usuarios_df, (anterior, version_previa, votos_previos)
+
+            # El cerrojo evita que un cálculo de recomendaciones en segundo plano vea el historial a medias
+            with self.cerrojo:
+                # Guardamos los cambios en el archivo CSV
+                self.usuarios_df, (anterior, version_previa, votos_previos) = self.almacen.modificar(aplicar)
+
+                # Actualizamos el perfil del usuario solo en las dimensiones de esta película
+                # y guardamos solo la votación, no todos los perfiles
+                if self.perfiles is not None:
+                    self.perfiles.actualizar(username, movie_id, puntuacion, anterior,
+                                             version_previa, version_previa + 1, votos_previos, guardar=True)
+                if self.popularidad is not None:
+                    self.popularidad.registrar_voto(movie_id, puntuacion, anterior)
+
+            self._notificar({
+                'tipo': 'votacion', 'usuarios': [username], 'movie_id': int(movie_id),
+                'puntuacion': puntuacion, 'anterior': anterior
+            })
+            return f"Votación registrada: {pelicula} - {puntuacion}/5"
+        except Exception as e:
+            print(f"Error al registrar votación: {e}")
+            return f"No se pudo registrar la votación para {pelicula}."
+
+    # Método público para importar votaciones de forma masiva
+    """
+    Importa un volcado de votaciones en una sola pasada: valida los títulos contra el
+    catálogo, fusiona con las votaciones existentes (gana la última), crea los usuarios
+    que falten y guarda el archivo de usuarios una única vez.
+
+    Parámetros:
+        - df (pd.DataFrame): Votaciones con las columnas `Nombre de usuario`, `title` y `rating`.
+          Si una pareja usuario/película aparece varias veces, se conserva la última fila.
+
+    Retorno:
+        - dict: Informe con las filas leídas, importadas y descartadas, los usuarios
+          nuevos y actualizados, el tiempo empleado y las filas por segundo.
+          `None` si ocurre un error.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante la importación.
+    """
+    @medir()
+    def importar_votaciones(self, df):
+        try:
+            inicio = time.perf_counter()
+            filas = len(df)
+
+            # Validamos títulos y puntuaciones de forma vectorizada
+            # (las puntuaciones con decimales se descartan en lugar de truncarse)
+            nuevas = pd.DataFrame({
+                'Nombre de usuario': df['Nombre de usuario'].to_numpy(dtype=object),
+                'movie_id': df['title'].map(self.id_por_titulo).to_numpy(dtype=float),
+                'rating': pd.to_numeric(df['rating'], errors='coerce').to_numpy(dtype=float)
+            })
+            validas = (
+                pd.notna(nuevas['Nombre de usuario']) &
+                nuevas['movie_id'].notna() &
+                nuevas['rating'].between(1, 5) &
+                (nuevas['rating'] == nuevas['rating'].round())
+            )
+            nuevas = nuevas[validas].astype({'movie_id': np.int32, 'rating': np.int8})
+
+            afectados = pd.unique(nuevas['Nombre de usuario'])
+
+            # La fusión se hace sobre la versión más reciente del archivo de usuarios
+            def fusionar(usuarios_df):
+                self.historial.cargar(usuarios_df)
+
+                # Fusionamos con las votaciones existentes de los usuarios afectados (gana la última)
+                existentes = self.historial.como_dataframe(afectados)
+                fusion = pd.concat([existentes, nuevas], ignore_index=True)
+                fusion = fusion.drop_duplicates(['Nombre de usuario', 'movie_id'], keep='last')
+                fusion = fusion.sort_values('Nombre de usuario', kind='stable')
+
+                # Partimos el resultado por usuario y actualizamos el historial
+                usuarios = fusion['Nombre de usuario'].to_numpy()
+                cortes = np.flatnonzero(usuarios[1:] != usuarios[:-1]) + 1
+                inicios = np.concatenate(([0], cortes)) if len(usuarios) else np.empty(0, dtype=int)
+                ids = np.split(fusion['movie_id'].to_numpy(), cortes)
+                puntuaciones = np.split(fusion['rating'].to_numpy(), cortes)
+                cadenas = {
+                    usuarios[posicion]: self.historial.fijar(usuarios[posicion], ids_usuario, puntuaciones_usuario)
+                    for posicion, ids_usuario, puntuaciones_usuario in zip(inicios, ids, puntuaciones)
+                }
+
+                # Creamos en bloque los usuarios que no existían
+                conocidos = set(usuarios_df['Nombre de usuario'])
+                faltantes = [u for u in afectados if u not in conocidos]
+                if faltantes:
+                    siguiente_id = self.almacen.siguiente_id(usuarios_df)
+                    nuevos = pd.DataFrame({
+                        'ID': np.arange(siguiente_id, siguiente_id + len(faltantes)),
+                        'Nombre de usuario': faltantes,
+                        'version': 0
+                    })
+                    usuarios_df = pd.concat([usuarios_df, nuevos], ignore_index=True)
+
+                # Serializamos solo los usuarios afectados
+                mascara = usuarios_df['Nombre de usuario'].isin(afectados)
+                usuarios_df.loc[mascara, 'votaciones'] = usuarios_df.loc[mascara, 'Nombre de usuario'].map(cadenas)
+                self.almacen.incrementar_version(usuarios_df, mascara)
+                return usuarios_df, len(faltantes)
+
+            # Mientras se fusiona no puede haber recomendaciones calculándose en segundo plano
+            with self.cerrojo:
+                # Guardamos una única vez
+                self.usuarios_df, usuarios_nuevos = self.almacen.modificar(fusionar)
+
+                # Los perfiles de los usuarios afectados se reconstruirán en su próxima consulta
+                self.historial.cargar(self.usuarios_df)
+                if self.perfiles is not None:
+                    self.perfiles.invalidar(afectados)
+                    self.perfiles.guardar()
+                if self.popularidad is not None:
+                    self.popularidad.recalcular_agregados(self.historial)
+
+            self._notificar({'tipo': 'importacion', 'usuarios': list(afectados)})
+
+            segundos = time.perf_counter() - inicio
+            informe = {
+                'filas': filas,
+                'importadas': len(nuevas),
+                'descartadas': filas - len(nuevas),
+                'usuarios_nuevos': usuarios_nuevos,
+                'usuarios_actualizados': len(afectados) - usuarios_nuevos,
+                'segundos': segundos,
+                'filas_por_segundo': filas / segundos if segundos > 0 else float('inf')
+            }
+            print(
+                f"Importación completada: {informe['importadas']}/{filas} votaciones, "
+                f"{informe['usuarios_nuevos']} usuarios nuevos, "
+                f"{segundos:.2f} s ({informe['filas_por_segundo']:,.0f} filas/s)."
+            )
+            return informe
+        except Exception as e:
+            print(f"Error al importar votaciones: {e}")
+            return None
+
+    # Método público para aplicar un cambio hecho por otro proceso
+    """
+    Actualiza en memoria el historial, los perfiles y la popularidad con un cambio de
+    votaciones que otro proceso ya ha guardado (el mismo diccionario que reciben los
+    suscriptores). No escribe en el archivo de usuarios ni en el de perfiles.
+
+    Parámetros:
+        - cambio (dict): Cambio notificado por el gestor que lo guardó.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al aplicar el cambio; se recargan las votaciones del archivo.
+    """
+    @medir()
+    def aplicar_cambio(self, cambio):
+        try:
+            if cambio.get('tipo') != 'votacion':
+                # Las importaciones afectan a muchos usuarios: se relee el archivo
+                self.recargar_usuarios()
+                if self.perfiles is not None:
+                    with self.cerrojo:
+                        self.perfiles.invalidar(cambio.get('usuarios', []))
+            else:
+                username = cambio['usuarios'][0]
+                movie_id = cambio['movie_id']
+                puntuacion = cambio['puntuacion']
+                with self.cerrojo:
+                    version_previa = self.historial.version(username)
+                    votos_previos = len(self.historial.obtener(username)[0])
+                    anterior = self.historial.registrar(username, movie_id, puntuacion)
+                    self.historial.versiones[username] = version_previa + 1
+                    if self.perfiles is not None:
+                        self.perfiles.actualizar(username, movie_id, puntuacion, anterior,
+                                                 version_previa, version_previa + 1, votos_previos)
+                    if self.popularidad is not None:
+                        self.popularidad.registrar_voto(movie_id, puntuacion, anterior)
+            self._notificar(cambio)
+        except Exception as e:
+            print(f"Error al aplicar un cambio de votaciones: {e}")
+            self.recargar_usuarios()
+
+    # Método público para obtener las valoraciones de un usuario
+    """
+    Devuelve las películas valoradas por un usuario específico junto con sus puntuaciones.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con los títulos de las películas y sus puntuaciones.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al obtener las valoraciones.
+    """
+    @medir()
+    def obtener_valoraciones_usuario(self, username):
+        try:
+            # Devolvemos el historial en memoria en el formato de lista de diccionarios
+            return self.historial.como_lista(username)
+        except Exception as e:
+            print(f"Error al obtener las valoraciones del usuario: {e}")
+            return []
@@ -0,0 +1,198 @@
+import pandas as pd
+from motor.AlmacenUsuarios import AlmacenUsuarios, COLUMNAS_USUARIOS
+from motor.Instrumentacion import medir
+
+class GestorUsuarios:
+    """
+    Clase para gestionar usuarios en un sistema.
+    Permite registrar, validar y administrar usuarios junto con sus votaciones.
+    """
+
+    # Constructor de la clase
+    """
+    Inicializa el gestor de usuarios cargando los datos desde un archivo CSV.
+
+    Parámetros:
+        - file_path (str, opcional): Ruta del CSV de usuarios.
+
+    Excepciones manejadas:
+        - FileNotFoundError: Si el archivo de usuarios no existe, se crea un nuevo archivo.
+        - pd.errors.EmptyDataError: Si el archivo está vacío, se inicializa una estructura vacía.
+        - Exception: Cualquier otro error durante la inicialización.
+    """
+    @medir()
+    def __init__(self, file_path='usuarios.csv'):
+        self.file_path = file_path
+        self.almacen = AlmacenUsuarios(self.file_path)
+        try:
+            # Intentamos cargar los datos desde el archivo CSV (con 'ID' y 'version' numéricos)
+            self.usuarios_df, _ = self.almacen.leer()
+        except FileNotFoundError:
+            # Creamos un nuevo archivo si no existe
+            print(f"Advertencia: Archivo '{self.file_path}' no encontrado. Creando un nuevo archivo.")
+            self.usuarios_df = pd.DataFrame(columns=COLUMNAS_USUARIOS)
+        except pd.errors.EmptyDataError:
+            # Inicializamos la estructura de datos si el archivo está vacío
+            print(f"Advertencia: Archivo '{self.file_path}' vacío. Inicializando estructura de datos.")
+            self.usuarios_df = pd.DataFrame(columns=COLUMNAS_USUARIOS)
+        except Exception as e:
+            print(f"Error inesperado al inicializar el gestor de usuarios: {e}")
+            self.usuarios_df = pd.DataFrame(columns=COLUMNAS_USUARIOS)
+
+    # Método para registrar un nuevo usuario
+    """
+    Registra un nuevo usuario en el sistema.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - password (str): Contraseña del usuario.
+
+    Retorno:
+        - str: Mensaje indicando si el usuario fue registrado exitosamente o si ocurrió un error.
+    """
+    @medir()
+    def registrar_usuario(self, username, password):
+        try:
+            # Validamos que el nombre de usuario y la contraseña no estén vacíos
+            if username.strip() == "" or password.strip() == "":
+                return "El nombre de usuario y la contraseña no pueden estar vacíos."
+
+            # Registramos al usuario sobre los datos más recientes del archivo,
+            # para que el ID no se calcule a partir de una copia desactualizada
+            def registrar(usuarios_df):
+                # Verificamos si el usuario ya existe
+                if username in usuarios_df['Nombre de usuario'].values:
+                    return None, False
+
+                # Creamos un nuevo registro de usuario con el próximo ID disponible
+                nuevo_usuario = {
+                    'ID': self.almacen.siguiente_id(usuarios_df),
+                    'Nombre de usuario': username,
+                    'Contraseña': password,
+                    'votaciones': "[]",  # Sin votaciones inicialmente
+                    'version': 1
+                }
+                return pd.concat([usuarios_df, pd.DataFrame([nuevo_usuario])], ignore_index=True), True
+
+            self.usuarios_df, registrado = self.almacen.modificar(registrar)
+            if not registrado:
+                return "El usuario ya existe."
+            return "Usuario registrado con éxito."
+        except Exception as e:
+            print(f"Error al registrar usuario: {e}")
+            return "No se pudo registrar el usuario debido a un error interno."
+
+    # Método para validar las credenciales de un usuario
+    """
+    Valida las credenciales de un usuario.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - password (str): Contraseña del usuario.
+
+    Retorno:
+        - Tuple[bool, str]: Un booleano indicando el éxito de la validación y un mensaje asociado.
+    """
+    @medir()
+    def validar_usuario(self, username, password):
+        try:
+            # Validamos que los campos no estén vacíos
+            if username.strip() == "" or password.strip() == "":
+                return False, "El nombre de usuario y la contraseña no pueden estar vacíos."
+
+            # Recargamos el archivo para asegurarnos de que los datos estén actualizados
+            try:
+                self.usuarios_df, _ = self.almacen.leer()
+            except FileNotFoundError:
+                return False, "No se encontraron usuarios registrados."
+            except pd.errors.EmptyDataError:
+                return False, "No hay datos en el archivo de usuarios."
+            except Exception as e:
+                print(f"Error al leer el archivo de usuarios: {e}")
+                return False, "Error al validar usuario."
+
+            # Buscamos el usuario en el DataFrame
+            usuario = self.usuarios_df[self.usuarios_df['Nombre de usuario'] == username]
+            if usuario.empty:
+                return False, "El usuario no existe."
+
+            # Validamos la contraseña
+            if usuario.iloc[0]['Contraseña'] != password:
+                return False, "Contraseña incorrecta."
+
+            return True, "Inicio de sesión exitoso."
+        except Exception as e:
+            print(f"Error al validar usuario: {e}")
+            return False, "Error interno al validar usuario."
+
+    # Método para guardar los datos de usuarios
+    """
+    Guarda los datos de los usuarios en el archivo CSV.
+    Solo se escriben los registros cuya versión en memoria es mayor que la del archivo
+    (o que no existen en él); el resto de registros del archivo se conserva.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al intentar guardar los datos.
+    """
+    @medir()
+    def guardar_datos(self):
+        try:
+            locales = self.usuarios_df.set_index('Nombre de usuario')
+
+            def fusionar(usuarios_df):
+                actuales = usuarios_df.set_index('Nombre de usuario')
+                version_actual = actuales['version'].reindex(locales.index).fillna(-1)
+                cambiados = locales[locales['version'] > version_actual]
+                if cambiados.empty:
+                    return None, None
+                fusion = pd.concat([actuales.drop(cambiados.index, errors='ignore'), cambiados])
+                return fusion.reset_index()[COLUMNAS_USUARIOS], None
+
+            self.usuarios_df, _ = self.almacen.modificar(fusionar)
+        except Exception as e:
+            print(f"Error al guardar datos en el archivo '{self.file_path}': {e}")
+
+    # Método para obtener un usuario por su ID
+    """
+    Obtiene la información de un usuario dado su ID.
+
+    Parámetros:
+        - user_id (int): ID del usuario.
+
+    Retorno:
+        - Tuple[Optional[dict], str]: Un diccionario con los datos del usuario y un mensaje asociado.
+    """
+    @medir()
+    def obtener_usuario_por_id(self, user_id):
+        try:
+            # Verificamos si la columna 'ID' existe
+            if 'ID' not in self.usuarios_df.columns:
+                return None, "El campo 'ID' no existe en los datos."
+
+            # Buscamos el usuario por ID
+            usuario = self.usuarios_df[self.usuarios_df['ID'] == user_id]
+            if usuario.empty:
+                return None, "No se encontró un usuario con el ID especificado."
+
+            return usuario.iloc[0].to_dict(), "Usuario encontrado."
+        except Exception as e:
+            print(f"Error al obtener usuario por ID: {e}")
+            return None, "Error al buscar el usuario."
+
+    # Método para obtener todos los usuarios
+    """
+    Devuelve todos los usuarios registrados en el sistema.
+
+    Retorno:
+        - List[dict]: Lista de diccionarios con los datos de los usuarios.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al intentar obtener los datos.
+    """
+    @medir()
+    def obtener_usuarios(self):
+        try:
+            return self.usuarios_df.to_dict(orient='records')
+        except Exception as e:
+            print(f"Error al obtener usuarios: {e}")
+            return []
@@ -0,0 +1,244 @@
+import ast
+import numpy as np
+import pandas as pd
+
+class HistorialVotaciones:
+    """
+    Clase para mantener en memoria el historial de votaciones de cada usuario.
+    Cada historial se guarda como dos arreglos NumPy paralelos: identificadores de
+    película (`int32`) y puntuaciones (`int8`).
+    """
+
+    # Constructor de la clase
+    """
+    Inicializa el historial vacío a partir de los índices del catálogo.
+
+    Parámetros:
+        - id_por_titulo (dict): Diccionario título -> identificador entero de película.
+        - titulo_por_id (dict): Diccionario identificador entero -> título de película.
+    """
+    def __init__(self, id_por_titulo, titulo_por_id):
+        self.id_por_titulo = id_por_titulo
+        self.titulo_por_id = titulo_por_id
+
+        # username -> (ids int32, puntuaciones int8)
+        self.historiales = {}
+        # username -> votaciones en formato antiguo que no se pudieron resolver
+        self.votos_no_resueltos = {}
+        # username -> cadena original, para no volver a convertir lo que no ha cambiado
+        self._cadenas_cargadas = {}
+        # username -> versión del registro en el almacén de usuarios
+        self.versiones = {}
+
+    # Método para cargar las votaciones desde el DataFrame de usuarios
+    """
+    Convierte las votaciones en formato texto (`[{'title': ..., 'rating': ...}]`)
+    a arreglos de identificadores. Solo se procesan los usuarios cuya cadena
+    de votaciones ha cambiado desde la última carga.
+
+    Parámetros:
+        - usuarios_df (pd.DataFrame): DataFrame con las columnas `Nombre de usuario` y `votaciones`.
+    """
+    def cargar(self, usuarios_df):
+        if usuarios_df.empty or 'Nombre de usuario' not in usuarios_df.columns:
+            return
+
+        vistos = set()
+        versiones = usuarios_df['version'] if 'version' in usuarios_df.columns else [0] * len(usuarios_df)
+        for username, cadena, version in zip(usuarios_df['Nombre de usuario'], usuarios_df['votaciones'], versiones):
+            vistos.add(username)
+            self.versiones[username] = int(version) if pd.notna(version) else 0
+            cadena = cadena if pd.notna(cadena) else "[]"
+            if self._cadenas_cargadas.get(username) == cadena:
+                continue
+            try:
+                votaciones = ast.literal_eval(cadena)
+            except (ValueError, SyntaxError) as e:
+                print(f"Advertencia: Votaciones ilegibles para '{username}'. {e}")
+                votaciones = []
+            self._cargar_usuario(username, votaciones)
+            self._cadenas_cargadas[username] = cadena
+
+        # Eliminamos los usuarios que ya no están en el archivo
+        for username in list(self.historiales):
+            if username not in vistos:
+                self.historiales.pop(username, None)
+                self.votos_no_resueltos.pop(username, None)
+                self._cadenas_cargadas.pop(username, None)
+                self.versiones.pop(username, None)
+
+    # Método privado para convertir las votaciones de un usuario
+    """
+    Resuelve los títulos de una lista de votaciones a identificadores de película.
+    Si un título aparece varias veces se conserva la última puntuación.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - votaciones (List[dict]): Votaciones en formato antiguo.
+    """
+    def _cargar_usuario(self, username, votaciones):
+        puntuacion_por_id = {}
+        no_resueltos = []
+        for v in votaciones:
+            movie_id = self.id_por_titulo.get(v.get('title'))
+            if movie_id is None:
+                print(f"Advertencia: La película '{v.get('title')}' no se encuentra en el sistema.")
+                no_resueltos.append(v)
+                continue
+            puntuacion_por_id[movie_id] = v.get('rating', 0)
+
+        self.historiales[username] = (
+            np.fromiter(puntuacion_por_id.keys(), dtype=np.int32, count=len(puntuacion_por_id)),
+            np.fromiter(puntuacion_por_id.values(), dtype=np.int8, count=len(puntuacion_por_id))
+        )
+        if no_resueltos:
+            self.votos_no_resueltos[username] = no_resueltos
+        else:
+            self.votos_no_resueltos.pop(username, None)
+
+    # Método para comprobar si un usuario tiene historial
+    """
+    Indica si el usuario está registrado en el historial.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - bool: `True` si el usuario existe.
+    """
+    def contiene(self, username):
+        return username in self.historiales
+
+    # Método para obtener el historial de un usuario
+    """
+    Devuelve los arreglos de identificadores y puntuaciones de un usuario.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - Tuple[np.ndarray, np.ndarray]: Identificadores (`int32`) y puntuaciones (`int8`).
+    """
+    def obtener(self, username):
+        return self.historiales.get(
+            username, (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int8))
+        )
+
+    # Método para obtener la versión del registro de un usuario
+    """
+    Devuelve la versión del registro del usuario en el almacén en el momento de la última carga.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - int: Versión del registro, o 0 si no se conoce.
+    """
+    def version(self, username):
+        return self.versiones.get(username, 0)
+
+    # Método para registrar una votación
+    """
+    Registra o actualiza la puntuación de un usuario para una película.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - movie_id (int): Identificador de la película.
+        - puntuacion (int): Puntuación otorgada.
+
+    Retorno:
+        - int: Puntuación anterior del usuario para esa película, o 0 si no había votado.
+    """
+    def registrar(self, username, movie_id, puntuacion):
+        ids, puntuaciones = self.obtener(username)
+        posiciones = np.flatnonzero(ids == movie_id)
+        if len(posiciones):
+            anterior = int(puntuaciones[posiciones[0]])
+            puntuaciones = puntuaciones.copy()
+            puntuaciones[posiciones[0]] = puntuacion
+        else:
+            anterior = 0
+            ids = np.append(ids, np.int32(movie_id))
+            puntuaciones = np.append(puntuaciones, np.int8(puntuacion))
+        self.historiales[username] = (ids, puntuaciones)
+        self._cadenas_cargadas[username] = self.serializar(username)
+        return anterior
+
+    # Método para reemplazar el historial completo de un usuario
+    """
+    Sustituye los arreglos de votaciones de un usuario por los proporcionados.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - ids (np.ndarray): Identificadores de película.
+        - puntuaciones (np.ndarray): Puntuaciones, en el mismo orden que `ids`.
+
+    Retorno:
+        - str: Votaciones serializadas del usuario, listas para guardar en `usuarios.csv`.
+    """
+    def fijar(self, username, ids, puntuaciones):
+        self.historiales[username] = (
+            np.asarray(ids, dtype=np.int32),
+            np.asarray(puntuaciones, dtype=np.int8)
+        )
+        cadena = self.serializar(username)
+        self._cadenas_cargadas[username] = cadena
+        return cadena
+
+    # Método para exportar el historial en formato largo
+    """
+    Devuelve las votaciones de los usuarios indicados como un DataFrame con una fila por voto.
+
+    Parámetros:
+        - usernames (iterable, opcional): Usuarios a exportar. Si es `None`, se exportan todos.
+
+    Retorno:
+        - pd.DataFrame: DataFrame con las columnas `Nombre de usuario`, `movie_id` y `rating`.
+    """
+    def como_dataframe(self, usernames=None):
+        usernames = self.historiales.keys() if usernames is None else usernames
+        usuarios, ids, puntuaciones = [], [], []
+        for username in usernames:
+            if username not in self.historiales:
+                continue
+            ids_usuario, puntuaciones_usuario = self.historiales[username]
+            usuarios.append(np.full(len(ids_usuario), username, dtype=object))
+            ids.append(ids_usuario)
+            puntuaciones.append(puntuaciones_usuario)
+        return pd.DataFrame({
+            'Nombre de usuario': np.concatenate(usuarios) if usuarios else np.empty(0, dtype=object),
+            'movie_id': np.concatenate(ids) if ids else np.empty(0, dtype=np.int32),
+            'rating': np.concatenate(puntuaciones) if puntuaciones else np.empty(0, dtype=np.int8)
+        })
+
+    # Método para obtener las votaciones en el formato antiguo
+    """
+    Devuelve las votaciones de un usuario como lista de diccionarios con las claves
+    `title` y `rating`, incluyendo las que no se pudieron resolver.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - List[dict]: Lista de votaciones.
+    """
+    def como_lista(self, username):
+        ids, puntuaciones = self.obtener(username)
+        votaciones = [
+            {'title': self.titulo_por_id[movie_id], 'rating': puntuacion}
+            for movie_id, puntuacion in zip(ids.tolist(), puntuaciones.tolist())
+        ]
+        return self.votos_no_resueltos.get(username, []) + votaciones
+
+    # Método para serializar las votaciones de un usuario
+    """
+    Convierte las votaciones de un usuario a la cadena que se guarda en `usuarios.csv`.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - str: Representación textual de la lista de votaciones.
+    """
+    def serializar(self, username):
+        return str(self.como_lista(username))
@@ -0,0 +1,95 @@
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+import numpy as np
+
+class IndiceTitulos:
+    """
+    Índice para autocompletar títulos de películas sin recorrer el catálogo.
+
+    Guarda los títulos normalizados (minúsculas, sin acentos y con los signos de puntuación
+    convertidos en espacios) en una única cadena separada por saltos de línea, y las
+    posiciones de inicio de cada palabra en un arreglo ordenado por el texto que sigue.
+    Un título coincide si alguna de sus palabras empieza por el texto buscado (el texto
+    puede abarcar varias palabras), así que la búsqueda es una búsqueda binaria del rango
+    de posiciones cuyo texto empieza por la consulta. La memoria es lineal en el tamaño
+    de los títulos: no se copia ningún fragmento.
+    """
+
+    # Constructor de la clase
+    """
+    Construye el índice de inicios de palabra.
+
+    Parámetros:
+        - titulos (iterable): Títulos del catálogo, en el orden de las filas.
+    """
+    def __init__(self, titulos):
+        normalizados = [self.normalizar(titulo) for titulo in titulos]
+        self.texto = ''.join(normalizado + '\n' for normalizado in normalizados)
+
+        # Posición de inicio de cada título en la cadena
+        largos = np.fromiter((len(normalizado) + 1 for normalizado in normalizados), dtype=np.int64, count=len(normalizados))
+        self.inicios = np.cumsum(largos) - largos
+
+        # Posiciones de inicio de palabra, ordenadas por el resto del título
+        posiciones = [
+            inicio + palabra.start()
+            for inicio, normalizado in zip(self.inicios.tolist(), normalizados)
+            for palabra in re.finditer(r'\S+', normalizado)
+        ]
+        posiciones.sort(key=lambda posicion: self.texto[posicion:self.texto.index('\n', posicion)])
+        self.posiciones = np.array(posiciones, dtype=np.int64)
+
+    # Método para normalizar un texto
+    """
+    Convierte un texto a minúsculas, sin acentos y con un único espacio entre palabras.
+
+    Parámetros:
+        - texto (str): Texto a normalizar.
+
+    Retorno:
+        - str: Texto normalizado.
+    """
+    @staticmethod
+    def normalizar(texto):
+        if not isinstance(texto, str):
+            return ''
+        texto = unicodedata.normalize('NFKD', texto.lower())
+        texto = ''.join(c for c in texto if not unicodedata.combining(c))
+        return re.sub(r'[^\w]+', ' ', texto).strip()
+
+    # Método para buscar títulos
+    """
+    Devuelve las filas con alguna palabra que empieza por el texto indicado. Primero van
+    los títulos que empiezan por el texto y después el resto; dentro de cada grupo, en el
+    orden del catálogo.
+
+    Parámetros:
+        - texto (str): Texto a buscar.
+
+    Retorno:
+        - np.ndarray: Filas del catálogo que coinciden.
+    """
+    def buscar(self, texto):
+        consulta = self.normalizar(texto)
+        if not consulta:
+            return np.empty(0, dtype=np.int32)
+
+        # Se compara solo el fragmento del largo de la consulta que empieza en cada posición
+        def clave(posicion):
+            return self.texto[posicion:posicion + len(consulta)]
+        inicio = bisect_left(self.posiciones, consulta, key=clave)
+        fin = bisect_right(self.posiciones, consulta, lo=inicio, key=clave)
+        posiciones = self.posiciones[inicio:fin]
+
+        # 0 = inicio del título, 1 = inicio de otra palabra
+        filas = (np.searchsorted(self.inicios, posiciones, side='right') - 1).astype(np.int32)
+        tipos = (self.inicios[filas] != posiciones).astype(np.int8)
+
+        # Cada fila se queda con su mejor coincidencia
+        orden = np.lexsort((tipos, filas))
+        filas, tipos = filas[orden], tipos[orden]
+        primeras = np.ones(len(filas), dtype=bool)
+        primeras[1:] = filas[1:] != filas[:-1]
+        filas, tipos = filas[primeras], tipos[primeras]
+        return filas[np.lexsort((filas, tipos))]
@@ -0,0 +1,298 @@
+import argparse
+import gc
+import json
+import sys
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+# Cómo crece cada estructura al proyectarla a otro tamaño
+CRECE_PELICULAS = 'películas'
+CRECE_CUADRATICO = 'películas²'
+CRECE_USUARIOS = 'usuarios'
+
+# Clases cuyas instancias vivas se cuentan para detectar copias duplicadas
+CLASES_GESTORES = ('GestorPeliculas', 'GestorUsuarios')
+
+# Método para obtener el módulo de la clase de un objeto
+"""
+Retorno:
+    - str: Módulo de la clase del objeto ('' si no se puede saber).
+"""
+def _modulo(objeto):
+    modulo = getattr(type(objeto), '__module__', '')
+    return modulo if isinstance(modulo, str) else ''
+
+# Método para medir la memoria de un objeto
+"""
+Calcula los bytes que ocupa un objeto y todo lo que contiene:
+    - DataFrame / Series / Index: `memory_usage(deep=True)`.
+    - np.ndarray: `nbytes` si el arreglo es dueño de sus datos (las vistas de otro arreglo no cuentan).
+    - Matrices dispersas de SciPy: `nbytes` de `data`, `indices` e `indptr` (o `row` y `col`).
+    - Diccionarios, listas, tuplas, conjuntos y objetos de `motor` y `gestores`: recursivamente.
+    - Cualquier otro objeto: `sys.getsizeof`.
+
+Parámetros:
+    - objeto: Objeto a medir.
+    - vistos (set, opcional): Identificadores de los objetos ya contados; un objeto compartido
+      por varias estructuras solo se cuenta en la primera que se mide.
+
+Retorno:
+    - int: Tamaño en bytes.
+"""
+def tamano_bytes(objeto, vistos=None):
+    if vistos is None:
+        vistos = set()
+    if id(objeto) in vistos:
+        return 0
+    vistos.add(id(objeto))
+
+    if isinstance(objeto, pd.DataFrame):
+        return int(objeto.memory_usage(deep=True).sum())
+    if isinstance(objeto, (pd.Series, pd.Index)):
+        return int(objeto.memory_usage(deep=True))
+    if isinstance(objeto, np.ndarray):
+        total = objeto.nbytes if objeto.flags.owndata else 0
+        if objeto.dtype == object:
+            total += sum(tamano_bytes(elemento, vistos) for elemento in objeto.ravel())
+        return total
+    if sp.issparse(objeto):
+        return sum(getattr(objeto, campo).nbytes for campo in ('data', 'indices', 'indptr', 'row', 'col')
+                   if isinstance(getattr(objeto, campo, None), np.ndarray))
+    if isinstance(objeto, dict):
+        return sys.getsizeof(objeto) + sum(
+            tamano_bytes(clave, vistos) + tamano_bytes(valor, vistos) for clave, valor in objeto.items()
+        )
+    if isinstance(objeto, (list, tuple, set, frozenset)):
+        return sys.getsizeof(objeto) + sum(tamano_bytes(elemento, vistos) for elemento in objeto)
+    if hasattr(objeto, '__dict__') and _modulo(objeto).startswith(('motor.', 'gestores.')):
+        return sys.getsizeof(objeto) + tamano_bytes(vars(objeto), vistos)
+    return sys.getsizeof(objeto)
+
+# Método para medir las estructuras de un GestorPeliculas
+"""
+Mide por separado cada estructura residente del gestor: cada columna de `peliculas_df`
+(incluida `combined_features`), la matriz densa de similitud de sinopsis, la matriz TF-IDF
+dispersa del recomendador y su copia en `float32` de los perfiles, los índices del catálogo,
+el historial de votaciones, la popularidad y el DataFrame de usuarios.
+
+Las estructuras compartidas (por ejemplo `fila_por_id`) se cuentan una sola vez, en la
+primera que las contiene. Los textos que además están dentro de un DataFrame no se pueden
+relacionar con los de los diccionarios y se cuentan en ambos.
+
+Parámetros:
+    - gestor_peliculas (GestorPeliculas): Gestor a medir.
+
+Retorno:
+    - List[dict]: Una entrada por estructura con `estructura`, `bytes`, `crece` y `detalle`.
+"""
+def medir_gestor_peliculas(gestor_peliculas):
+    vistos = set()
+    estructuras = []
+
+    def anadir(nombre, objeto, crece, detalle=''):
+        if objeto is None:
+            return
+        estructuras.append({
+            'estructura': nombre,
+            'bytes': tamano_bytes(objeto, vistos),
+            'crece': crece,
+            'detalle': detalle
+        })
+
+    peliculas_df = getattr(gestor_peliculas, 'peliculas_df', None)
+    if peliculas_df is not None:
+        vistos.add(id(peliculas_df))
+        for columna, bytes_columna in peliculas_df.memory_usage(deep=True).items():
+            estructuras.append({
+                'estructura': f"peliculas_df['{columna}']" if columna != 'Index' else 'peliculas_df.index',
+                'bytes': int(bytes_columna),
+                'crece': CRECE_PELICULAS,
+                'detalle': str(peliculas_df[columna].dtype) if columna != 'Index' else ''
+            })
+
+    similitud = getattr(gestor_peliculas, 'cosine_sim_synopsis', None)
+    if isinstance(similitud, np.ndarray) and similitud.size:
+        anadir('cosine_sim_synopsis', similitud, CRECE_CUADRATICO,
+               f"densa {similitud.shape[0]}x{similitud.shape[1]} {similitud.dtype}")
+
+    tfidf = getattr(gestor_peliculas, 'tfidf_recomendaciones', None)
+    if tfidf is not None:
+        anadir('tfidf_recomendaciones', tfidf, CRECE_PELICULAS,
+               f"dispersa {tfidf.shape[0]}x{tfidf.shape[1]} nnz={tfidf.nnz} {tfidf.dtype}")
+
+    perfiles = getattr(gestor_peliculas, 'perfiles', None)
+    if perfiles is not None:
+        anadir('perfiles.matriz', perfiles.matriz, CRECE_PELICULAS,
+               f"copia {perfiles.matriz.dtype} de tfidf_recomendaciones")
+        anadir('perfiles.perfiles', perfiles.perfiles, CRECE_USUARIOS, f"{len(perfiles.perfiles)} perfiles")
+
+    anadir('fila_por_id', getattr(gestor_peliculas, 'fila_por_id', None), CRECE_PELICULAS)
+    anadir('titulo_por_id', getattr(gestor_peliculas, 'titulo_por_id', None), CRECE_PELICULAS)
+    anadir('id_por_titulo', getattr(gestor_peliculas, 'id_por_titulo', None), CRECE_PELICULAS)
+    anadir('indice_titulos', getattr(gestor_peliculas, 'indice_titulos', None), CRECE_PELICULAS)
+    anadir('popularidad', getattr(gestor_peliculas, 'popularidad', None), CRECE_PELICULAS)
+    anadir('historial', getattr(gestor_peliculas, 'historial', None), CRECE_USUARIOS)
+    anadir('usuarios_df', getattr(gestor_peliculas, 'usuarios_df', None), CRECE_USUARIOS)
+    return estructuras
+
+# Método para proyectar las estructuras a otro tamaño
+"""
+Estima el tamaño de cada estructura con otro número de películas y de usuarios,
+escalando linealmente o al cuadrado según cómo crece.
+
+Parámetros:
+    - estructuras (List[dict]): Resultado de `medir_gestor_peliculas`.
+    - peliculas_actuales (int): Películas del catálogo medido.
+    - usuarios_actuales (int): Usuarios del archivo medido.
+    - peliculas (int): Películas del catálogo objetivo.
+    - usuarios (int, opcional): Usuarios objetivo; por defecto, los actuales.
+
+Retorno:
+    - dict: Estructura -> bytes estimados, más la clave `total`.
+"""
+def proyectar(estructuras, peliculas_actuales, usuarios_actuales, peliculas, usuarios=None):
+    factor_peliculas = peliculas / max(peliculas_actuales, 1)
+    factor_usuarios = (usuarios if usuarios is not None else usuarios_actuales) / max(usuarios_actuales, 1)
+    factores = {
+        CRECE_PELICULAS: factor_peliculas,
+        CRECE_CUADRATICO: factor_peliculas ** 2,
+        CRECE_USUARIOS: factor_usuarios
+    }
+    proyeccion = {e['estructura']: int(e['bytes'] * factores[e['crece']]) for e in estructuras}
+    proyeccion['total'] = sum(proyeccion.values())
+    return proyeccion
+
+# Método para localizar las instancias vivas de los gestores
+"""
+Recorre los objetos del recolector de basura y devuelve las instancias vivas de
+`GestorPeliculas` y `GestorUsuarios`, con su tamaño y los objetos que las guardan
+(normalmente vistas). Más de una instancia de la misma clase son datos duplicados.
+
+Retorno:
+    - List[dict]: `clase`, `bytes` y `propietarios` de cada instancia.
+"""
+def instancias_gestores():
+    objetos = gc.get_objects()
+    instancias = [o for o in objetos if type(o).__name__ in CLASES_GESTORES
+                  and _modulo(o).startswith('motor.')]
+    if not instancias:
+        return []
+
+    propietarios = {id(instancia): [] for instancia in instancias}
+    for objeto in objetos:
+        if not _modulo(objeto).startswith(('vistas.', 'gestores.', 'motor.')) or not hasattr(objeto, '__dict__'):
+            continue
+        for atributo, valor in vars(objeto).items():
+            if id(valor) in propietarios and valor is not objeto:
+                propietarios[id(valor)].append(f"{type(objeto).__name__}.{atributo}")
+
+    return [{
+        'clase': type(instancia).__name__,
+        'bytes': tamano_bytes(instancia),
+        'propietarios': propietarios[id(instancia)]
+    } for instancia in instancias]
+
+# Método para generar el informe completo
+"""
+Parámetros:
+    - gestor_peliculas (GestorPeliculas): Gestor a medir.
+    - objetivos (List[int], opcional): Tamaños de catálogo a los que proyectar.
+    - usuarios_objetivo (int, opcional): Usuarios de las proyecciones; por defecto, los actuales.
+
+Retorno:
+    - dict: `peliculas`, `usuarios`, `estructuras`, `total_bytes`, `proyecciones`, `instancias`
+      y `duplicados_bytes` (memoria de las instancias repetidas de cada gestor).
+"""
+def informe(gestor_peliculas, objetivos=(), usuarios_objetivo=None):
+    estructuras = medir_gestor_peliculas(gestor_peliculas)
+    peliculas = len(getattr(gestor_peliculas, 'peliculas_df', []))
+    usuarios = len(getattr(gestor_peliculas, 'usuarios_df', []))
+
+    instancias = instancias_gestores()
+    duplicados = 0
+    for clase in CLASES_GESTORES:
+        tamanos = sorted((i['bytes'] for i in instancias if i['clase'] == clase), reverse=True)
+        duplicados += sum(tamanos[1:])
+
+    return {
+        'peliculas': peliculas,
+        'usuarios': usuarios,
+        'estructuras': estructuras,
+        'total_bytes': sum(e['bytes'] for e in estructuras),
+        'proyecciones': {
+            str(objetivo): proyectar(estructuras, peliculas, usuarios, objetivo, usuarios_objetivo)
+            for objetivo in objetivos
+        },
+        'instancias': instancias,
+        'duplicados_bytes': duplicados
+    }
+
+# Método para dar formato a un tamaño
+"""
+Parámetros:
+    - n (int): Tamaño en bytes.
+
+Retorno:
+    - str: Tamaño legible (B, KB, MB, GB o TB).
+"""
+def formato_bytes(n):
+    for unidad in ('B', 'KB', 'MB', 'GB'):
+        if abs(n) < 1024:
+            return f"{n:.0f} {unidad}" if unidad == 'B' else f"{n:.1f} {unidad}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+# Método para convertir el informe en texto
+"""
+Parámetros:
+    - datos (dict): Resultado de `informe`.
+
+Retorno:
+    - str: Tabla con el tamaño de cada estructura, sus proyecciones y las instancias de los gestores.
+"""
+def texto_informe(datos):
+    objetivos = list(datos['proyecciones'])
+    ancho = max([len('estructura')] + [len(e['estructura']) for e in datos['estructuras']])
+    lineas = [f"Catálogo de {datos['peliculas']} películas y {datos['usuarios']} usuarios", '']
+    cabecera = f"{'estructura':{ancho}} {'crece':>11} {'actual':>10}" + ''.join(f" {objetivo + ' pel.':>12}" for objetivo in objetivos)
+    lineas.append(cabecera)
+    for e in sorted(datos['estructuras'], key=lambda e: -e['bytes']):
+        fila = f"{e['estructura']:{ancho}} {e['crece']:>11} {formato_bytes(e['bytes']):>10}"
+        fila += ''.join(f" {formato_bytes(datos['proyecciones'][o][e['estructura']]):>12}" for o in objetivos)
+        if e['detalle']:
+            fila += f"  {e['detalle']}"
+        lineas.append(fila)
+    lineas.append(f"{'total':{ancho}} {'':>11} {formato_bytes(datos['total_bytes']):>10}"
+                  + ''.join(f" {formato_bytes(datos['proyecciones'][o]['total']):>12}" for o in objetivos))
+
+    lineas.append('')
+    lineas.append('Instancias de gestores:')
+    for instancia in datos['instancias']:
+        propietarios = ', '.join(instancia['propietarios']) or 'sin propietario en vistas, gestores o motor'
+        lineas.append(f"  {instancia['clase']:16} {formato_bytes(instancia['bytes']):>10}  ({propietarios})")
+    lineas.append(f"  Memoria en instancias duplicadas: {formato_bytes(datos['duplicados_bytes'])}")
+    return '\n'.join(lineas)
+
+# Punto de entrada: python -m motor.InformeMemoria
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Informe de la memoria que ocupan las estructuras del recomendador.")
+    parser.add_argument('--catalogo', default='peliculas_final_imagenes.csv', help="CSV de películas.")
+    parser.add_argument('--usuarios', default='usuarios.csv', help="CSV de usuarios.")
+    parser.add_argument('--objetivos', type=int, nargs='*', default=[10_000, 100_000, 1_000_000],
+                        help="Tamaños de catálogo a los que proyectar.")
+    parser.add_argument('--usuarios-objetivo', type=int, help="Usuarios de las proyecciones (por defecto, los actuales).")
+    parser.add_argument('--salida', help="Archivo JSON donde guardar el informe.")
+    args = parser.parse_args()
+
+    # Las instancias duplicadas que crean las vistas se cuentan con python -m gestores.InformeMemoriaInterfaz
+    from motor.GestorPeliculas import GestorPeliculas
+    gestor_peliculas = GestorPeliculas(args.catalogo, args.usuarios)
+
+    datos = informe(gestor_peliculas, args.objetivos, args.usuarios_objetivo)
+    print(texto_informe(datos))
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+        print(f"\nInforme guardado en '{args.salida}'.")
@@ -0,0 +1,262 @@
+import atexit
+import functools
+import json
+import math
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Límites superiores (en segundos) de los intervalos de los histogramas de latencia
+LIMITES = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+class Histograma:
+    """
+    Histograma de latencias con intervalos fijos (los de `LIMITES` y uno final sin límite),
+    con el número de llamadas y la suma de tiempos. Registrar una medida es una búsqueda
+    binaria y tres sumas, sin reservar memoria.
+    """
+    __slots__ = ('cuentas', 'suma', 'n')
+
+    def __init__(self):
+        self.cuentas = [0] * (len(LIMITES) + 1)
+        self.suma = 0.0
+        self.n = 0
+
+    # Método para registrar una medida
+    """
+    Parámetros:
+        - segundos (float): Duración de la llamada.
+    """
+    def observar(self, segundos):
+        self.cuentas[bisect_left(LIMITES, segundos)] += 1
+        self.suma += segundos
+        self.n += 1
+
+    # Método para estimar un percentil
+    """
+    Devuelve el límite superior del intervalo en el que cae el percentil, es decir,
+    una cota superior de la latencia con una resolución de un intervalo.
+
+    Parámetros:
+        - q (float): Percentil entre 0 y 1.
+
+    Retorno:
+        - float: Latencia en segundos (`inf` si cae en el último intervalo), o `None` sin medidas.
+    """
+    def percentil(self, q):
+        if self.n == 0:
+            return None
+        objetivo = q * self.n
+        acumulado = 0
+        for limite, cuenta in zip(LIMITES + (math.inf,), self.cuentas):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return limite
+        return math.inf
+
+class Registro:
+    """
+    Registro en memoria de las métricas del proceso: un histograma de latencia por operación
+    y los aciertos y fallos de cada caché.
+
+    No usa cerrojos: las actualizaciones son sumas sobre listas protegidas por el GIL, así que
+    medir cuesta lo mismo desde cualquier hilo. Con varios hilos midiendo a la vez la misma
+    operación puede perderse alguna cuenta aislada, lo que no afecta a las estadísticas.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - activo (bool): Si es `False`, las medidas se descartan sin coste.
+    """
+    def __init__(self, activo=True):
+        self.activo = activo
+        self.histogramas = {}
+        # nombre de la caché -> [aciertos, fallos]
+        self.caches = {}
+
+    # Método para registrar la duración de una operación
+    """
+    Parámetros:
+        - nombre (str): Operación medida.
+        - segundos (float): Duración de la llamada.
+    """
+    def observar(self, nombre, segundos):
+        histograma = self.histogramas.get(nombre)
+        if histograma is None:
+            histograma = self.histogramas.setdefault(nombre, Histograma())
+        histograma.observar(segundos)
+
+    # Método para registrar una consulta a una caché
+    """
+    Parámetros:
+        - nombre (str): Caché consultada.
+        - acierto (bool): Si el dato estaba en la caché.
+    """
+    def registrar_cache(self, nombre, acierto):
+        if not self.activo:
+            return
+        cuentas = self.caches.get(nombre)
+        if cuentas is None:
+            cuentas = self.caches.setdefault(nombre, [0, 0])
+        cuentas[0 if acierto else 1] += 1
+
+    # Método para consultar el tiempo acumulado de varias operaciones
+    """
+    Parámetros:
+        - nombres (iterable): Operaciones a consultar.
+
+    Retorno:
+        - dict: Operación -> segundos acumulados (0 si no se ha medido).
+    """
+    def sumas(self, nombres):
+        return {nombre: self.histogramas[nombre].suma if nombre in self.histogramas else 0.0 for nombre in nombres}
+
+    # Método para vaciar el registro
+    """
+    Descarta todas las medidas acumuladas.
+    """
+    def reiniciar(self):
+        self.histogramas = {}
+        self.caches = {}
+
+    # Método para exportar las métricas como diccionario
+    """
+    Retorno:
+        - dict: `operaciones` (llamadas, tiempo total y medio, percentiles estimados e intervalos)
+          y `caches` (aciertos, fallos y tasa de aciertos).
+    """
+    def como_json(self):
+        operaciones = {}
+        for nombre, h in sorted(self.histogramas.items()):
+            if h.n == 0:
+                continue
+            operaciones[nombre] = {
+                'llamadas': h.n,
+                'segundos_total': h.suma,
+                'media_ms': h.suma / h.n * 1000,
+                'p50_ms': h.percentil(0.50) * 1000,
+                'p95_ms': h.percentil(0.95) * 1000,
+                'p99_ms': h.percentil(0.99) * 1000,
+                'intervalos': {str(limite): cuenta for limite, cuenta in zip(LIMITES + ('+Inf',), h.cuentas)}
+            }
+        caches = {}
+        for nombre, (aciertos, fallos) in sorted(self.caches.items()):
+            total = aciertos + fallos
+            caches[nombre] = {
+                'aciertos': aciertos,
+                'fallos': fallos,
+                'tasa_aciertos': aciertos / total if total else None
+            }
+        return {'operaciones': operaciones, 'caches': caches}
+
+    # Método para exportar las métricas en formato Prometheus
+    """
+    Retorno:
+        - str: Métricas en el formato de texto de Prometheus (histogramas acumulados por `le`).
+    """
+    def como_prometheus(self):
+        lineas = [
+            '# HELP sr_operacion_segundos Latencia de las operaciones del sistema de recomendación.',
+            '# TYPE sr_operacion_segundos histogram'
+        ]
+        for nombre, h in sorted(self.histogramas.items()):
+            etiqueta = f'operacion="{nombre}"'
+            acumulado = 0
+            for limite, cuenta in zip(LIMITES, h.cuentas):
+                acumulado += cuenta
+                lineas.append(f'sr_operacion_segundos_bucket{{{etiqueta},le="{limite}"}} {acumulado}')
+            lineas.append(f'sr_operacion_segundos_bucket{{{etiqueta},le="+Inf"}} {h.n}')
+            lineas.append(f'sr_operacion_segundos_sum{{{etiqueta}}} {h.suma}')
+            lineas.append(f'sr_operacion_segundos_count{{{etiqueta}}} {h.n}')
+
+        lineas.append('# HELP sr_cache_consultas_total Consultas a las cachés, por resultado.')
+        lineas.append('# TYPE sr_cache_consultas_total counter')
+        for nombre, (aciertos, fallos) in sorted(self.caches.items()):
+            lineas.append(f'sr_cache_consultas_total{{cache="{nombre}",resultado="acierto"}} {aciertos}')
+            lineas.append(f'sr_cache_consultas_total{{cache="{nombre}",resultado="fallo"}} {fallos}')
+        return '\n'.join(lineas) + '\n'
+
+    # Método para guardar las métricas en un archivo
+    """
+    Escribe las métricas en JSON si la ruta termina en `.json` y en formato Prometheus si no.
+
+    Parámetros:
+        - ruta (str): Archivo de destino.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al escribir el archivo.
+    """
+    def exportar(self, ruta):
+        try:
+            with open(ruta, 'w', encoding='utf-8') as f:
+                if ruta.endswith('.json'):
+                    json.dump(self.como_json(), f, indent=2, ensure_ascii=False)
+                else:
+                    f.write(self.como_prometheus())
+        except Exception as e:
+            print(f"Error al exportar las métricas: {e}")
+
+# Registro del proceso. SR_INSTRUMENTACION=0 desactiva las medidas y, si SR_METRICAS indica
+# un archivo, las métricas se guardan en él al terminar
+REGISTRO = Registro(activo=os.environ.get('SR_INSTRUMENTACION', '1') != '0')
+if os.environ.get('SR_METRICAS'):
+    atexit.register(lambda: REGISTRO.exportar(os.environ['SR_METRICAS']))
+
+# Método para medir una función
+"""
+Decorador que registra la duración de cada llamada en el histograma de la operación,
+también cuando la función lanza una excepción.
+
+Parámetros:
+    - nombre (str, opcional): Nombre de la operación; por defecto, `Clase.metodo`.
+
+Retorno:
+    - callable: Decorador.
+"""
+def medir(nombre=None):
+    def decorador(funcion):
+        operacion = nombre or funcion.__qualname__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not REGISTRO.activo:
+                return funcion(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                REGISTRO.observar(operacion, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
+
+# Método para medir un bloque de código
+"""
+Gestor de contexto que registra la duración del bloque en el histograma de la operación.
+
+Parámetros:
+    - nombre (str): Nombre de la operación.
+"""
+@contextmanager
+def cronometro(nombre):
+    if not REGISTRO.activo:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRO.observar(nombre, time.perf_counter() - inicio)
+
+# Método para registrar una consulta a una caché
+"""
+Parámetros:
+    - nombre (str): Caché consultada.
+    - acierto (bool): Si el dato estaba en la caché.
+"""
+def registrar_cache(nombre, acierto):
+    REGISTRO.registrar_cache(nombre, acierto)
@@ -0,0 +1,237 @@
+import threading
+from motor.GestorUsuarios import GestorUsuarios
+from motor.Instrumentacion import REGISTRO
+from motor.TrazaArranque import TRAZA
+
+# Etapas de la construcción del modelo que se desglosan en la traza de arranque
+ETAPAS_MODELO = (
+    'GestorPeliculas.cargar_catalogo',
+    'GestorPeliculas.cargar_usuarios',
+    'GestorPeliculas._indexar_catalogo',
+    'GestorPeliculas.importar_sklearn',
+    'GestorPeliculas.tfidf_sinopsis',
+    'GestorPeliculas.similitud_sinopsis',
+    'GestorPeliculas.tfidf_recomendaciones',
+    'GestorPeliculas.cargar_perfiles',
+    'GestorPeliculas._calcular_popularidad'
+)
+
+class Motor:
+    """
+    Punto de entrada del motor de recomendación sin interfaz gráfica: catálogo, modelo,
+    almacén de votaciones y recomendaciones, para usarlo desde la interfaz, scripts o servidores.
+
+    Importar este módulo no carga PyQt5, pandas solo se usa para el archivo de usuarios y el
+    modelo (con scikit-learn) se construye la primera vez que se necesita, o al llamar a `precargar`.
+    Los gestores siguen disponibles en `peliculas` y `usuarios` para las operaciones que no
+    tienen un método propio aquí.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - file_path (str, opcional): Ruta del CSV de películas.
+        - file_path_usuarios (str, opcional): Ruta del CSV de usuarios.
+        - precargar (bool, opcional): Si es `True`, construye el modelo al crear el motor.
+    """
+    def __init__(self, file_path='peliculas_final_imagenes.csv', file_path_usuarios='usuarios.csv', precargar=False):
+        self.file_path = file_path
+        self.file_path_usuarios = file_path_usuarios
+        self.usuarios = GestorUsuarios(file_path_usuarios)
+
+        self._peliculas = None
+        self._cerrojo_modelo = threading.Lock()
+        # Funciones a suscribir a los cambios de votaciones cuando exista el modelo
+        self._suscriptores = []
+
+        if precargar:
+            self.precargar()
+
+    # Propiedad con el gestor de películas
+    """
+    Construye el gestor de películas (catálogo y modelo) la primera vez que se pide.
+    Si varios hilos lo piden a la vez, solo uno lo construye.
+
+    Retorno:
+        - GestorPeliculas: Gestor compartido.
+    """
+    @property
+    def peliculas(self):
+        if self._peliculas is None:
+            with self._cerrojo_modelo:
+                if self._peliculas is None:
+                    self._peliculas = self._construir_modelo()
+        return self._peliculas
+
+    # Método privado para construir el gestor de películas
+    """
+    Importa y crea el gestor de películas registrando en la traza de arranque el tiempo de
+    cada etapa, y le suscribe las funciones pendientes.
+
+    Retorno:
+        - GestorPeliculas: Gestor recién construido.
+    """
+    def _construir_modelo(self):
+        with TRAZA.etapa('importar GestorPeliculas'):
+            from motor.GestorPeliculas import GestorPeliculas
+
+        antes = REGISTRO.sumas(ETAPAS_MODELO)
+
+        def desglose():
+            despues = REGISTRO.sumas(ETAPAS_MODELO)
+            return [(nombre.split('.', 1)[1], despues[nombre] - antes[nombre])
+                    for nombre in ETAPAS_MODELO if despues[nombre] > antes[nombre]]
+
+        with TRAZA.etapa('construir el modelo (GestorPeliculas)', desglose):
+            peliculas = GestorPeliculas(self.file_path, self.file_path_usuarios)
+        for funcion in self._suscriptores:
+            peliculas.suscribir(funcion)
+        return peliculas
+
+    # Método para construir el modelo por adelantado
+    """
+    Construye el modelo si aún no existe (por ejemplo, antes de atender peticiones).
+
+    Retorno:
+        - Motor: El propio motor.
+    """
+    def precargar(self):
+        self.peliculas
+        return self
+
+    # Método para saber si el modelo ya está construido
+    """
+    Retorno:
+        - bool: `True` si el gestor de películas ya existe.
+    """
+    def modelo_cargado(self):
+        return self._peliculas is not None
+
+    # Método para suscribirse a los cambios de votaciones
+    """
+    Igual que `GestorPeliculas.suscribir`, pero se puede llamar antes de que exista el modelo.
+
+    Parámetros:
+        - funcion (callable): Función a llamar con cada cambio.
+    """
+    def suscribir(self, funcion):
+        with self._cerrojo_modelo:
+            self._suscriptores.append(funcion)
+            if self._peliculas is not None:
+                self._peliculas.suscribir(funcion)
+
+    # Método para buscar películas por título
+    """
+    Parámetros:
+        - texto (str): Texto a buscar en los títulos.
+
+    Retorno:
+        - List[dict]: Películas encontradas (ver `GestorPeliculas.buscar_peliculas2`).
+    """
+    def buscar(self, texto):
+        return self.peliculas.buscar_peliculas2(texto)
+
+    # Método para obtener los detalles de una película
+    """
+    Parámetros:
+        - titulo (str): Título de la película.
+
+    Retorno:
+        - dict: Detalles de la película, o `None` si no existe.
+    """
+    def detalles(self, titulo):
+        return self.peliculas.obtener_detalles_pelicula(titulo)
+
+    # Método para obtener películas al azar
+    """
+    Parámetros:
+        - cantidad (int, opcional): Número de películas.
+
+    Retorno:
+        - List[dict]: Películas elegidas al azar.
+    """
+    def al_azar(self, cantidad=12):
+        return self.peliculas.peliculas_al_azar(cantidad)
+
+    # Método para obtener las películas más populares
+    """
+    Parámetros:
+        - cantidad (int, opcional): Número de películas.
+        - genero (str, opcional): Género por el que filtrar.
+
+    Retorno:
+        - List[dict]: Películas más populares.
+    """
+    def populares(self, cantidad=12, genero=None):
+        return self.peliculas.peliculas_populares(cantidad, genero)
+
+    # Método para obtener las películas parecidas a otra
+    """
+    Parámetros:
+        - titulo (str): Título de la película.
+
+    Retorno:
+        - List[dict]: Películas con la sinopsis más parecida (ver `GestorPeliculas.recomendar_peliculas`).
+    """
+    def similares(self, titulo):
+        return self.peliculas.recomendar_peliculas(titulo)
+
+    # Método para recomendar películas a un usuario
+    """
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - cantidad (int, opcional): Número de recomendaciones.
+
+    Retorno:
+        - List[dict]: Recomendaciones ordenadas (ver `GestorPeliculas.recomendar_peliculas_por_usuario`).
+    """
+    def recomendar(self, username, cantidad=10):
+        return self.peliculas.recomendar_peliculas_por_usuario(username)[:cantidad]
+
+    # Método para registrar una votación
+    """
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - titulo (str): Película votada.
+        - puntuacion (int): Puntuación de 1 a 5.
+
+    Retorno:
+        - str: Mensaje con el resultado de la votación.
+    """
+    def votar(self, username, titulo, puntuacion):
+        return self.peliculas.votar_pelicula(username, titulo, puntuacion)
+
+    # Método para obtener las valoraciones de un usuario
+    """
+    Parámetros:
+        - username (str): Nombre de usuario.
+
+    Retorno:
+        - List[dict]: Películas valoradas y sus puntuaciones.
+    """
+    def valoraciones(self, username):
+        return self.peliculas.obtener_valoraciones_usuario(username)
+
+    # Método para validar las credenciales de un usuario
+    """
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - password (str): Contraseña.
+
+    Retorno:
+        - Tuple[bool, str]: Si las credenciales son válidas y un mensaje.
+    """
+    def validar_usuario(self, username, password):
+        return self.usuarios.validar_usuario(username, password)
+
+    # Método para registrar un usuario
+    """
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - password (str): Contraseña.
+
+    Retorno:
+        - str: Mensaje con el resultado del registro.
+    """
+    def registrar_usuario(self, username, password):
+        return self.usuarios.registrar_usuario(username, password)
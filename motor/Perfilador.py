@@ -0,0 +1,251 @@
+import argparse
+import cProfile
+import functools
+import itertools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# Directorio por defecto de los perfiles (SR_PERFILADO=1)
+DIRECTORIO_PERFILES = 'perfiles'
+
+# Índice de las llamadas más lentas dentro del directorio de perfiles
+INDICE_LENTAS = 'lentas.json'
+
+class _Muestreador(threading.Thread):
+    """
+    Hilo que toma muestras periódicas de la pila de otro hilo y cuenta cuántas veces
+    aparece cada pila completa. El resultado se escribe en formato de pilas colapsadas
+    (`raiz;...;hoja cuenta`), la entrada de `flamegraph.pl`, speedscope o inferno.
+    """
+
+    def __init__(self, hilo_id, intervalo):
+        super().__init__(name='perfilador-muestreo', daemon=True)
+        self.hilo_id = hilo_id
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.parada = threading.Event()
+
+    def run(self):
+        while not self.parada.wait(self.intervalo):
+            frame = sys._current_frames().get(self.hilo_id)
+            pila = []
+            while frame is not None:
+                codigo = frame.f_code
+                pila.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+                frame = frame.f_back
+            if pila:
+                self.pilas[';'.join(reversed(pila))] += 1
+
+    # Método para detener el muestreo
+    """
+    Retorno:
+        - Counter: Número de muestras de cada pila.
+    """
+    def detener(self):
+        self.parada.set()
+        self.join()
+        return self.pilas
+
+class Perfilador:
+    """
+    Perfilado bajo demanda de operaciones concretas.
+
+    Mientras está activo, cada llamada a una función decorada con `perfilar` se ejecuta
+    con `cProfile` y, a la vez, con un muestreador de su pila. Por cada llamada se escriben
+    un perfil `.prof` (para `pstats` o snakeviz) y un archivo `.folded` de pilas colapsadas
+    (para generar un flamegraph sin conexión). Solo se conservan los archivos de las
+    `max_lentas` llamadas más lentas, que se listan en `lentas.json`.
+
+    Desactivado, el decorador solo comprueba un atributo antes de llamar a la función.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - directorio (str, opcional): Directorio de los perfiles; `None` lo deja desactivado.
+        - max_lentas (int, opcional): Llamadas más lentas que se conservan.
+        - intervalo (float, opcional): Segundos entre muestras de la pila.
+    """
+    def __init__(self, directorio=None, max_lentas=10, intervalo=0.002):
+        self.directorio = directorio or DIRECTORIO_PERFILES
+        self.activo = directorio is not None
+        self.max_lentas = max_lentas
+        self.intervalo = intervalo
+        self.lentas = []
+        self.cerrojo = threading.Lock()
+        self._contador = itertools.count(1)
+        # Evita perfilar una operación decorada dentro de otra en el mismo hilo
+        self._local = threading.local()
+
+    # Método para activar o desactivar el perfilado
+    """
+    Parámetros:
+        - activo (bool): Si se perfilan las próximas llamadas.
+        - directorio (str, opcional): Nuevo directorio de los perfiles.
+    """
+    def activar(self, activo=True, directorio=None):
+        if directorio:
+            with self.cerrojo:
+                self.directorio = directorio
+                self.lentas = []
+        self.activo = activo
+
+    # Método para perfilar una llamada
+    """
+    Ejecuta la función con `cProfile` y el muestreador y registra el resultado.
+    Si otra herramienta de perfilado ocupa `cProfile`, se usa solo el muestreador.
+
+    Parámetros:
+        - nombre (str): Nombre de la operación.
+        - funcion (callable): Función a ejecutar.
+        - args, kwargs: Argumentos de la función.
+
+    Retorno:
+        - El valor devuelto por la función.
+    """
+    def ejecutar(self, nombre, funcion, *args, **kwargs):
+        if getattr(self._local, 'perfilando', False):
+            return funcion(*args, **kwargs)
+        self._local.perfilando = True
+
+        perfil = cProfile.Profile()
+        muestreador = _Muestreador(threading.get_ident(), self.intervalo)
+        muestreador.start()
+        try:
+            perfil.enable()
+        except ValueError:
+            perfil = None
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            duracion = time.perf_counter() - inicio
+            if perfil is not None:
+                perfil.disable()
+            pilas = muestreador.detener()
+            self._local.perfilando = False
+            try:
+                self._registrar(nombre, duracion, perfil, pilas)
+            except Exception as e:
+                print(f"Error al guardar el perfil de {nombre}: {e}")
+
+    # Método privado para guardar el resultado de una llamada
+    """
+    Escribe el perfil y las pilas colapsadas de la llamada y la incluye entre las más lentas,
+    borrando los archivos de la llamada que deja de estarlo.
+
+    Parámetros:
+        - nombre (str): Nombre de la operación.
+        - duracion (float): Duración de la llamada en segundos.
+        - perfil (cProfile.Profile): Perfil de la llamada, o `None`.
+        - pilas (Counter): Muestras de cada pila.
+    """
+    def _registrar(self, nombre, duracion, perfil, pilas):
+        with self.cerrojo:
+            if len(self.lentas) >= self.max_lentas and duracion <= self.lentas[-1]['segundos']:
+                return
+
+            os.makedirs(self.directorio, exist_ok=True)
+            base = os.path.join(self.directorio, f"{next(self._contador):05d}_{nombre}_{duracion * 1000:.0f}ms")
+            archivos = []
+            if perfil is not None:
+                perfil.dump_stats(base + '.prof')
+                archivos.append(base + '.prof')
+            with open(base + '.folded', 'w', encoding='utf-8') as f:
+                for pila, cuenta in pilas.most_common():
+                    f.write(f"{pila} {cuenta}\n")
+            archivos.append(base + '.folded')
+
+            self.lentas.append({
+                'operacion': nombre,
+                'segundos': duracion,
+                'fecha': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'hilo': threading.current_thread().name,
+                'muestras': sum(pilas.values()),
+                'archivos': archivos
+            })
+            self.lentas.sort(key=lambda llamada: -llamada['segundos'])
+            for descartada in self.lentas[self.max_lentas:]:
+                for archivo in descartada['archivos']:
+                    try:
+                        os.remove(archivo)
+                    except OSError:
+                        pass
+            del self.lentas[self.max_lentas:]
+
+            with open(os.path.join(self.directorio, INDICE_LENTAS), 'w', encoding='utf-8') as f:
+                json.dump(self.lentas, f, indent=2, ensure_ascii=False)
+
+# Método para crear el perfilador del proceso
+"""
+Lee la configuración del entorno:
+    - SR_PERFILADO: `1` activa el perfilado en `perfiles/`; cualquier otro valor
+      (salvo `0`) es el directorio de los perfiles.
+    - SR_PERFILADO_LENTAS: Número de llamadas lentas que se conservan (10 por defecto).
+
+Retorno:
+    - Perfilador: Perfilador configurado.
+"""
+def _desde_entorno():
+    valor = os.environ.get('SR_PERFILADO', '').strip()
+    directorio = None
+    if valor and valor != '0':
+        directorio = DIRECTORIO_PERFILES if valor == '1' else valor
+    try:
+        max_lentas = int(os.environ.get('SR_PERFILADO_LENTAS', 10))
+    except ValueError:
+        max_lentas = 10
+    return Perfilador(directorio, max_lentas=max(1, max_lentas))
+
+PERFILADOR = _desde_entorno()
+
+# Método para marcar una operación como perfilable
+"""
+Decorador que perfila cada llamada a la función mientras el perfilador está activo.
+
+Parámetros:
+    - nombre (str, opcional): Nombre de la operación en los archivos; por defecto, el de la función.
+
+Retorno:
+    - callable: Decorador.
+"""
+def perfilar(nombre=None):
+    def decorador(funcion):
+        operacion = nombre or funcion.__name__
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not PERFILADOR.activo:
+                return funcion(*args, **kwargs)
+            return PERFILADOR.ejecutar(operacion, funcion, *args, **kwargs)
+        return envoltura
+    return decorador
+
+# Punto de entrada: python -m motor.Perfilador
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Muestra las llamadas más lentas guardadas por el perfilador.")
+    parser.add_argument('directorio', nargs='?', default=DIRECTORIO_PERFILES, help="Directorio de los perfiles.")
+    parser.add_argument('--funciones', type=int, default=0,
+                        help="Muestra también las N funciones con más tiempo acumulado de la llamada más lenta.")
+    args = parser.parse_args()
+
+    try:
+        with open(os.path.join(args.directorio, INDICE_LENTAS), encoding='utf-8') as f:
+            lentas = json.load(f)
+    except FileNotFoundError:
+        sys.exit(f"No hay perfiles en {args.directorio}. Ejecuta la aplicación con SR_PERFILADO=1.")
+
+    for llamada in lentas:
+        print(f"{llamada['segundos'] * 1000:10.1f} ms  {llamada['operacion']:<40} {llamada['fecha']}  "
+              f"{os.path.splitext(llamada['archivos'][-1])[0]}")
+    print("\nPara un flamegraph: flamegraph.pl <archivo>.folded > llamada.svg (o ábrelo en speedscope.app)")
+
+    perfiles = [a for a in lentas[0]['archivos'] if a.endswith('.prof')] if lentas else []
+    if args.funciones and perfiles:
+        print()
+        pstats.Stats(perfiles[0]).sort_stats('cumulative').print_stats(args.funciones)
@@ -0,0 +1,397 @@
+import os
+import pickle
+import tempfile
+import numpy as np
+from motor.Instrumentacion import registrar_cache
+
+# Pesos de cada valoración (índice = puntuación), normalizados para no exceder 1
+PESOS_VALORACION = np.array([0.0, 0.2, 0.4, 0.6, 0.8, 1.0])
+
+# Formato de los perfiles guardados; al cambiarlo se descartan los archivos anteriores
+# (la versión 1 podía guardar como válidos perfiles construidos solo con la última votación)
+FORMATO_PERFILES = 2
+
+class PerfilesUsuario:
+    """
+    Clase para mantener el perfil de gustos de cada usuario en el espacio TF-IDF de
+    características combinadas (sinopsis, director y género).
+
+    El perfil es la suma de los vectores de las películas votadas ponderados por su
+    valoración (centroide de Rocchio sin normalizar) junto con la suma de los pesos.
+    Una votación solo modifica las posiciones no nulas del vector de esa película.
+    Los perfiles se guardan en un archivo `.npz` junto al archivo de usuarios y se
+    reconstruyen si la versión del usuario en el almacén no coincide.
+
+    Cada votación no reescribe el `.npz`: se añade a un registro de cambios (`.cambios`)
+    que se vuelve a aplicar y se compacta en el `.npz` al cargar. Si se pierde algún cambio,
+    la versión del perfil deja de coincidir con la del usuario y el perfil se reconstruye.
+    """
+
+    # Constructor de la clase
+    """
+    Inicializa el gestor de perfiles.
+
+    Parámetros:
+        - matriz (scipy.sparse.csr_matrix): Matriz TF-IDF (una fila por película, normalizada L2).
+        - fila_por_id (np.ndarray): Arreglo identificador de película -> fila de la matriz.
+        - ruta (str): Archivo donde se guardan los perfiles.
+        - firma (str): Identificador del modelo; los perfiles de otro modelo se descartan al cargar.
+    """
+    def __init__(self, matriz, fila_por_id, ruta, firma):
+        self.matriz = matriz.tocsr().astype(np.float32)
+        self.fila_por_id = fila_por_id
+        self.ruta = ruta
+        self.ruta_cambios = os.path.splitext(ruta)[0] + '.cambios'
+        self.firma = f"{firma}-v{FORMATO_PERFILES}"
+
+        # username -> [vector (float32), suma de pesos, versión del usuario]
+        self.perfiles = {}
+
+        # Usuarios cuyo perfil se ha construido desde cero y aún no está en disco
+        self.sin_guardar = set()
+
+    # Método para cargar los perfiles guardados
+    """
+    Carga los perfiles desde disco si fueron calculados con el mismo modelo, aplica el
+    registro de cambios y, si tenía alguno, lo compacta en un nuevo `.npz`.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al leer los archivos; se empieza sin perfiles.
+    """
+    def cargar(self):
+        try:
+            if os.path.exists(self.ruta):
+                with np.load(self.ruta) as datos:
+                    if str(datos['firma']) != self.firma or datos['vectores'].shape[1] != self.matriz.shape[1]:
+                        print("Advertencia: Los perfiles guardados pertenecen a otro modelo. Se recalcularán.")
+                    else:
+                        for username, vector, peso, version in zip(
+                            datos['usuarios'].tolist(), datos['vectores'], datos['pesos'].tolist(), datos['versiones'].tolist()
+                        ):
+                            self.perfiles[username] = [vector.copy(), peso, version]
+            if self._aplicar_cambios():
+                self.guardar()
+        except Exception as e:
+            print(f"Error al cargar perfiles de usuario: {e}")
+            self.perfiles = {}
+
+    # Método privado para aplicar el registro de cambios
+    """
+    Vuelve a aplicar, en orden, los cambios añadidos desde la última escritura del `.npz`.
+    Se ignoran los cambios de otro modelo y se para en el primer bloque incompleto o
+    dañado (por ejemplo, de un proceso que terminó a mitad de una escritura).
+
+    Retorno:
+        - int: Bloques de cambios leídos.
+    """
+    def _aplicar_cambios(self):
+        if not os.path.exists(self.ruta_cambios):
+            return 0
+        bloques = 0
+        with open(self.ruta_cambios, 'rb') as f:
+            while True:
+                try:
+                    registros = pickle.load(f)
+                except Exception:
+                    break
+                bloques += 1
+                for firma, tipo, *datos in registros:
+                    if firma != self.firma:
+                        continue
+                    if tipo == 'perfil':
+                        username, vector, peso, version = datos
+                        self.perfiles[username] = [vector, peso, version]
+                    else:
+                        self._aplicar_votacion(*datos)
+        return bloques
+
+    # Método para guardar los perfiles
+    """
+    Guarda todos los perfiles en disco con un reemplazo atómico y vacía el registro de cambios.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al escribir el archivo.
+    """
+    def guardar(self):
+        try:
+            usuarios = list(self.perfiles)
+            columnas = self.matriz.shape[1]
+            directorio = os.path.dirname(os.path.abspath(self.ruta))
+            fd, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix='.perfiles-', suffix='.npz')
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    firma=np.array(self.firma),
+                    usuarios=np.array(usuarios, dtype=str),
+                    vectores=np.array([self.perfiles[u][0] for u in usuarios], dtype=np.float32).reshape(-1, columnas),
+                    pesos=np.array([self.perfiles[u][1] for u in usuarios], dtype=np.float64),
+                    versiones=np.array([self.perfiles[u][2] for u in usuarios], dtype=np.int64)
+                )
+            os.replace(ruta_temporal, self.ruta)
+            if os.path.exists(self.ruta_cambios):
+                os.remove(self.ruta_cambios)
+            self.sin_guardar.clear()
+        except Exception as e:
+            print(f"Error al guardar perfiles de usuario: {e}")
+
+    # Método privado para añadir cambios al registro
+    """
+    Añade un bloque de cambios al final del registro con una única escritura, de modo
+    que los bloques de varios procesos no se mezclan.
+
+    Parámetros:
+        - registros (list): Tuplas `(tipo, ...)`; `perfil` lleva el perfil completo y
+          `votacion` los argumentos de `actualizar`.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error al escribir; el perfil se reconstruirá si hace falta.
+    """
+    def _anotar(self, registros):
+        try:
+            datos = pickle.dumps([(self.firma, *registro) for registro in registros], protocol=pickle.HIGHEST_PROTOCOL)
+            fd = os.open(self.ruta_cambios, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, datos)
+            finally:
+                os.close(fd)
+        except Exception as e:
+            print(f"Error al guardar cambios de perfiles de usuario: {e}")
+
+    # Método para construir un perfil desde cero
+    """
+    Calcula el perfil de un usuario a partir de todas sus votaciones.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - ids (np.ndarray): Identificadores de las películas votadas.
+        - puntuaciones (np.ndarray): Puntuaciones de cada película.
+        - version (int): Versión del registro del usuario a la que corresponde el perfil.
+
+    Retorno:
+        - list: Perfil `[vector, suma de pesos, versión]`.
+    """
+    def construir(self, username, ids, puntuaciones, version):
+        vector, peso = self._calcular(ids, puntuaciones)
+        perfil = [vector, peso, version]
+        self.perfiles[username] = perfil
+        self.sin_guardar.add(username)
+        return perfil
+
+    # Método privado para calcular un perfil a partir de las votaciones
+    """
+    Parámetros:
+        - ids (np.ndarray): Identificadores de las películas votadas.
+        - puntuaciones (np.ndarray): Puntuaciones de cada película.
+
+    Retorno:
+        - Tuple[np.ndarray, float]: Vector del perfil y suma de los pesos.
+    """
+    def _calcular(self, ids, puntuaciones):
+        validas = (puntuaciones >= 1) & (puntuaciones <= 5)
+        pesos = PESOS_VALORACION[puntuaciones[validas]].astype(np.float32)
+        filas = self.fila_por_id[ids[validas]]
+        vector = np.asarray(self.matriz[filas].T @ pesos, dtype=np.float32).ravel()
+        return vector, float(pesos.sum())
+
+    # Método para obtener el perfil de un usuario
+    """
+    Devuelve el perfil de un usuario, reconstruyéndolo si no existe o está desactualizado.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - ids (np.ndarray): Identificadores de las películas votadas.
+        - puntuaciones (np.ndarray): Puntuaciones de cada película.
+        - version (int): Versión actual del registro del usuario.
+
+    Retorno:
+        - list: Perfil `[vector, suma de pesos, versión]`.
+    """
+    def obtener(self, username, ids, puntuaciones, version):
+        perfil = self.perfiles.get(username)
+        acierto = perfil is not None and perfil[2] == version
+        registrar_cache('perfiles_usuario', acierto)
+        if not acierto:
+            perfil = self.construir(username, ids, puntuaciones, version)
+        return perfil
+
+    # Método para actualizar un perfil tras una votación
+    """
+    Aplica una votación al perfil tocando solo las posiciones no nulas del vector de la película.
+    Si el perfil no corresponde a la versión previa del usuario se descarta para
+    reconstruirlo en la próxima consulta. Solo se parte de un perfil vacío si el usuario no
+    tenía votaciones: los registros antiguos sin columna `version` también tienen versión 0,
+    y empezar de cero perdería sus votaciones anteriores.
+
+    Con `guardar` la votación se añade al registro de cambios junto con los perfiles
+    construidos desde la última escritura; el `.npz` no se reescribe.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - movie_id (int): Película votada.
+        - puntuacion (int): Nueva puntuación.
+        - anterior (int): Puntuación anterior (0 si no había votado).
+        - version_previa (int): Versión del usuario antes de la votación.
+        - version_nueva (int): Versión del usuario tras la votación.
+        - votos_previos (int): Películas que el usuario había votado antes de esta votación.
+        - guardar (bool, opcional): Añade la votación al registro de cambios en disco.
+    """
+    def actualizar(self, username, movie_id, puntuacion, anterior, version_previa, version_nueva, votos_previos, guardar=False):
+        votacion = (movie_id, puntuacion, anterior, version_previa, version_nueva, votos_previos)
+        self._aplicar_votacion(username, *votacion)
+        if not guardar:
+            return
+
+        # Un perfil que aún no está en disco se guarda completo; el resto, solo la votación
+        registros = [
+            ('perfil', usuario, *self.perfiles[usuario])
+            for usuario in self.sin_guardar if usuario in self.perfiles
+        ]
+        if username not in self.sin_guardar:
+            registros.append(('votacion', username, *votacion))
+        self.sin_guardar.clear()
+        self._anotar(registros)
+
+    # Método privado para aplicar una votación a un perfil en memoria
+    """
+    Parámetros:
+        - Los mismos que `actualizar`, salvo `guardar`.
+    """
+    def _aplicar_votacion(self, username, movie_id, puntuacion, anterior, version_previa, version_nueva, votos_previos):
+        perfil = self.perfiles.get(username)
+        if perfil is None and votos_previos == 0:
+            perfil = [np.zeros(self.matriz.shape[1], dtype=np.float32), 0.0, 0]
+            self.perfiles[username] = perfil
+        elif perfil is None or perfil[2] != version_previa:
+            self.perfiles.pop(username, None)
+            self.sin_guardar.discard(username)
+            return
+
+        delta = PESOS_VALORACION[puntuacion if 1 <= puntuacion <= 5 else 0] - \
+                PESOS_VALORACION[anterior if 1 <= anterior <= 5 else 0]
+        fila = self.fila_por_id[movie_id]
+        inicio, fin = self.matriz.indptr[fila], self.matriz.indptr[fila + 1]
+        perfil[0][self.matriz.indices[inicio:fin]] += np.float32(delta) * self.matriz.data[inicio:fin]
+        perfil[1] += float(delta)
+        perfil[2] = version_nueva
+
+    # Método para invalidar perfiles
+    """
+    Descarta los perfiles de los usuarios indicados para que se reconstruyan al consultarlos.
+
+    Parámetros:
+        - usernames (iterable): Usuarios cuyo perfil se descarta.
+    """
+    def invalidar(self, usernames):
+        for username in usernames:
+            self.perfiles.pop(username, None)
+            self.sin_guardar.discard(username)
+
+    # Método para puntuar el catálogo contra un perfil
+    """
+    Calcula la afinidad de las películas con el perfil mediante un único producto disperso.
+
+    Parámetros:
+        - perfil (list): Perfil `[vector, suma de pesos, versión]`.
+        - filas (np.ndarray, opcional): Filas a puntuar; por defecto, todo el catálogo.
+
+    Retorno:
+        - Tuple[np.ndarray, np.ndarray]: Similitud coseno con el perfil y similitud ajustada
+          (media de las similitudes con las películas votadas, ponderada por su valoración).
+    """
+    def puntuar(self, perfil, filas=None):
+        vector, peso, _ = perfil
+        matriz = self.matriz if filas is None else self.matriz[filas]
+        productos = matriz @ vector
+        norma = float(np.linalg.norm(vector))
+        similitud = productos / norma if norma > 0 else np.zeros_like(productos)
+        similitud_ajustada = productos / peso if peso > 0 else np.zeros_like(productos)
+        return similitud, similitud_ajustada
+
+    # Método para comprobar un perfil
+    """
+    Compara el perfil guardado de un usuario (posiblemente actualizado votación a votación)
+    con el que se obtiene al reconstruirlo desde cero con sus votaciones.
+
+    Parámetros:
+        - username (str): Nombre de usuario.
+        - ids (np.ndarray): Identificadores de las películas votadas.
+        - puntuaciones (np.ndarray): Puntuaciones de cada película.
+        - tolerancia (float, opcional): Diferencia máxima admitida en cada componente y en el peso.
+
+    Retorno:
+        - bool: `True` si no hay perfil guardado (se reconstruirá al consultarlo) o si coincide.
+    """
+    def verificar(self, username, ids, puntuaciones, tolerancia=1e-4):
+        perfil = self.perfiles.get(username)
+        if perfil is None:
+            return True
+        vector, peso = self._calcular(ids, puntuaciones)
+        return abs(perfil[1] - peso) <= tolerancia and bool(np.allclose(perfil[0], vector, rtol=0, atol=tolerancia))
+
+# Método para comprobar la actualización incremental de los perfiles
+"""
+Copia los datos a un directorio temporal, registra votaciones al azar una a una (de usuarios
+con votaciones previas, sin ellas y nuevos) y comprueba que cada perfil actualizado coincide
+con el reconstruido desde cero con las mismas votaciones, tanto en memoria como tras volver
+a cargarlo desde disco (`.npz` más registro de cambios).
+
+Parámetros:
+    - file_path (str): CSV de películas.
+    - file_path_usuarios (str): CSV de usuarios.
+    - votos (int): Votaciones a registrar.
+    - semilla (int): Semilla de las votaciones.
+
+Retorno:
+    - List[str]: Usuarios cuyo perfil no coincide (vacía si todo es correcto).
+"""
+def comprobar_actualizaciones(file_path, file_path_usuarios, votos=50, semilla=0):
+    import shutil
+    from motor.GestorPeliculas import GestorPeliculas
+
+    with tempfile.TemporaryDirectory(prefix='perfiles-') as directorio:
+        ruta_peliculas = shutil.copy(file_path, directorio)
+        ruta_usuarios = shutil.copy(file_path_usuarios, directorio)
+        gestor = GestorPeliculas(ruta_peliculas, ruta_usuarios)
+        if gestor.perfiles is None:
+            raise RuntimeError("No se pudo construir el modelo de perfiles.")
+
+        rng = np.random.default_rng(semilla)
+        usuarios = gestor.usuarios_df['Nombre de usuario'].dropna().tolist() + ['perfil_nuevo']
+        titulos = gestor.peliculas_df['title'].tolist()
+        for _ in range(votos):
+            username = usuarios[rng.integers(len(usuarios))]
+            # Los perfiles ya construidos se actualizan; los que no existen se construyen al votar por primera vez
+            if rng.random() < 0.5 and gestor.historial.contiene(username):
+                gestor.recomendar_peliculas_por_usuario(username)
+            gestor.votar_pelicula(username, titulos[rng.integers(len(titulos))], int(rng.integers(1, 6)))
+
+        distintos = [
+            username for username in gestor.perfiles.perfiles
+            if not gestor.perfiles.verificar(username, *gestor.historial.obtener(username))
+        ]
+
+        # Un segundo gestor carga los perfiles guardados; deben coincidir con los de memoria
+        recargado = GestorPeliculas(ruta_peliculas, ruta_usuarios)
+        for username, (vector, peso, version) in gestor.perfiles.perfiles.items():
+            perfil = recargado.perfiles.perfiles.get(username)
+            if perfil is None or perfil[2] != version or abs(perfil[1] - peso) > 1e-4 or \
+                    not np.allclose(perfil[0], vector, rtol=0, atol=1e-4):
+                distintos.append(username)
+        return distintos
+
+# Punto de entrada: python -m motor.PerfilesUsuario
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Comprueba que los perfiles actualizados votación a votación coinciden con los reconstruidos.")
+    parser.add_argument('--catalogo', default='peliculas_final_imagenes.csv', help="CSV de películas.")
+    parser.add_argument('--usuarios', default='usuarios.csv', help="CSV de usuarios (se usa una copia).")
+    parser.add_argument('--votos', type=int, default=50, help="Votaciones a registrar.")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla de las votaciones.")
+    args = parser.parse_args()
+
+    distintos = comprobar_actualizaciones(args.catalogo, args.usuarios, args.votos, args.semilla)
+    if distintos:
+        print(f"Perfiles que no coinciden con la reconstrucción: {', '.join(map(str, distintos))}")
+        raise SystemExit(1)
+    print(f"Los perfiles coinciden con la reconstrucción tras {args.votos} votaciones.")
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+from motor.Instrumentacion import registrar_cache
+
+class Popularidad:
+    """
+    Clase para precalcular la popularidad de las películas y servir recomendaciones
+    a usuarios sin votaciones (arranque en frío) o cuando no hay modelo de contenido.
+
+    La puntuación de catálogo es la media de dos medias bayesianas (público y crítica)
+    calculadas con `people_score`/`total_ratings` y `critic_score`/`total_reviews`.
+    Las votaciones de la aplicación se combinan después usando la puntuación de
+    catálogo como valor a priori. Los agregados de la aplicación (número y suma de
+    votos por película) se actualizan en cada votación y se mantiene en caché la
+    lista de las mejores películas de cada género.
+    """
+
+    # Constructor de la clase
+    """
+    Calcula las puntuaciones de catálogo y prepara las listas por género.
+
+    Parámetros:
+        - peliculas_df (pd.DataFrame): Catálogo de películas (en el orden de las filas del modelo).
+        - fila_por_id (np.ndarray): Arreglo identificador de película -> fila.
+        - top_k (int): Tamaño de las listas en caché por género.
+        - peso_previo_app (float): Número de votos de la aplicación equivalentes a la puntuación de catálogo.
+    """
+    def __init__(self, peliculas_df, fila_por_id, top_k=50, peso_previo_app=10.0):
+        self.fila_por_id = fila_por_id
+        self.top_k = top_k
+        self.peso_previo_app = peso_previo_app
+        n = len(peliculas_df)
+
+        # Puntuaciones de catálogo en escala de 0 a 5
+        publico = self._media_bayesiana(
+            self._columna_numerica(peliculas_df, 'people_score') / 20,
+            self._parsear_conteos(peliculas_df.get('total_ratings', pd.Series([None] * n)))
+        )
+        critica = self._media_bayesiana(
+            self._columna_numerica(peliculas_df, 'critic_score') / 20,
+            self._columna_numerica(peliculas_df, 'total_reviews')
+        )
+        self.puntuacion_catalogo = (publico + critica) / 2
+
+        # Agregados de las votaciones de la aplicación
+        self.conteo = np.zeros(n, dtype=np.int64)
+        self.suma = np.zeros(n, dtype=np.int64)
+        self.puntuacion = self.puntuacion_catalogo.copy()
+
+        # Filas de cada género ('' = todo el catálogo) y su lista de mejores películas
+        self.filas_por_genero = {'': np.arange(n)}
+        self.generos_por_fila = [[] for _ in range(n)]
+        generos = peliculas_df['genre'].fillna('') if 'genre' in peliculas_df else pd.Series([''] * n)
+        filas_por_genero = {}
+        for fila, cadena in enumerate(generos):
+            for genero in {g.strip().lower() for g in str(cadena).split(',') if g.strip()}:
+                filas_por_genero.setdefault(genero, []).append(fila)
+                self.generos_por_fila[fila].append(genero)
+        for genero, filas in filas_por_genero.items():
+            self.filas_por_genero[genero] = np.array(filas)
+        self._top = {}
+
+    # Método privado para leer una columna numérica
+    """
+    Devuelve una columna como arreglo de `float` (NaN si falta o no es numérica).
+    """
+    @staticmethod
+    def _columna_numerica(peliculas_df, columna):
+        if columna not in peliculas_df:
+            return np.full(len(peliculas_df), np.nan)
+        return pd.to_numeric(peliculas_df[columna], errors='coerce').to_numpy(dtype=float)
+
+    # Método privado para convertir los textos de número de valoraciones
+    """
+    Convierte textos como `50,000+`, `1,000+ Verified` o `Fewer than 50` en números.
+    """
+    @staticmethod
+    def _parsear_conteos(columna):
+        texto = columna.fillna('').astype(str)
+        conteos = pd.to_numeric(texto.str.replace(',', '').str.extract(r'(\d+)')[0], errors='coerce')
+        conteos = conteos.where(~texto.str.startswith('Fewer'), conteos / 2)
+        return conteos.to_numpy(dtype=float)
+
+    # Método privado para calcular una media bayesiana
+    """
+    Combina la puntuación de cada película con la media global, ponderando por el número de votos.
+    El peso de la media global es la mediana del número de votos.
+
+    Parámetros:
+        - valores (np.ndarray): Puntuación media de cada película (NaN si no tiene).
+        - conteos (np.ndarray): Número de votos de cada película (NaN si se desconoce).
+
+    Retorno:
+        - np.ndarray: Media bayesiana de cada película.
+    """
+    @staticmethod
+    def _media_bayesiana(valores, conteos):
+        conteos = np.where(np.isnan(valores) | np.isnan(conteos), 0.0, conteos)
+        conocidos = conteos > 0
+        if not conocidos.any():
+            return np.full(len(valores), 2.5)
+        media = np.average(valores[conocidos], weights=conteos[conocidos])
+        previo = float(np.median(conteos[conocidos]))
+        return (previo * media + conteos * np.nan_to_num(valores)) / (previo + conteos)
+
+    # Método privado para recalcular la puntuación combinada de unas filas
+    """
+    Combina la puntuación de catálogo con los votos de la aplicación para las filas indicadas.
+    """
+    def _combinar(self, filas):
+        self.puntuacion[filas] = (
+            self.peso_previo_app * self.puntuacion_catalogo[filas] + self.suma[filas]
+        ) / (self.peso_previo_app + self.conteo[filas])
+
+    # Método para recalcular los agregados de la aplicación
+    """
+    Recalcula el número y la suma de votos por película a partir de todo el historial
+    (por ejemplo, tras recargar votaciones escritas por otros procesos).
+
+    Parámetros:
+        - historial (HistorialVotaciones): Historial de votaciones de todos los usuarios.
+    """
+    def recalcular_agregados(self, historial):
+        votos = historial.como_dataframe()
+        votos = votos[(votos['rating'] >= 1) & (votos['rating'] <= 5)]
+        filas = self.fila_por_id[votos['movie_id'].to_numpy()]
+        n = len(self.puntuacion)
+        self.conteo = np.bincount(filas, minlength=n).astype(np.int64)
+        self.suma = np.bincount(filas, weights=votos['rating'].to_numpy(), minlength=n).astype(np.int64)
+        self._combinar(slice(None))
+        self._top = {}
+
+    # Método para registrar una votación en los agregados
+    """
+    Actualiza los agregados de una película tras una votación y mantiene las listas en caché.
+
+    Parámetros:
+        - movie_id (int): Película votada.
+        - puntuacion (int): Nueva puntuación.
+        - anterior (int): Puntuación anterior del usuario (0 si no había votado).
+    """
+    def registrar_voto(self, movie_id, puntuacion, anterior=0):
+        fila = self.fila_por_id[movie_id]
+        antes = self.puntuacion[fila]
+        if 1 <= anterior <= 5:
+            self.conteo[fila] -= 1
+            self.suma[fila] -= anterior
+        if 1 <= puntuacion <= 5:
+            self.conteo[fila] += 1
+            self.suma[fila] += puntuacion
+        self._combinar([fila])
+        despues = self.puntuacion[fila]
+
+        # Solo hay que tocar las listas de los géneros de esta película
+        for genero in [''] + self.generos_por_fila[fila]:
+            top = self._top.get(genero)
+            if top is None:
+                continue
+            if fila in top:
+                if despues < antes and len(top) == self.top_k:
+                    # Ha bajado: una película fuera de la lista podría adelantarla
+                    del self._top[genero]
+                    continue
+            elif despues > self.puntuacion[top[-1]]:
+                top = np.append(top, fila)
+            else:
+                continue
+            self._top[genero] = top[np.argsort(-self.puntuacion[top], kind='stable')][:self.top_k]
+
+    # Método para obtener las películas más populares
+    """
+    Devuelve las filas de las películas más populares de un género.
+
+    Parámetros:
+        - genero (str, opcional): Género (en minúsculas); `''` o `None` para todo el catálogo.
+        - cantidad (int): Número de películas a devolver (como máximo `top_k`).
+        - excluir (iterable, opcional): Filas que no deben aparecer.
+
+    Retorno:
+        - np.ndarray: Filas ordenadas de mayor a menor popularidad.
+    """
+    def mejores(self, genero=None, cantidad=10, excluir=None):
+        genero = (genero or '').strip().lower()
+        top = self._top.get(genero)
+        registrar_cache('popularidad_top', top is not None)
+        if top is None:
+            filas = self.filas_por_genero.get(genero, np.empty(0, dtype=int))
+            if len(filas) > self.top_k:
+                filas = filas[np.argpartition(-self.puntuacion[filas], self.top_k)[:self.top_k]]
+            top = filas[np.argsort(-self.puntuacion[filas], kind='stable')]
+            self._top[genero] = top
+        if excluir is not None and len(excluir):
+            top = top[~np.isin(top, excluir)]
+        return top[:cantidad]
@@ -0,0 +1,509 @@
+import argparse
+import asyncio
+import json
+import math
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+import numpy as np
+from motor.Instrumentacion import REGISTRO
+from motor.Motor import Motor
+
+# Límites de las peticiones
+MAX_CABECERAS = 64 * 1024
+MAX_CUERPO = 1024 * 1024
+MAX_LOTE = 100
+
+# Textos de los códigos de estado usados
+ESTADOS = {
+    200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    411: 'Length Required', 413: 'Payload Too Large', 500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+class ErrorPeticion(Exception):
+    """
+    Error de una petición que se responde con un código de estado y un mensaje.
+    """
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+# Método para convertir un resultado a JSON
+"""
+Convierte los tipos de NumPy a tipos de Python y los NaN (campos vacíos del catálogo) a `None`.
+
+Parámetros:
+    - valor: Resultado de una operación del motor.
+
+Retorno:
+    - Valor serializable con `json.dumps`.
+"""
+def _a_json(valor):
+    if isinstance(valor, dict):
+        return {str(clave): _a_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return None
+    return valor
+
+class ServidorRecomendaciones:
+    """
+    Servicio HTTP/JSON del motor de recomendación, basado en `asyncio` y sin dependencias externas.
+
+    - Un único motor, con el modelo cargado antes de aceptar conexiones, atiende todas las peticiones.
+    - Las operaciones del motor se ejecutan en un grupo de hilos, de modo que el bucle de eventos
+      sigue aceptando y leyendo peticiones mientras se puntúa.
+    - Las consultas de lectura idénticas que llegan mientras otra igual está en curso esperan su
+      resultado en lugar de repetirla, y `POST /lote` resuelve varias operaciones en una petición.
+    - Las conexiones HTTP/1.1 se mantienen abiertas (keep-alive) hasta `Connection: close` o
+      hasta que pasan `espera_inactiva` segundos sin peticiones.
+    - `detener` deja de aceptar conexiones, espera a que terminen las peticiones en curso y cierra
+      las conexiones inactivas.
+
+    Rutas:
+        - GET  /salud                                   Estado del servicio.
+        - GET  /metricas                                Métricas en formato Prometheus.
+        - GET  /buscar?q=texto                          Búsqueda por título.
+        - GET  /azar?cantidad=12                        Películas al azar.
+        - GET  /detalles?titulo=...                     Detalles de una película.
+        - GET  /similares?titulo=...                    Películas con sinopsis parecida.
+        - GET  /recomendaciones?usuario=...&cantidad=10 Recomendaciones para un usuario.
+        - GET  /valoraciones?usuario=...                Votaciones de un usuario.
+        - POST /votar     {"usuario", "titulo", "puntuacion"}
+        - POST /validar   {"usuario", "password"}
+        - POST /lote      {"peticiones": [{"ruta": "/buscar", "parametros": {"q": "star"}}, ...]}
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - motor (Motor): Motor de recomendación compartido.
+        - host (str, opcional): Dirección de escucha (solo local por defecto).
+        - puerto (int, opcional): Puerto; 0 elige uno libre.
+        - hilos (int, opcional): Hilos del grupo que ejecuta las operaciones del motor.
+        - espera_inactiva (float, opcional): Segundos que se mantiene abierta una conexión sin peticiones.
+        - sock (socket.socket, opcional): Socket ya abierto en el que aceptar conexiones (por ejemplo,
+          compartido entre varios procesos); si se indica, se ignoran `host` y `puerto`.
+    """
+    def __init__(self, motor, host='127.0.0.1', puerto=8000, hilos=4, espera_inactiva=15.0, sock=None):
+        self.motor = motor
+        self.host = host
+        self.puerto = puerto
+        self.sock = sock
+        self.espera_inactiva = espera_inactiva
+        self.ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='motor')
+        self.servidor = None
+        self.deteniendo = False
+        # Evento que detiene `servir_hasta_senal` (se crea al empezar a servir)
+        self.parada = None
+        self.conexiones = set()
+        # Peticiones en curso por conexión (las conexiones inactivas se pueden cerrar al detener)
+        self.ocupadas = set()
+        # Consultas de lectura en curso: clave -> futuro con su resultado
+        self.en_curso = {}
+        self.inicio = time.time()
+
+        # ruta -> (método, manejador)
+        self.rutas = {
+            '/salud': ('GET', self._salud),
+            '/metricas': ('GET', self._metricas),
+            '/buscar': ('GET', self._buscar),
+            '/azar': ('GET', self._azar),
+            '/detalles': ('GET', self._detalles),
+            '/similares': ('GET', self._similares),
+            '/recomendaciones': ('GET', self._recomendaciones),
+            '/valoraciones': ('GET', self._valoraciones),
+            '/votar': ('POST', self._votar),
+            '/validar': ('POST', self._validar),
+            '/lote': ('POST', self._lote)
+        }
+
+    # Método para empezar a escuchar
+    """
+    Carga el modelo (en el grupo de hilos) y abre el puerto.
+
+    Retorno:
+        - int: Puerto en el que escucha el servicio.
+    """
+    async def iniciar(self):
+        bucle = asyncio.get_running_loop()
+        await bucle.run_in_executor(self.ejecutor, self.motor.precargar)
+        if self.sock is not None:
+            self.servidor = await asyncio.start_server(self._atender, sock=self.sock, limit=MAX_CABECERAS)
+        else:
+            self.servidor = await asyncio.start_server(self._atender, self.host, self.puerto, limit=MAX_CABECERAS)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+        return self.puerto
+
+    # Método para detener el servicio ordenadamente
+    """
+    Deja de aceptar conexiones, cierra las inactivas, espera a que terminen las peticiones
+    en curso (como mucho `plazo` segundos) y libera el grupo de hilos.
+
+    Parámetros:
+        - plazo (float, opcional): Segundos máximos de espera.
+    """
+    async def detener(self, plazo=10.0):
+        self.deteniendo = True
+        if self.servidor is not None:
+            self.servidor.close()
+
+        for writer in list(self.conexiones - self.ocupadas):
+            writer.close()
+        limite = time.monotonic() + plazo
+        while self.ocupadas and time.monotonic() < limite:
+            await asyncio.sleep(0.05)
+        for writer in list(self.conexiones):
+            writer.close()
+        if self.servidor is not None:
+            await self.servidor.wait_closed()
+        self.ejecutor.shutdown(wait=True)
+
+    # Método para servir hasta recibir una señal
+    """
+    Inicia el servicio y lo detiene ordenadamente con SIGINT o SIGTERM (o al activar `parada`).
+
+    Parámetros:
+        - anunciar (bool, opcional): Si es `False`, no imprime la dirección ni el aviso de parada.
+    """
+    async def servir_hasta_senal(self, anunciar=True):
+        self.parada = asyncio.Event()
+        puerto = await self.iniciar()
+        if anunciar:
+            print(f"Servicio de recomendaciones en http://{self.host}:{puerto}", flush=True)
+
+        bucle = asyncio.get_running_loop()
+        for senal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                bucle.add_signal_handler(senal, self.parada.set)
+            except (NotImplementedError, RuntimeError):  # Windows
+                signal.signal(senal, lambda *_: bucle.call_soon_threadsafe(self.parada.set))
+        await self.parada.wait()
+        if anunciar:
+            print("Deteniendo el servicio...", flush=True)
+        await self.detener()
+
+    # Método privado para atender una conexión
+    """
+    Lee y responde peticiones de una conexión mientras el cliente la mantenga abierta.
+
+    Parámetros:
+        - reader (asyncio.StreamReader): Lectura de la conexión.
+        - writer (asyncio.StreamWriter): Escritura de la conexión.
+    """
+    async def _atender(self, reader, writer):
+        self.conexiones.add(writer)
+        try:
+            while not self.deteniendo:
+                try:
+                    peticion = await asyncio.wait_for(self._leer_peticion(reader), self.espera_inactiva)
+                except asyncio.TimeoutError:
+                    break
+                except ErrorPeticion as e:
+                    await self._responder(writer, e.estado, {'error': str(e)}, False)
+                    break
+                if peticion is None:
+                    break
+
+                metodo, ruta, parametros, mantener = peticion
+                self.ocupadas.add(writer)
+                try:
+                    estado, datos = await self._despachar(metodo, ruta, parametros)
+                    mantener = mantener and not self.deteniendo
+                    await self._responder(writer, estado, datos, mantener)
+                finally:
+                    self.ocupadas.discard(writer)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            # Último recurso ante una petición mal formada que no se tradujo en ErrorPeticion
+            print(f"Error al leer una petición: {e}")
+            try:
+                await self._responder(writer, 400, {'error': "Petición no válida."}, False)
+            except ConnectionError:
+                pass
+        finally:
+            self.conexiones.discard(writer)
+            writer.close()
+
+    # Método privado para leer una petición HTTP
+    """
+    Retorno:
+        - Tuple[str, str, dict, bool]: Método, ruta, parámetros (consulta y cuerpo JSON) y si se
+          mantiene la conexión, o `None` si el cliente cerró la conexión.
+
+    Excepciones:
+        - ErrorPeticion: Si la petición no es válida.
+    """
+    async def _leer_peticion(self, reader):
+        try:
+            cabecera = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise ErrorPeticion(400, "Petición incompleta.")
+        except asyncio.LimitOverrunError:
+            raise ErrorPeticion(413, "Cabeceras demasiado grandes.")
+
+        lineas = cabecera.decode('latin-1').split('\r\n')
+        try:
+            metodo, destino, version = lineas[0].split(' ', 2)
+        except ValueError:
+            raise ErrorPeticion(400, "Línea de petición no válida.")
+        cabeceras = {}
+        for linea in lineas[1:]:
+            if ':' in linea:
+                nombre, valor = linea.split(':', 1)
+                cabeceras[nombre.strip().lower()] = valor.strip()
+
+        conexion = cabeceras.get('connection', '').lower()
+        mantener = conexion != 'close' if version == 'HTTP/1.1' else conexion == 'keep-alive'
+
+        partes = urlsplit(destino)
+        parametros = dict(parse_qsl(partes.query))
+
+        if cabeceras.get('transfer-encoding'):
+            raise ErrorPeticion(411, "Envía el cuerpo con Content-Length.")
+        try:
+            longitud = int(cabeceras.get('content-length') or 0)
+        except ValueError:
+            raise ErrorPeticion(400, "Content-Length no válido.")
+        if longitud < 0:
+            raise ErrorPeticion(400, "Content-Length no válido.")
+        if longitud > MAX_CUERPO:
+            raise ErrorPeticion(413, "Cuerpo demasiado grande.")
+        if longitud:
+            cuerpo = await reader.readexactly(longitud)
+            try:
+                datos = json.loads(cuerpo)
+            except ValueError:
+                raise ErrorPeticion(400, "El cuerpo no es JSON válido.")
+            if not isinstance(datos, dict):
+                raise ErrorPeticion(400, "El cuerpo debe ser un objeto JSON.")
+            parametros.update(datos)
+        return metodo.upper(), partes.path, parametros, mantener
+
+    # Método privado para escribir una respuesta
+    """
+    Parámetros:
+        - writer (asyncio.StreamWriter): Escritura de la conexión.
+        - estado (int): Código de estado HTTP.
+        - datos: Cuerpo JSON, o `str` para responder en texto plano.
+        - mantener (bool): Si la conexión sigue abierta.
+    """
+    async def _responder(self, writer, estado, datos, mantener):
+        if isinstance(datos, str):
+            cuerpo = datos.encode('utf-8')
+            tipo = 'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            cuerpo = json.dumps(_a_json(datos), ensure_ascii=False).encode('utf-8')
+            tipo = 'application/json; charset=utf-8'
+        cabecera = (
+            f"HTTP/1.1 {estado} {ESTADOS.get(estado, '')}\r\n"
+            f"Content-Type: {tipo}\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n"
+            f"\r\n"
+        )
+        writer.write(cabecera.encode('latin-1') + cuerpo)
+        await writer.drain()
+
+    # Método privado para resolver una petición
+    """
+    Parámetros:
+        - metodo (str): Método HTTP.
+        - ruta (str): Ruta pedida.
+        - parametros (dict): Parámetros de la consulta y del cuerpo.
+
+    Retorno:
+        - Tuple[int, object]: Código de estado y cuerpo de la respuesta.
+    """
+    async def _despachar(self, metodo, ruta, parametros):
+        destino = self.rutas.get(ruta)
+        if destino is None:
+            return 404, {'error': f"Ruta desconocida: {ruta}"}
+        metodo_ruta, manejador = destino
+        if metodo != metodo_ruta:
+            return 405, {'error': f"{ruta} solo admite {metodo_ruta}."}
+        if self.deteniendo:
+            return 503, {'error': "El servicio se está deteniendo."}
+        try:
+            return 200, await manejador(parametros)
+        except ErrorPeticion as e:
+            return e.estado, {'error': str(e)}
+        except Exception as e:
+            print(f"Error al atender {ruta}: {e}")
+            return 500, {'error': "Error interno del servicio."}
+
+    # Método privado para ejecutar una operación del motor
+    """
+    Ejecuta la función en el grupo de hilos. Si se indica una clave y ya hay una ejecución
+    con la misma clave en curso, se espera a su resultado en lugar de repetirla.
+
+    Parámetros:
+        - funcion (callable): Operación del motor.
+        - args: Argumentos de la operación.
+        - clave (tuple, opcional): Identifica las consultas de lectura equivalentes.
+
+    Retorno:
+        - Resultado de la operación.
+    """
+    async def _ejecutar(self, funcion, *args, clave=None):
+        bucle = asyncio.get_running_loop()
+        if clave is None:
+            return await bucle.run_in_executor(self.ejecutor, funcion, *args)
+
+        futuro = self.en_curso.get(clave)
+        if futuro is not None:
+            REGISTRO.registrar_cache('servidor_agrupadas', True)
+            return await asyncio.shield(futuro)
+        REGISTRO.registrar_cache('servidor_agrupadas', False)
+
+        futuro = asyncio.ensure_future(bucle.run_in_executor(self.ejecutor, funcion, *args))
+        self.en_curso[clave] = futuro
+        futuro.add_done_callback(lambda _: self.en_curso.pop(clave, None))
+        return await asyncio.shield(futuro)
+
+    # Método privado para ejecutar una operación de escritura del motor
+    """
+    Las escrituras (votaciones) no se agrupan. En este servidor se ejecutan en el propio motor;
+    el modo multiproceso las envía al proceso que las guarda.
+
+    Parámetros:
+        - nombre (str): Método del motor (`votar`).
+        - args: Argumentos de la operación.
+
+    Retorno:
+        - Resultado de la operación.
+    """
+    async def _escribir(self, nombre, *args):
+        return await self._ejecutar(getattr(self.motor, nombre), *args)
+
+    # Métodos privados para obtener parámetros
+    """
+    Parámetros:
+        - parametros (dict): Parámetros de la petición.
+        - nombre (str): Parámetro a leer.
+
+    Excepciones:
+        - ErrorPeticion: Si falta el parámetro o no es válido.
+    """
+    @staticmethod
+    def _texto(parametros, nombre):
+        valor = parametros.get(nombre)
+        if not isinstance(valor, str) or not valor.strip():
+            raise ErrorPeticion(400, f"Falta el parámetro '{nombre}'.")
+        return valor
+
+    @staticmethod
+    def _entero(parametros, nombre, defecto=None, minimo=1, maximo=1000):
+        valor = parametros.get(nombre, defecto)
+        # En JSON, true y 3.7 no son enteros aunque int() los convierta (3.0 sí se admite)
+        if isinstance(valor, bool) or (isinstance(valor, float) and not valor.is_integer()):
+            raise ErrorPeticion(400, f"El parámetro '{nombre}' debe ser un entero.")
+        try:
+            valor = int(valor)
+        except (TypeError, ValueError):
+            raise ErrorPeticion(400, f"El parámetro '{nombre}' debe ser un entero.")
+        if not minimo <= valor <= maximo:
+            raise ErrorPeticion(400, f"El parámetro '{nombre}' debe estar entre {minimo} y {maximo}.")
+        return valor
+
+    # Manejadores de las rutas
+    """
+    Parámetros:
+        - parametros (dict): Parámetros de la petición.
+
+    Retorno:
+        - Cuerpo JSON de la respuesta.
+    """
+    async def _salud(self, parametros):
+        return {
+            'estado': 'deteniendo' if self.deteniendo else 'ok',
+            'modelo_cargado': self.motor.modelo_cargado(),
+            'conexiones': len(self.conexiones),
+            'segundos_activo': round(time.time() - self.inicio, 1)
+        }
+
+    async def _metricas(self, parametros):
+        return REGISTRO.como_prometheus()
+
+    async def _buscar(self, parametros):
+        texto = self._texto(parametros, 'q')
+        return await self._ejecutar(self.motor.buscar, texto, clave=('buscar', texto))
+
+    async def _azar(self, parametros):
+        cantidad = self._entero(parametros, 'cantidad', 12, maximo=100)
+        return await self._ejecutar(self.motor.al_azar, cantidad)
+
+    async def _detalles(self, parametros):
+        titulo = self._texto(parametros, 'titulo')
+        detalles = await self._ejecutar(self.motor.detalles, titulo, clave=('detalles', titulo))
+        if detalles is None:
+            raise ErrorPeticion(404, f"La película '{titulo}' no se encuentra en el sistema.")
+        return detalles
+
+    async def _similares(self, parametros):
+        titulo = self._texto(parametros, 'titulo')
+        return await self._ejecutar(self.motor.similares, titulo, clave=('similares', titulo))
+
+    async def _recomendaciones(self, parametros):
+        usuario = self._texto(parametros, 'usuario')
+        cantidad = self._entero(parametros, 'cantidad', 10)
+        return await self._ejecutar(self.motor.recomendar, usuario, cantidad,
+                                    clave=('recomendaciones', usuario, cantidad))
+
+    async def _valoraciones(self, parametros):
+        usuario = self._texto(parametros, 'usuario')
+        return await self._ejecutar(self.motor.valoraciones, usuario, clave=('valoraciones', usuario))
+
+    async def _votar(self, parametros):
+        usuario = self._texto(parametros, 'usuario')
+        titulo = self._texto(parametros, 'titulo')
+        puntuacion = self._entero(parametros, 'puntuacion', minimo=1, maximo=5)
+        return {'mensaje': await self._escribir('votar', usuario, titulo, puntuacion)}
+
+    async def _validar(self, parametros):
+        usuario = self._texto(parametros, 'usuario')
+        password = self._texto(parametros, 'password')
+        valido, mensaje = await self._ejecutar(self.motor.validar_usuario, usuario, password)
+        return {'valido': valido, 'mensaje': mensaje}
+
+    async def _lote(self, parametros):
+        peticiones = parametros.get('peticiones')
+        if not isinstance(peticiones, list) or not 0 < len(peticiones) <= MAX_LOTE:
+            raise ErrorPeticion(400, f"'peticiones' debe ser una lista de 1 a {MAX_LOTE} elementos.")
+
+        async def resolver(peticion):
+            if not isinstance(peticion, dict):
+                return {'estado': 400, 'resultado': {'error': "Cada petición debe ser un objeto."}}
+            ruta = peticion.get('ruta')
+            if ruta == '/lote':
+                return {'estado': 400, 'resultado': {'error': "No se pueden anidar lotes."}}
+            destino = self.rutas.get(ruta)
+            metodo = destino[0] if destino else 'GET'
+            estado, resultado = await self._despachar(metodo, ruta, peticion.get('parametros') or {})
+            return {'estado': estado, 'resultado': resultado}
+
+        return await asyncio.gather(*(resolver(p) for p in peticiones))
+
+# Punto de entrada: python -m motor.Servidor
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del motor de recomendación.")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección de escucha.")
+    parser.add_argument('--puerto', type=int, default=8000, help="Puerto (0 elige uno libre).")
+    parser.add_argument('--hilos', type=int, default=4, help="Hilos que ejecutan las operaciones del motor.")
+    parser.add_argument('--catalogo', default='peliculas_final_imagenes.csv', help="CSV de películas.")
+    parser.add_argument('--usuarios', default='usuarios.csv', help="CSV de usuarios.")
+    args = parser.parse_args()
+
+    servidor = ServidorRecomendaciones(Motor(args.catalogo, args.usuarios), args.host, args.puerto, args.hilos)
+    asyncio.run(servidor.servir_hasta_senal())
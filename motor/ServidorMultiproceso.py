@@ -0,0 +1,435 @@
+import argparse
+import asyncio
+import gc
+import itertools
+import os
+import signal
+import socket
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pipe
+from multiprocessing.connection import wait
+from motor.Motor import Motor
+from motor.Servidor import ErrorPeticion, ServidorRecomendaciones
+
+# Operaciones del motor que solo ejecuta el proceso principal
+ESCRITURAS = ('votar', 'registrar_usuario')
+
+# Un trabajador que termina antes de estos segundos no se relanza (evita relanzarlo en bucle)
+VIDA_MINIMA = 2.0
+
+# Método para medir la memoria de un proceso
+"""
+Lee `/proc/<pid>/smaps_rollup` (Linux). La PSS reparte cada página compartida entre los
+procesos que la usan, así que la suma de la PSS de todos los procesos es la memoria real.
+
+Parámetros:
+    - pid (int, opcional): Proceso a medir; por defecto, el actual.
+
+Retorno:
+    - dict: Bytes de `rss`, `pss` y `compartida`, o `None` si el sistema no lo permite.
+"""
+def memoria_proceso(pid=None):
+    campos = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'compartida', 'Shared_Dirty': 'compartida'}
+    try:
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            lineas = f.readlines()
+    except OSError:
+        return None
+    memoria = {'rss': 0, 'pss': 0, 'compartida': 0}
+    for linea in lineas:
+        partes = linea.split()
+        clave = campos.get(partes[0].rstrip(':')) if partes else None
+        if clave:
+            memoria[clave] += int(partes[1]) * 1024
+    return memoria
+
+class ServidorTrabajador(ServidorRecomendaciones):
+    """
+    Servidor de un proceso trabajador: atiende las lecturas con la copia del modelo heredada
+    del proceso principal y le envía las escrituras por su canal.
+
+    Por el canal llegan también los cambios de votaciones guardados por cualquier trabajador,
+    que se aplican en memoria en orden y antes de la respuesta de la escritura que los produjo.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - motor (Motor): Motor heredado del proceso principal, con el modelo ya construido.
+        - sock (socket.socket): Socket de escucha compartido por todos los trabajadores.
+        - canal (multiprocessing.connection.Connection): Conexión con el proceso principal.
+        - indice (int): Número del trabajador.
+        - hilos (int, opcional): Hilos del grupo que ejecuta las operaciones del motor.
+        - espera_inactiva (float, opcional): Segundos que se mantiene abierta una conexión sin peticiones.
+    """
+    def __init__(self, motor, sock, canal, indice, hilos=2, espera_inactiva=15.0):
+        host, puerto = sock.getsockname()[:2]
+        super().__init__(motor, host, puerto, hilos, espera_inactiva, sock=sock)
+        self.canal = canal
+        self.indice = indice
+        # Un único hilo aplica los cambios, para que se apliquen en el orden en que llegan
+        self.aplicador = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cambios')
+        self.ultimo_cambio = None
+        # identificador -> futuro de las escrituras enviadas al proceso principal
+        self.pendientes = {}
+        self.contador = itertools.count()
+
+    # Método para empezar a escuchar
+    """
+    Empieza a leer el canal con el proceso principal y abre el socket compartido.
+
+    Retorno:
+        - int: Puerto en el que escucha el servicio.
+    """
+    async def iniciar(self):
+        asyncio.get_running_loop().add_reader(self.canal.fileno(), self._leer_canal)
+        return await super().iniciar()
+
+    # Método para detener el servicio ordenadamente
+    """
+    Parámetros:
+        - plazo (float, opcional): Segundos máximos de espera.
+    """
+    async def detener(self, plazo=10.0):
+        await super().detener(plazo)
+        asyncio.get_running_loop().remove_reader(self.canal.fileno())
+        self.aplicador.shutdown(wait=True)
+
+    # Método privado para leer un mensaje del proceso principal
+    """
+    Aplica los cambios de votaciones (en el hilo `aplicador`) y completa las escrituras
+    pendientes cuando se han aplicado los cambios recibidos antes que su respuesta.
+    Si el proceso principal termina, el trabajador se detiene.
+    """
+    def _leer_canal(self):
+        try:
+            mensaje = self.canal.recv()
+        except (EOFError, OSError):
+            asyncio.get_running_loop().remove_reader(self.canal.fileno())
+            for futuro in self.pendientes.values():
+                if not futuro.done():
+                    futuro.set_exception(ErrorPeticion(503, "El proceso de escritura no está disponible."))
+            self.pendientes.clear()
+            if self.parada is not None:
+                self.parada.set()
+            return
+
+        if mensaje[0] == 'cambio':
+            self.ultimo_cambio = asyncio.get_running_loop().run_in_executor(
+                self.aplicador, self.motor.peliculas.aplicar_cambio, mensaje[1]
+            )
+            return
+
+        _, identificador, correcto, resultado = mensaje
+        futuro = self.pendientes.pop(identificador, None)
+        if futuro is None:
+            return
+
+        def completar(_=None):
+            if futuro.done():
+                return
+            if correcto:
+                futuro.set_result(resultado)
+            else:
+                futuro.set_exception(RuntimeError(resultado))
+
+        if self.ultimo_cambio is not None and not self.ultimo_cambio.done():
+            self.ultimo_cambio.add_done_callback(completar)
+        else:
+            completar()
+
+    # Método privado para ejecutar una operación de escritura
+    """
+    Envía la operación al proceso principal y espera su resultado.
+
+    Parámetros:
+        - nombre (str): Método del motor.
+        - args: Argumentos de la operación.
+
+    Retorno:
+        - Resultado de la operación.
+
+    Excepciones:
+        - ErrorPeticion: Si el proceso principal no está disponible.
+    """
+    async def _escribir(self, nombre, *args):
+        identificador = next(self.contador)
+        futuro = asyncio.get_running_loop().create_future()
+        self.pendientes[identificador] = futuro
+        try:
+            self.canal.send(('escritura', identificador, nombre, args))
+        except OSError:
+            self.pendientes.pop(identificador, None)
+            raise ErrorPeticion(503, "El proceso de escritura no está disponible.")
+        return await futuro
+
+    # Manejador de /salud con los datos del trabajador
+    """
+    Parámetros:
+        - parametros (dict): Parámetros de la petición.
+
+    Retorno:
+        - dict: Estado del servicio, trabajador, proceso y memoria.
+    """
+    async def _salud(self, parametros):
+        estado = await super()._salud(parametros)
+        estado.update({'trabajador': self.indice, 'pid': os.getpid(), 'memoria': memoria_proceso()})
+        return estado
+
+class ServidorMultiproceso:
+    """
+    Servicio HTTP/JSON con varios procesos trabajadores (modelo pre-fork, solo en sistemas con `fork`).
+
+    - El proceso principal construye el modelo una vez, congela los objetos existentes para el
+      recolector de basura (`gc.freeze`) y abre el socket de escucha; después crea los trabajadores
+      con `fork`. Las matrices de similitud, TF-IDF y los índices se comparten copia-en-escritura,
+      de modo que la memoria total se mantiene cerca de una sola copia del modelo.
+    - Cada trabajador acepta conexiones del socket compartido y atiende las lecturas en su propio
+      intérprete, así que la puntuación se reparte entre los núcleos.
+    - Las escrituras (votaciones) se envían al proceso principal, único dueño del archivo de
+      usuarios y de los perfiles. Este las guarda de una en una y difunde el cambio a todos los
+      trabajadores, que lo aplican en memoria sin volver a leer el archivo.
+    - Si un trabajador termina inesperadamente, se crea otro a partir del modelo del proceso principal.
+    - Con SIGINT o SIGTERM se detienen los trabajadores (terminan sus peticiones en curso, incluidas
+      las votaciones) y después el proceso principal.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - motor (Motor): Motor del proceso principal.
+        - host (str, opcional): Dirección de escucha (solo local por defecto).
+        - puerto (int, opcional): Puerto; 0 elige uno libre.
+        - trabajadores (int, opcional): Procesos trabajadores; por defecto, uno por núcleo.
+        - hilos (int, opcional): Hilos de cada trabajador.
+        - espera_inactiva (float, opcional): Segundos que se mantiene abierta una conexión sin peticiones.
+        - plazo (float, opcional): Segundos que se espera a los trabajadores al detener.
+    """
+    def __init__(self, motor, host='127.0.0.1', puerto=8000, trabajadores=None, hilos=2, espera_inactiva=15.0, plazo=15.0):
+        self.motor = motor
+        self.host = host
+        self.puerto = puerto
+        self.num_trabajadores = trabajadores or os.cpu_count() or 1
+        self.hilos = hilos
+        self.espera_inactiva = espera_inactiva
+        self.plazo = plazo
+        self.sock = None
+        self.deteniendo = False
+        # pid -> (índice, canal, instante de creación)
+        self.trabajadores = {}
+
+    # Método para crear el socket de escucha
+    """
+    Retorno:
+        - socket.socket: Socket abierto, que heredarán los trabajadores.
+    """
+    def _abrir_socket(self):
+        familia = socket.AF_INET6 if ':' in self.host else socket.AF_INET
+        sock = socket.socket(familia, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.puerto))
+        sock.listen(1024)
+        sock.setblocking(False)
+        self.puerto = sock.getsockname()[1]
+        return sock
+
+    # Método privado para crear un trabajador
+    """
+    Crea un proceso trabajador con `fork`. El hijo sirve hasta recibir SIGTERM o hasta que se
+    cierra su canal y termina con `os._exit`, sin ejecutar las tareas de salida del proceso principal.
+
+    Parámetros:
+        - indice (int): Número del trabajador.
+    """
+    def _lanzar(self, indice):
+        canal_padre, canal_hijo = Pipe()
+        pid = os.fork()
+        if pid == 0:
+            codigo = 0
+            try:
+                canal_padre.close()
+                # Los canales de los demás trabajadores solo los usa el proceso principal
+                for _, canal, _ in self.trabajadores.values():
+                    canal.close()
+                self.trabajadores = {}
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                servidor = ServidorTrabajador(self.motor, self.sock, canal_hijo, indice, self.hilos, self.espera_inactiva)
+                asyncio.run(servidor.servir_hasta_senal(anunciar=False))
+            except BaseException:
+                traceback.print_exc()
+                codigo = 1
+            finally:
+                os._exit(codigo)
+
+        canal_hijo.close()
+        self.trabajadores[pid] = (indice, canal_padre, time.monotonic())
+
+    # Método privado para atender un mensaje de un trabajador
+    """
+    Ejecuta la escritura pedida en el motor del proceso principal y responde al trabajador.
+    Los cambios producidos ya se han difundido (ver `_difundir`) antes de la respuesta.
+
+    Parámetros:
+        - canal (multiprocessing.connection.Connection): Canal del trabajador.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error de la operación se devuelve al trabajador.
+    """
+    def _atender_canal(self, canal):
+        _, identificador, nombre, args = canal.recv()
+        try:
+            if nombre not in ESCRITURAS:
+                raise ValueError(f"Operación no permitida: {nombre}")
+            respuesta = ('respuesta', identificador, True, getattr(self.motor, nombre)(*args))
+        except Exception as e:
+            print(f"Error al ejecutar {nombre} para un trabajador: {e}")
+            respuesta = ('respuesta', identificador, False, str(e))
+        try:
+            canal.send(respuesta)
+        except OSError:
+            pass
+
+    # Método privado para difundir un cambio de votaciones
+    """
+    Suscrito al gestor de películas del proceso principal: envía cada cambio a todos los trabajadores.
+
+    Parámetros:
+        - cambio (dict): Cambio notificado por el gestor.
+    """
+    def _difundir(self, cambio):
+        for _, canal, _ in list(self.trabajadores.values()):
+            try:
+                canal.send(('cambio', cambio))
+            except OSError:
+                pass
+
+    # Método privado para recoger los trabajadores terminados
+    """
+    Recoge los procesos hijos que han terminado y, si no se está deteniendo el servicio,
+    crea otros en su lugar.
+    """
+    def _recoger(self):
+        while self.trabajadores:
+            try:
+                pid, estado = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.trabajadores.clear()
+                return
+            if pid == 0:
+                return
+            if pid not in self.trabajadores:
+                continue
+            indice, canal, creado = self.trabajadores.pop(pid)
+            canal.close()
+            if self.deteniendo:
+                continue
+            print(f"El trabajador {indice} (pid {pid}) terminó con estado {estado}.", flush=True)
+            if time.monotonic() - creado >= VIDA_MINIMA:
+                self._lanzar(indice)
+
+    # Método privado para enviar una señal a los trabajadores
+    """
+    Parámetros:
+        - senal (int): Señal a enviar.
+    """
+    def _senalar(self, senal):
+        for pid in list(self.trabajadores):
+            try:
+                os.kill(pid, senal)
+            except ProcessLookupError:
+                pass
+
+    # Método privado para mostrar la memoria de los procesos
+    """
+    Imprime la PSS de cada proceso y la total, para comprobar que el modelo no se ha copiado.
+    """
+    def _informe_memoria(self):
+        principal = memoria_proceso()
+        if principal is None:
+            return
+        procesos = [memoria_proceso(pid) for pid in self.trabajadores]
+        procesos = [m for m in procesos if m is not None]
+        total = principal['pss'] + sum(m['pss'] for m in procesos)
+        print(
+            f"Memoria: principal {principal['rss'] / 2**20:.1f} MiB RSS; "
+            f"{len(procesos)} trabajadores {sum(m['rss'] for m in procesos) / 2**20:.1f} MiB RSS "
+            f"({sum(m['compartida'] for m in procesos) / 2**20:.1f} MiB compartida); "
+            f"total real (PSS) {total / 2**20:.1f} MiB.",
+            flush=True
+        )
+
+    # Método para servir hasta recibir una señal
+    """
+    Construye el modelo, crea los trabajadores y atiende sus escrituras hasta recibir SIGINT
+    o SIGTERM. Al detener, sigue atendiendo las escrituras hasta que los trabajadores terminan
+    (como mucho `plazo` segundos; después se les envía SIGKILL).
+
+    Excepciones:
+        - RuntimeError: Si el sistema no dispone de `fork`.
+    """
+    def servir_hasta_senal(self):
+        if not hasattr(os, 'fork'):
+            raise RuntimeError("El modo multiproceso necesita un sistema con fork (Linux o macOS).")
+
+        self.motor.precargar()
+        self.motor.suscribir(self._difundir)
+        self.sock = self._abrir_socket()
+
+        # Los objetos del modelo no vuelven a recorrerse en las recolecciones, así que sus
+        # páginas no se escriben en los trabajadores y siguen compartidas
+        gc.collect()
+        gc.freeze()
+        for indice in range(self.num_trabajadores):
+            self._lanzar(indice)
+        print(
+            f"Servicio de recomendaciones en http://{self.host}:{self.puerto} "
+            f"({self.num_trabajadores} trabajadores)",
+            flush=True
+        )
+
+        def detener(*_):
+            self.deteniendo = True
+        signal.signal(signal.SIGINT, detener)
+        signal.signal(signal.SIGTERM, detener)
+
+        informe_pendiente = True
+        limite = None
+        while self.trabajadores:
+            canales = {canal: pid for pid, (_, canal, _) in self.trabajadores.items()}
+            for canal in wait(list(canales), timeout=0.5):
+                try:
+                    self._atender_canal(canal)
+                except (EOFError, OSError):
+                    pass
+            self._recoger()
+
+            if informe_pendiente:
+                self._informe_memoria()
+                informe_pendiente = False
+            if self.deteniendo and limite is None:
+                print("Deteniendo el servicio...", flush=True)
+                self.sock.close()
+                self._senalar(signal.SIGTERM)
+                limite = time.monotonic() + self.plazo
+            elif limite is not None and time.monotonic() > limite:
+                self._senalar(signal.SIGKILL)
+
+        if self.sock.fileno() != -1:
+            self.sock.close()
+
+# Punto de entrada: python -m motor.ServidorMultiproceso
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del motor de recomendación con varios procesos.")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección de escucha.")
+    parser.add_argument('--puerto', type=int, default=8000, help="Puerto (0 elige uno libre).")
+    parser.add_argument('--trabajadores', type=int, default=None, help="Procesos trabajadores (por defecto, uno por núcleo).")
+    parser.add_argument('--hilos', type=int, default=2, help="Hilos de cada trabajador.")
+    parser.add_argument('--catalogo', default='peliculas_final_imagenes.csv', help="CSV de películas.")
+    parser.add_argument('--usuarios', default='usuarios.csv', help="CSV de usuarios.")
+    args = parser.parse_args()
+
+    servidor = ServidorMultiproceso(Motor(args.catalogo, args.usuarios), args.host, args.puerto, args.trabajadores, args.hilos)
+    servidor.servir_hasta_senal()
@@ -0,0 +1,98 @@
+import time
+from contextlib import contextmanager
+
+# Referencia de tiempos: el momento en que se importa este módulo (lo primero que hace Main.py)
+INICIO = time.perf_counter()
+
+class TrazaArranque:
+    """
+    Registro de las etapas del arranque de la aplicación (importaciones, lectura de los CSV,
+    construcción del modelo, primer pintado), con el instante de cada una respecto al inicio
+    y su duración.
+
+    Las etapas que ocurren después de mostrar el informe (por ejemplo, el modelo, que se
+    construye la primera vez que se necesita) se imprimen a medida que terminan.
+    """
+
+    def __init__(self, inicio=INICIO):
+        self.inicio = inicio
+        # (nombre, segundos desde el inicio, duración en segundos o None, nivel)
+        self.eventos = []
+        self.imprimir = False
+        self.informe_mostrado = False
+
+    # Método para registrar una etapa ya medida
+    """
+    Parámetros:
+        - nombre (str): Etapa.
+        - comienzo (float): Valor de `time.perf_counter()` al empezar.
+        - duracion (float, opcional): Duración en segundos; `None` para un instante.
+        - nivel (int, opcional): Profundidad en el informe (1 para las subetapas).
+    """
+    def registrar(self, nombre, comienzo, duracion=None, nivel=0):
+        evento = (nombre, comienzo - self.inicio, duracion, nivel)
+        self.eventos.append(evento)
+        if self.imprimir and self.informe_mostrado:
+            print(self._linea(evento))
+
+    # Método para marcar un instante
+    """
+    Parámetros:
+        - nombre (str): Evento, por ejemplo 'primer pintado'.
+    """
+    def marcar(self, nombre):
+        self.registrar(nombre, time.perf_counter())
+
+    # Método para medir una etapa
+    """
+    Gestor de contexto que registra la duración del bloque.
+
+    Parámetros:
+        - nombre (str): Etapa.
+        - desglose (callable, opcional): Función sin argumentos que, al terminar la etapa,
+          devuelve una lista de `(nombre, segundos)` con sus subetapas.
+    """
+    @contextmanager
+    def etapa(self, nombre, desglose=None):
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracion = time.perf_counter() - comienzo
+            self.registrar(nombre, comienzo, duracion)
+            if desglose is not None:
+                for subetapa, segundos in desglose():
+                    self.registrar(subetapa, comienzo, segundos, nivel=1)
+
+    # Método privado para dar formato a un evento
+    """
+    Retorno:
+        - str: Línea del informe con el instante, la duración y el nombre.
+    """
+    def _linea(self, evento):
+        nombre, instante, duracion, nivel = evento
+        duracion = f"{duracion * 1000:9.1f} ms" if duracion is not None else ' ' * 12
+        return f"[arranque] {instante:8.3f} s {duracion}  {'  ' * nivel}{nombre}"
+
+    # Método para generar el informe
+    """
+    Retorno:
+        - str: Una línea por etapa registrada, en orden.
+    """
+    def texto_informe(self):
+        lineas = [f"[arranque] {'instante':>10} {'duración':>12}  etapa"]
+        lineas += [self._linea(evento) for evento in self.eventos]
+        return '\n'.join(lineas)
+
+    # Método para mostrar el informe
+    """
+    Imprime el informe si se pidió con `--startup-report`; las etapas posteriores se
+    imprimirán según terminen.
+    """
+    def mostrar_informe(self):
+        if self.imprimir and not self.informe_mostrado:
+            print(self.texto_informe(), flush=True)
+        self.informe_mostrado = True
+
+# Traza del proceso
+TRAZA = TrazaArranque()
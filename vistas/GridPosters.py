@@ -0,0 +1,337 @@
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QPen
+from gestores.GestorImagenes import GestorImagenes, ANCHO_POSTER, ALTO_POSTER
+
+# Rol con el título de la película de cada celda
+ROL_TITULO = Qt.UserRole + 1
+
+class ModeloPosters(QAbstractListModel):
+    """
+    Modelo de una cuadrícula de pósteres. Cada fila es un diccionario con las claves
+    `titulo`, `texto` (lo que se muestra bajo el póster) y `url` (póster).
+
+    Los pósteres se piden al gestor de imágenes solo cuando la vista pinta la celda,
+    así que una lista de miles de películas solo descarga las que se llegan a ver.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - texto_sin_imagen (str): Texto a mostrar en las celdas sin póster.
+        - parent (QObject, opcional): Objeto padre.
+    """
+    def __init__(self, texto_sin_imagen="Sin Imagen", parent=None):
+        super().__init__(parent)
+        self.texto_sin_imagen = texto_sin_imagen
+        self.gestor_imagenes = GestorImagenes.instancia()
+        self.gestor_imagenes.imagen_lista.connect(self._imagen_lista)
+        self.gestor_imagenes.imagen_fallida.connect(self._imagen_fallida)
+
+        self.items = []
+        # url -> filas que muestran ese póster
+        self.filas_por_url = {}
+        # URLs con una descarga en curso pedida por el modelo y URLs sin imagen
+        self._pedidas = set()
+        self._fallidas = set()
+
+    # Método que devuelve el número de filas
+    """
+    Retorno:
+        - int: Número de películas del modelo.
+    """
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.items)
+
+    # Método que devuelve los datos de una celda
+    """
+    Devuelve el texto, el póster o el título de una celda. El póster se pide al gestor
+    la primera vez que la vista lo necesita.
+
+    Parámetros:
+        - index (QModelIndex): Celda.
+        - role (int): Rol solicitado.
+
+    Retorno:
+        - Any: Dato del rol, o `None`.
+    """
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.items):
+            return None
+        item = self.items[index.row()]
+        if role == Qt.DisplayRole:
+            return item['texto']
+        if role == ROL_TITULO:
+            return item['titulo']
+        if role == Qt.DecorationRole:
+            url = item['url']
+            if not url or url in self._fallidas:
+                return None
+            pixmap = self.gestor_imagenes.obtener(url)
+            if pixmap is None and url not in self._pedidas:
+                self._pedidas.add(url)
+                self.gestor_imagenes.solicitar(url, grupo=self)
+            return pixmap
+        if role == Qt.ToolTipRole:
+            return item['titulo']
+        return None
+
+    # Método para saber si una celda no tiene póster
+    """
+    Indica si la celda no tiene póster (URL vacía o descarga fallida), a diferencia de
+    un póster que todavía se está cargando.
+    """
+    def sin_imagen(self, index):
+        url = self.items[index.row()]['url']
+        return not url or url in self._fallidas
+
+    # Método para reemplazar el contenido del modelo
+    """
+    Sustituye todas las películas del modelo y cancela las descargas de las anteriores.
+
+    Parámetros:
+        - items (List[dict]): Películas con las claves `titulo`, `texto` y `url`.
+    """
+    def establecer(self, items):
+        self.beginResetModel()
+        self.gestor_imagenes.cancelar(self)
+        self.items = self._normalizar(items)
+        self._indexar_urls()
+        self._pedidas = set()
+        self._fallidas = set()
+        self.endResetModel()
+
+    # Método para actualizar el contenido del modelo por diferencias
+    """
+    Sustituye las películas del modelo eliminando e insertando solo las filas que cambian,
+    de modo que la vista conserva y no repinta las celdas comunes (por ejemplo, al refinar
+    una búsqueda mientras se escribe). Si el orden relativo de las filas comunes cambia,
+    se reinicia el modelo completo. Se cancelan las descargas de los pósteres que dejan de mostrarse.
+
+    Parámetros:
+        - items (List[dict]): Películas con las claves `titulo`, `texto` y `url`.
+    """
+    def actualizar(self, items):
+        items = self._normalizar(items)
+        claves_nuevas = [self._clave(item) for item in items]
+        nuevas = set(claves_nuevas)
+        if len(nuevas) != len(claves_nuevas):
+            self.establecer(items)
+            return
+
+        # Filas comunes en el orden actual; si el orden cambia no basta con quitar y poner
+        posicion_nueva = {clave: i for i, clave in enumerate(claves_nuevas)}
+        comunes = [posicion_nueva[c] for c in map(self._clave, self.items) if c in nuevas]
+        if any(b < a for a, b in zip(comunes, comunes[1:])):
+            self.establecer(items)
+            return
+
+        # Eliminaciones, por tramos contiguos y desde el final
+        fila = len(self.items) - 1
+        while fila >= 0:
+            if self._clave(self.items[fila]) in nuevas:
+                fila -= 1
+                continue
+            fin = fila
+            while fila > 0 and self._clave(self.items[fila - 1]) not in nuevas:
+                fila -= 1
+            self.beginRemoveRows(QModelIndex(), fila, fin)
+            del self.items[fila:fin + 1]
+            self.endRemoveRows()
+            fila -= 1
+
+        # Cancelamos las descargas de los pósteres que ya no muestra ninguna fila
+        urls_nuevas = {item['url'] for item in items}
+        quitadas = {url for url in self._pedidas if url in self.filas_por_url and url not in urls_nuevas}
+        if quitadas:
+            self.gestor_imagenes.cancelar(self, quitadas)
+            self._pedidas -= quitadas
+
+        # Inserciones, por tramos contiguos
+        actuales = set(map(self._clave, self.items))
+        fila = 0
+        while fila < len(items):
+            if claves_nuevas[fila] in actuales:
+                fila += 1
+                continue
+            fin = fila
+            while fin + 1 < len(items) and claves_nuevas[fin + 1] not in actuales:
+                fin += 1
+            self.beginInsertRows(QModelIndex(), fila, fin)
+            self.items[fila:fila] = items[fila:fin + 1]
+            self.endInsertRows()
+            fila = fin + 1
+
+        self._indexar_urls()
+
+    # Método privado para normalizar las películas recibidas
+    """
+    Copia las películas asegurando que `url` sea siempre una cadena.
+    """
+    @staticmethod
+    def _normalizar(items):
+        return [dict(item, url=item['url'] if isinstance(item.get('url'), str) else '') for item in items]
+
+    # Método privado para obtener la clave de una fila
+    """
+    Identifica una fila por su contenido visible para comparar listas.
+    """
+    @staticmethod
+    def _clave(item):
+        return (item['titulo'], item['texto'], item['url'])
+
+    # Método privado para indexar las filas por URL
+    """
+    Reconstruye el diccionario url -> filas.
+    """
+    def _indexar_urls(self):
+        self.filas_por_url = {}
+        for fila, item in enumerate(self.items):
+            self.filas_por_url.setdefault(item['url'], []).append(fila)
+
+    # Método privado para avisar a la vista de que un póster ha cambiado
+    """
+    Emite `dataChanged` para las filas que muestran una URL.
+    """
+    def _refrescar_url(self, url):
+        for fila in self.filas_por_url.get(url, []):
+            indice = self.index(fila)
+            self.dataChanged.emit(indice, indice, [Qt.DecorationRole])
+
+    # Método para recibir un póster descargado
+    """
+    Repinta las celdas del póster recibido. La URL deja de estar pedida, así que si la caché
+    del gestor la expulsa más adelante, `data` la volverá a pedir al pintar la celda.
+    """
+    def _imagen_lista(self, url, pixmap):
+        self._pedidas.discard(url)
+        self._refrescar_url(url)
+
+    # Método para recibir un póster fallido
+    """
+    Marca el póster como no disponible y repinta sus celdas.
+    """
+    def _imagen_fallida(self, url):
+        self._pedidas.discard(url)
+        if url in self.filas_por_url:
+            self._fallidas.add(url)
+            self._refrescar_url(url)
+
+class DelegadoPoster(QStyledItemDelegate):
+    """
+    Delegado que pinta una celda de la cuadrícula: el póster de 150x225 y el texto debajo.
+    No crea ningún widget por celda.
+    """
+
+    # Márgenes y alto de la zona de texto de cada celda
+    MARGEN = 8
+    ALTO_TEXTO = 64
+
+    # Método para pintar una celda
+    """
+    Pinta el fondo (al pasar el ratón o seleccionada), el póster o su marcador y el texto.
+
+    Parámetros:
+        - painter (QPainter): Pintor de la vista.
+        - option (QStyleOptionViewItem): Opciones de estilo de la celda.
+        - index (QModelIndex): Celda a pintar.
+    """
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(rect, QColor('#1F618D'))
+        elif option.state & QStyle.State_MouseOver:
+            painter.fillRect(rect, QColor('#2980B9'))
+
+        zona_poster = QRect(rect.x() + (rect.width() - ANCHO_POSTER) // 2, rect.y() + self.MARGEN, ANCHO_POSTER, ALTO_POSTER)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None:
+            x = zona_poster.x() + (ANCHO_POSTER - pixmap.width()) // 2
+            y = zona_poster.y() + (ALTO_POSTER - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.fillRect(zona_poster, QColor('#3498DB'))
+            if index.model().sin_imagen(index):
+                painter.setPen(QPen(Qt.white))
+                painter.drawText(zona_poster, Qt.AlignCenter | Qt.TextWordWrap, index.model().texto_sin_imagen)
+
+        fuente = QFont(option.font)
+        fuente.setPixelSize(15)
+        painter.setFont(fuente)
+        painter.setPen(QPen(Qt.white))
+        zona_texto = QRect(rect.x() + 2, zona_poster.bottom() + 4, rect.width() - 4, self.ALTO_TEXTO)
+        painter.drawText(zona_texto, Qt.AlignHCenter | Qt.AlignTop | Qt.TextWordWrap, index.data(Qt.DisplayRole) or '')
+        painter.restore()
+
+    # Método que devuelve el tamaño de una celda
+    """
+    Retorno:
+        - QSize: Tamaño fijo de todas las celdas.
+    """
+    def sizeHint(self, option, index):
+        return QSize(ANCHO_POSTER + 2 * self.MARGEN, ALTO_POSTER + 2 * self.MARGEN + self.ALTO_TEXTO)
+
+class GridPosters(QListView):
+    """
+    Cuadrícula virtualizada de pósteres basada en `QListView` en modo icono.
+    Solo se pintan las celdas visibles y sus pósteres se piden al pintarlas,
+    así que sirve igual para 12 películas que para miles de resultados.
+    """
+
+    # Señal emitida al hacer clic en una película (título)
+    pelicula_seleccionada = pyqtSignal(str)
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - texto_sin_imagen (str): Texto a mostrar en las celdas sin póster.
+        - parent (QWidget, opcional): Widget padre.
+    """
+    def __init__(self, texto_sin_imagen="Sin Imagen", parent=None):
+        super().__init__(parent)
+        self.modelo = ModeloPosters(texto_sin_imagen, self)
+        self.setModel(self.modelo)
+        self.setItemDelegate(DelegadoPoster(self))
+
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setWrapping(True)
+        self.setSpacing(10)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(40)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMouseTracking(True)
+
+        self.clicked.connect(lambda index: self.pelicula_seleccionada.emit(index.data(ROL_TITULO)))
+
+    # Método para mostrar películas
+    """
+    Muestra una lista de películas en la cuadrícula.
+
+    Parámetros:
+        - items (List[dict]): Películas con las claves `titulo`, `texto` y `url`.
+    """
+    def mostrar(self, items):
+        self.modelo.establecer(items)
+        self.scrollToTop()
+
+    # Método para actualizar las películas mostradas
+    """
+    Cambia las películas de la cuadrícula repintando solo las celdas que cambian.
+
+    Parámetros:
+        - items (List[dict]): Películas con las claves `titulo`, `texto` y `url`.
+    """
+    def actualizar(self, items):
+        self.modelo.actualizar(items)
+
+    # Método para limpiar la cuadrícula
+    """
+    Vacía la cuadrícula y cancela las descargas de pósteres pendientes.
+    """
+    def limpiar(self):
+        self.modelo.establecer([])
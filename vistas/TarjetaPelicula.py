@@ -0,0 +1,95 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QIcon
+from gestores.GestorImagenes import GestorImagenes, ANCHO_POSTER, ALTO_POSTER
+
+class TarjetaPelicula(QWidget):
+    """
+    Tarjeta de una película: el póster como botón y un texto debajo.
+    Se crea una vez y se reutiliza con `asignar` para mostrar otra película,
+    sin volver a crear widgets, estilos ni conexiones.
+    """
+
+    # Señal emitida al hacer clic en el póster (título)
+    seleccionada = pyqtSignal(str)
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - parent (QWidget, opcional): Widget padre.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.titulo = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.boton = QPushButton()
+        self.boton.setFixedSize(ANCHO_POSTER, ALTO_POSTER)  # Tamaño fijo para la imagen
+        self.boton.clicked.connect(lambda: self.seleccionada.emit(self.titulo))
+        layout.addWidget(self.boton, alignment=Qt.AlignHCenter)
+
+        self.etiqueta = QLabel()
+        self.etiqueta.setAlignment(Qt.AlignCenter)
+        self.etiqueta.setWordWrap(True)
+        self.etiqueta.setFixedWidth(ANCHO_POSTER)
+        layout.addWidget(self.etiqueta, alignment=Qt.AlignHCenter)
+
+    # Método para mostrar una película en la tarjeta
+    """
+    Vuelve a enlazar la tarjeta con otra película: título, texto y póster.
+
+    Parámetros:
+        - titulo (str): Título que se emite al hacer clic.
+        - texto (str): Texto bajo el póster.
+        - url (str): URL del póster.
+        - texto_sin_imagen (str): Texto a mostrar si no hay póster.
+        - grupo (object, opcional): Propietario de la descarga, para cancelarla.
+    """
+    def asignar(self, titulo, texto, url, texto_sin_imagen="Sin Imagen", grupo=None):
+        self.titulo = titulo
+        self.etiqueta.setText(texto)
+        self.boton.setIcon(QIcon())
+        self.boton.setText("")
+        GestorImagenes.instancia().asignar_a_boton(url, self.boton, texto_sin_imagen, grupo=grupo)
+
+class PoolTarjetas:
+    """
+    Reserva de tarjetas de película. Las tarjetas que dejan de usarse se ocultan y se
+    guardan para la siguiente vez, en lugar de destruirse.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - al_seleccionar (callable, opcional): Función conectada a `seleccionada` en
+          cada tarjeta nueva.
+    """
+    def __init__(self, al_seleccionar=None):
+        self.al_seleccionar = al_seleccionar
+        self.libres = []
+
+    # Método para obtener una tarjeta
+    """
+    Retorno:
+        - TarjetaPelicula: Una tarjeta libre, o una nueva si no queda ninguna.
+    """
+    def obtener(self):
+        if self.libres:
+            return self.libres.pop()
+        tarjeta = TarjetaPelicula()
+        if self.al_seleccionar is not None:
+            tarjeta.seleccionada.connect(self.al_seleccionar)
+        return tarjeta
+
+    # Método para devolver una tarjeta
+    """
+    Oculta la tarjeta y la guarda para reutilizarla.
+
+    Parámetros:
+        - tarjeta (TarjetaPelicula): Tarjeta que deja de usarse.
+    """
+    def liberar(self, tarjeta):
+        tarjeta.hide()
+        self.libres.append(tarjeta)
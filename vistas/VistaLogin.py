@@ -1,6 +1,5 @@
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
-from gestores.GestorUsuarios import GestorUsuarios
 
 class VistaLogin(QMainWindow):
     """
@@ -29,7 +28,7 @@ class VistaLogin(QMainWindow):
 
         try:
             # Referencia al gestor de usuarios
-            self.gestor_usuarios = GestorUsuarios()
+            self.gestor_usuarios = gestor_ventanas.motor.usuarios
         except Exception as e:
             QMessageBox.critical(self, "Error Crítico", f"Error al cargar el gestor de usuarios: {e}")
             return
@@ -4,13 +4,10 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
     QLabel,
     QPushButton,
-    QScrollArea,
-    QGridLayout,
     QMessageBox
 )
-from PyQt5 import QtCore, QtGui, QtNetwork
 from PyQt5.QtCore import Qt
-from gestores.GestorPeliculas import GestorPeliculas
+from vistas.GridPosters import GridPosters
 
 class VistaMisValoraciones(QMainWindow):
     """
@@ -38,18 +35,14 @@ class VistaMisValoraciones(QMainWindow):
         # Referencia al gestor de ventanas
         self.gestor_ventanas = gestor_ventanas
 
-        try:
-            # Referencia al gestor de películas
-            self.gestor_peliculas = GestorPeliculas()
-        except Exception as e:
-            QMessageBox.critical(self, "Error Crítico", f"Error al cargar el gestor de películas: {e}")
-            return
+        # Referencia al gestor de películas, compartido por todas las vistas
+        self.gestor_peliculas = gestor_ventanas.gestor_peliculas
 
         # Nombre de usuario
         self.username = username
 
-        # Inicializar active_requests para manejar imágenes de recomendaciones
-        self.active_requests = {}
+        # Indica si las votaciones cambiaron mientras la vista estaba oculta
+        self._pendiente_refrescar = False
 
         # Configuración de la interfaz gráfica
         self.central_widget = QWidget()
@@ -61,17 +54,15 @@ class VistaMisValoraciones(QMainWindow):
         self.label.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(self.label)
 
-        # Crear un área de desplazamiento para mostrar las valoraciones
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.layout.addWidget(self.scroll_area)
-
-        # Crear un widget de contenido para las valoraciones
-        self.grid_widget = QWidget()
-        self.scroll_area.setWidget(self.grid_widget)
+        # Mensaje cuando no hay valoraciones
+        self.label_sin_valoraciones = QLabel("No tienes valoraciones registradas.")
+        self.label_sin_valoraciones.setStyleSheet("font-size: 18px; color: white;")
+        self.label_sin_valoraciones.hide()
+        self.layout.addWidget(self.label_sin_valoraciones)
 
-        # Crear un diseño de cuadrícula para las valoraciones
-        self.grid_layout = QGridLayout(self.grid_widget)
+        # Cuadrícula virtualizada de pósteres para las valoraciones
+        self.grid = GridPosters("Sin Imagen")
+        self.layout.addWidget(self.grid)
 
         # Botón para volver a la ventana principal
         self.back_button = QPushButton("Volver")
@@ -110,97 +101,74 @@ class VistaMisValoraciones(QMainWindow):
 
     # Método para cargar las valoraciones del usuario
     """
-    Carga las valoraciones del usuario en el diseño de cuadrícula.
+    Carga las valoraciones del usuario en la cuadrícula de pósteres.
+
+    Parámetros:
+        - por_diferencias (bool): Si es `True`, la cuadrícula solo repinta las valoraciones
+          que han cambiado en lugar de volver a cargarse entera.
 
     Excepciones manejadas:
         - Exception: Cualquier error al obtener o mostrar las valoraciones.
     """
-    def cargar_valoraciones(self):
+    def cargar_valoraciones(self, por_diferencias=False):
         valoraciones = self.gestor_peliculas.obtener_valoraciones_usuario(self.username)
-        self.limpiar_grid_layout()
 
         if not valoraciones:
-            no_valoraciones_label = QLabel("No tienes valoraciones registradas.")
-            no_valoraciones_label.setStyleSheet("font-size: 18px; color: white;")
-            self.layout.addWidget(no_valoraciones_label)
+            self.limpiar_grid_layout()
+            self.label_sin_valoraciones.show()
             return
+        self.label_sin_valoraciones.hide()
+
+        # Pósteres de todas las valoraciones en una sola consulta
+        detalles = self.gestor_peliculas.obtener_detalles_peliculas(
+            [valoracion.get('title') for valoracion in valoraciones], ['poster_image_y']
+        )
 
-        row, col = 0, 0
-        for valoracion in valoraciones:
+        items = []
+        for valoracion, detalle in zip(valoraciones, detalles):
             try:
                 titulo = valoracion.get('title', 'Sin título')
                 rating = valoracion.get('rating', 0)
-
-                # Crear un botón para la imagen de la película
-                image_button = QPushButton()
-                image_button.setFixedSize(150, 225)
-                image_url = self.gestor_peliculas.obtener_detalles_pelicula(titulo).get('poster_image_y', '')
-
-                if image_url and QtCore.QUrl(image_url).isValid():
-                    manager = QtNetwork.QNetworkAccessManager(self)
-                    request = QtNetwork.QNetworkRequest(QtCore.QUrl(image_url))
-                    reply = manager.get(request)
-
-                    # Asociar el reply al botón
-                    self.active_requests[reply] = image_button
-
-                    # Conectar la señal para cargar la imagen
-                    manager.finished.connect(self.onFinished)
-                else:
-                    image_button.setText("Sin Imagen")
-
-                # Crear un widget para el título y la valoración
-                title_label = QLabel(f"{titulo}\nValoración: {rating}/5")
-                title_label.setAlignment(Qt.AlignCenter)
-                title_label.setWordWrap(True)
-                title_label.setFixedWidth(150)
-
-                # Añadir los widgets a la cuadrícula
-                self.grid_layout.addWidget(image_button, row, col)
-                self.grid_layout.addWidget(title_label, row + 1, col)
-
-                col += 1
-                if col == 4:  # Cambiar de fila cada 4 columnas
-                    col = 0
-                    row += 2
+                image_url = (detalle or {}).get('poster_image_y', '')
+                items.append({'titulo': titulo, 'texto': f"{titulo}\nValoración: {rating}/5", 'url': image_url})
             except Exception as e:
                 QMessageBox.warning(self, "Advertencia", f"No se pudo cargar la valoración: {e}")
+        if por_diferencias:
+            self.grid.actualizar(items)
+        else:
+            self.grid.mostrar(items)
 
-    # Método para manejar la finalización de la solicitud de imagen
+    # Método para refrescar la vista tras un cambio de datos
     """
-    Maneja la finalización de la solicitud de imagen y asigna la imagen al botón correspondiente.
+    Actualiza las valoraciones si el cambio afecta al usuario de la vista. Si la vista
+    no está visible, el refresco se aplaza hasta que se vuelva a mostrar.
 
     Parámetros:
-        - reply (QtNetwork.QNetworkReply): Respuesta de la solicitud de imagen.
+        - cambio (dict): Cambio publicado por el gestor de películas.
+    """
+    def refrescar(self, cambio):
+        if self.username not in cambio.get('usuarios', []):
+            return
+        if self.isVisible():
+            self.cargar_valoraciones(por_diferencias=True)
+        else:
+            self._pendiente_refrescar = True
 
-    Excepciones manejadas:
-        - Exception: Cualquier error al procesar la imagen.
+    # Método llamado al volver a mostrar la vista
     """
-    @QtCore.pyqtSlot(QtNetwork.QNetworkReply)
-    def onFinished(self, reply):
-        try:
-            button = self.active_requests.pop(reply, None)
-            if button:
-                image = QtGui.QImage.fromData(reply.readAll())
-                if not image.isNull():
-                    button.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image).scaled(150, 225, QtCore.Qt.KeepAspectRatio)))
-                    button.setIconSize(button.size())
-                else:
-                    button.setText("Imagen no disponible")
-            reply.deleteLater()
-        except Exception as e:
-            QMessageBox.warning(self, "Advertencia", f"Error al cargar la imagen: {e}")
+    Aplica el refresco aplazado, si lo hay.
+    """
+    def al_mostrar(self):
+        if self._pendiente_refrescar:
+            self._pendiente_refrescar = False
+            self.cargar_valoraciones(por_diferencias=True)
 
     # Método para limpiar el diseño de cuadrícula
     """
-    Limpia el diseño de cuadrícula eliminando todos los widgets existentes.
+    Vacía la cuadrícula y cancela sus descargas de pósteres pendientes.
     """
     def limpiar_grid_layout(self):
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        self.grid.limpiar()
 
     # Método para volver a la ventana principal
     """
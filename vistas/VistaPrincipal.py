@@ -1,7 +1,6 @@
-from PyQt5 import QtCore, QtGui, QtNetwork
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QScrollArea, QGridLayout, QHBoxLayout, QLineEdit, QMessageBox
-from PyQt5.QtCore import Qt
-from gestores.GestorPeliculas import GestorPeliculas
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit, QMessageBox
+from PyQt5.QtCore import Qt, QTimer
+from vistas.GridPosters import GridPosters
 
 class VistaPrincipal(QMainWindow):
     """
@@ -28,8 +27,8 @@ class VistaPrincipal(QMainWindow):
         # Referencia al gestor de ventanas
         self.gestor_ventanas = gestor_ventanas
 
-        # Referencia al gestor de películas
-        self.gestor_peliculas = GestorPeliculas()
+        # Referencia al gestor de películas, compartido por todas las vistas
+        self.gestor_peliculas = gestor_ventanas.gestor_peliculas
 
         # Configuración de la interfaz gráfica
         self.central_widget = QWidget()
@@ -71,17 +70,19 @@ class VistaPrincipal(QMainWindow):
         self.button_buscar.clicked.connect(self.buscar_peliculas)
         search_layout.addWidget(self.button_buscar)
 
-        # Crear un área de desplazamiento para mostrar películas
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.layout.addWidget(self.scroll_area)
+        # Búsqueda incremental: se lanza cuando se deja de escribir durante 150 ms
+        self.temporizador_busqueda = QTimer(self)
+        self.temporizador_busqueda.setSingleShot(True)
+        self.temporizador_busqueda.setInterval(150)
+        self.temporizador_busqueda.timeout.connect(self.buscar_incremental)
+        self.search_input.textChanged.connect(lambda _: self.temporizador_busqueda.start())
+        self._ultima_busqueda = ''
+        self._peliculas_iniciales = []
 
-        # Crear un widget de contenido para el área de desplazamiento
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        # Crear un diseño de cuadrícula para el contenido
-        self.grid_layout = QGridLayout(self.scroll_content)
+        # Cuadrícula virtualizada de pósteres
+        self.grid = GridPosters("Imagen no disponible")
+        self.grid.pelicula_seleccionada.connect(self.seleccionar_pelicula)
+        self.layout.addWidget(self.grid)
 
         # Campo de texto para mostrar la película seleccionada
         self.selected_movie_edit = QLineEdit()
@@ -147,7 +148,7 @@ class VistaPrincipal(QMainWindow):
 
     # Método para cargar películas en la cuadrícula
     """
-    Carga las películas proporcionadas en el diseño de cuadrícula.
+    Carga las películas proporcionadas en la cuadrícula de pósteres.
 
     Parámetros:
         - peliculas (list): Lista de diccionarios que contienen información de las películas.
@@ -161,68 +162,10 @@ class VistaPrincipal(QMainWindow):
             QMessageBox.warning(self, "Advertencia", "No hay películas disponibles para mostrar.")
             return
 
-        self.active_requests = {}
-        row, col = 0, 0
-        for pelicula in peliculas:
-            try:
-                image_button = QPushButton()
-                image_button.setFixedSize(150, 225)
-                image_url = pelicula.get('poster_image_y', '')
-
-                if image_url and QtCore.QUrl(image_url).isValid():
-                    manager = QtNetwork.QNetworkAccessManager(self)
-                    request = QtNetwork.QNetworkRequest(QtCore.QUrl(image_url))
-                    reply = manager.get(request)
-                    self.active_requests[reply] = image_button
-                    manager.finished.connect(self.onFinished)
-                else:
-                    image_button.setText("Imagen no disponible")
-
-                image_button.clicked.connect(lambda _, p=pelicula['title']: self.seleccionar_pelicula(p))
-
-                title_label = QLabel(pelicula['title'])
-                title_label.setAlignment(Qt.AlignCenter)
-                title_label.setWordWrap(True)
-                title_label.setFixedWidth(150)
-
-                self.grid_layout.addWidget(image_button, row, col)
-                self.grid_layout.addWidget(title_label, row + 1, col)
-
-                col += 1
-                if col == 4:
-                    col = 0
-                    row += 2
-
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al cargar película: {str(e)}")
-
-# Método para manejar la finalización de solicitudes de imagen
-    """
-    Maneja la finalización de la solicitud de imagen y asigna la imagen al botón correspondiente.
-
-    Parámetros:
-        - reply (QtNetwork.QNetworkReply): Respuesta de la solicitud de imagen.
-
-    Excepciones manejadas:
-        - Exception: Cualquier error durante la asignación de la imagen.
-    """
-    @QtCore.pyqtSlot(QtNetwork.QNetworkReply)
-    def onFinished(self, reply):
         try:
-            # Obtener el botón asociado a esta solicitud
-            button = self.active_requests.pop(reply, None)
-
-            if button is not None:
-                image = QtGui.QImage.fromData(reply.readAll())
-                if not image.isNull():
-                    button.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image).scaled(150, 225, QtCore.Qt.KeepAspectRatio)))
-                    button.setIconSize(button.size())
-                else:
-                    button.setText("Imagen no disponible")
-
-            reply.deleteLater()
+            self.grid.mostrar(self._items_grid(peliculas))
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar imagen: {str(e)}")
+            QMessageBox.critical(self, "Error", f"Error al cargar película: {str(e)}")
 
     # Método para seleccionar una película
     """
@@ -243,7 +186,9 @@ class VistaPrincipal(QMainWindow):
         - Exception: Cualquier error durante la búsqueda de películas.
     """
     def buscar_peliculas(self):
+        self.temporizador_busqueda.stop()  # La búsqueda explícita sustituye a la incremental pendiente
         nombre = self.search_input.text().strip()  # Eliminar espacios en blanco al inicio y al final
+        self._ultima_busqueda = nombre
         if not nombre:
             # Si no hay texto, limpiar la cuadrícula y mostrar todas las películas al azar
             self.mostrar_peliculas_al_azar()
@@ -264,6 +209,38 @@ class VistaPrincipal(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Ocurrió un error al buscar películas: {str(e)}")
 
+    # Método para la búsqueda incremental
+    """
+    Busca mientras se escribe, cuando vence el temporizador de la búsqueda. Las pulsaciones
+    que llegan antes reinician el temporizador, así que solo se ejecuta la última consulta.
+    La cuadrícula se actualiza por diferencias y, sin texto, vuelve a las películas iniciales.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante la búsqueda.
+    """
+    def buscar_incremental(self):
+        nombre = self.search_input.text().strip()
+        if nombre == self._ultima_busqueda:
+            return
+        self._ultima_busqueda = nombre
+
+        try:
+            peliculas = self.gestor_peliculas.buscar_peliculas2(nombre) if nombre else self._peliculas_iniciales
+            self.grid.actualizar(self._items_grid(peliculas))
+        except Exception as e:
+            print(f"Error en la búsqueda incremental: {e}")
+
+    # Método privado para preparar las películas para la cuadrícula
+    """
+    Convierte los resultados del gestor de películas en filas de la cuadrícula de pósteres.
+    """
+    @staticmethod
+    def _items_grid(peliculas):
+        return [
+            {'titulo': p['title'], 'texto': p['title'], 'url': p.get('poster_image_y', '')}
+            for p in peliculas
+        ]
+
     # Método para mostrar películas al azar
     """
     Muestra 12 películas seleccionadas al azar en la cuadrícula.
@@ -275,20 +252,18 @@ class VistaPrincipal(QMainWindow):
         try:
             peliculas_al_azar = self.gestor_peliculas.peliculas_al_azar()
             peliculas = self.gestor_peliculas.buscar_peliculas(peliculas_al_azar)
+            self._peliculas_iniciales = peliculas
             self.cargar_peliculas(peliculas)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Ocurrió un error al cargar películas al azar: {str(e)}")
 
     # Método para limpiar el diseño de la cuadrícula
     """
-    Elimina todos los widgets del diseño de cuadrícula para preparar el espacio para nuevos contenidos.
+    Vacía la cuadrícula y cancela sus descargas de pósteres pendientes
+    para preparar el espacio para nuevos contenidos.
     """
     def limpiar_grid_layout(self):
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
+        self.grid.limpiar()
 
     # Método para mostrar la vista principal
     """
@@ -1,13 +1,100 @@
-from PyQt5 import QtCore, QtGui, QtNetwork
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QScrollArea, QGridLayout, QComboBox, QMessageBox, QHBoxLayout
-import pandas as pd
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QComboBox, QMessageBox, QHBoxLayout, QProgressBar
+from PyQt5.QtCore import Qt, QRunnable, QThreadPool, pyqtSignal
+from motor.Perfilador import perfilar
+from vistas.GridPosters import GridPosters
+
+class _TareaRecomendaciones(QRunnable):
+    """
+    Calcula las recomendaciones de un usuario en el grupo de hilos de la vista y envía cada
+    resultado parcial a la vista junto con el número de petición. Entre bloques comprueba si
+    la petición sigue vigente y, si no, abandona el cálculo.
+    """
+
+    # Constructor de la clase
+    """
+    Parámetros:
+        - vista (VistaRecomendaciones): Vista que recibe los resultados.
+        - token (int): Número de la petición; deja de ser vigente si la vista lanza otra.
+        - username (str): Nombre de usuario del cliente actual.
+        - cantidad (int): Número de películas a recomendar.
+    """
+    def __init__(self, vista, token, username, cantidad):
+        super().__init__()
+        self.vista = vista
+        self.token = token
+        self.username = username
+        self.cantidad = cantidad
+
+    # Método que se ejecuta en el hilo del pool
+    """
+    Recarga las votaciones, calcula las recomendaciones por bloques y envía cada resultado
+    parcial a la vista. El último envío se marca como final. Se deja de calcular si la
+    petición ya no es vigente o si la vista se ha cerrado.
+
+    Excepciones manejadas:
+        - ValueError: El usuario no tiene datos suficientes; se avisa como advertencia.
+        - Exception: Cualquier otro error al generar las recomendaciones.
+    """
+    @perfilar('generar_recomendaciones')
+    def run(self):
+        try:
+            gestor_peliculas = self.vista.gestor_peliculas
+            # Recargar las votaciones para obtener las más recientes
+            gestor_peliculas.recargar_usuarios()
+
+            parciales = gestor_peliculas.recomendar_peliculas_por_usuario_por_bloques(self.username, self.cantidad)
+            recomendaciones = []
+            for recomendaciones in parciales:
+                if self.vista._token != self.token or not self._emitir('_recomendaciones_listas', recomendaciones, False):
+                    parciales.close()
+                    return
+            self._emitir('_recomendaciones_listas', recomendaciones, True)
+        except ValueError as e:
+            self._avisar_error("Advertencia", str(e))
+        except Exception as e:
+            self._avisar_error("Error", f"Ocurrió un error inesperado al generar recomendaciones: {str(e)}")
+
+    # Método para enviar un resultado a la vista
+    """
+    Emite una de las señales internas de la vista con el número de petición delante.
+
+    Parámetros:
+        - senal (str): Nombre de la señal de la vista.
+        - *args: Resto de argumentos de la señal.
+
+    Retorno:
+        - bool: False si la vista ya se ha cerrado y no pudo recibir el resultado.
+
+    Excepciones manejadas:
+        - RuntimeError: La vista se ha destruido mientras se calculaba.
+    """
+    def _emitir(self, senal, *args):
+        try:
+            getattr(self.vista, senal).emit(self.token, *args)
+            return True
+        except RuntimeError:
+            # La vista ya se ha cerrado
+            return False
+
+    # Método para avisar de un error a la vista
+    """
+    Parámetros:
+        - titulo (str): Título del mensaje.
+        - mensaje (str): Texto del error.
+    """
+    def _avisar_error(self, titulo, mensaje):
+        self._emitir('_recomendaciones_fallidas', titulo, mensaje)
 
 class VistaRecomendaciones(QMainWindow):
     """
     Clase que representa la ventana de Recomendaciones personalizadas basada en las votaciones del usuario.
+    Las recomendaciones se calculan en segundo plano y se muestran a medida que llegan.
     """
 
+    # Señales internas con los resultados del hilo de trabajo (petición, recomendaciones, final)
+    _recomendaciones_listas = pyqtSignal(int, list, bool)
+    _recomendaciones_fallidas = pyqtSignal(int, str, str)
+
     # Constructor de la clase
     """
     Inicializa la ventana de Recomendaciones, configura la interfaz gráfica
@@ -35,15 +122,13 @@ class VistaRecomendaciones(QMainWindow):
         # Nombre de usuario
         self.username = username
 
-        # Asegurarse de que las similitudes estén calculadas
+        # Asegurarse de que el modelo de recomendaciones esté calculado
         try:
-            self.gestor_peliculas._calcular_similitudes_recomendaciones()
+            if getattr(self.gestor_peliculas, 'perfiles', None) is None:
+                self.gestor_peliculas._calcular_similitudes_recomendaciones()
         except Exception as e:
             QMessageBox.critical(self, "Error Crítico", f"Error al calcular similitudes: {str(e)}")
 
-        # Inicializar active_requests para manejar imágenes
-        self.active_requests = {}
-
         # Configuración de la interfaz gráfica
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -78,6 +163,7 @@ class VistaRecomendaciones(QMainWindow):
 
         self.combo_quantity = QComboBox()
         self.combo_quantity.addItems(["5", "10", "15", "20"])
+        self.combo_quantity.currentIndexChanged.connect(self.cambiar_cantidad)
         self.layout.addWidget(self.combo_quantity)
 
         # Botón para generar recomendaciones
@@ -85,17 +171,34 @@ class VistaRecomendaciones(QMainWindow):
         self.button_recommend.clicked.connect(self.generar_recomendaciones)
         self.layout.addWidget(self.button_recommend)
 
-        # Área de desplazamiento para las recomendaciones
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.layout.addWidget(self.scroll_area)
-
-        # Widget de contenido para las recomendaciones
-        self.recommendations_content = QWidget()
-        self.scroll_area.setWidget(self.recommendations_content)
-
-        # Diseño de cuadrícula para las recomendaciones
-        self.grid_layout = QGridLayout(self.recommendations_content)
+        # Mensaje cuando no hay recomendaciones
+        self.label_sin_recomendaciones = QLabel("No se encontraron recomendaciones.")
+        self.label_sin_recomendaciones.setStyleSheet("font-size: 18px; color: white;")
+        self.label_sin_recomendaciones.hide()
+        self.layout.addWidget(self.label_sin_recomendaciones)
+
+        # Indicador de actividad mientras se calculan las recomendaciones
+        self.barra_progreso = QProgressBar()
+        self.barra_progreso.setRange(0, 0)
+        self.barra_progreso.setTextVisible(False)
+        self.barra_progreso.setMaximumHeight(8)
+        self.barra_progreso.hide()
+        self.layout.addWidget(self.barra_progreso)
+
+        # Cálculo en segundo plano: una petición a la vez, identificada por un número creciente;
+        # los resultados de peticiones anteriores se descartan
+        self.pool_recomendaciones = QThreadPool(self)
+        self.pool_recomendaciones.setMaxThreadCount(1)
+        self._token = 0
+        self._calculando = False
+        self._pendiente_refrescar = False
+        self._recomendaciones_listas.connect(self._recibir_recomendaciones)
+        self._recomendaciones_fallidas.connect(self._recibir_error)
+
+        # Cuadrícula virtualizada de pósteres para las recomendaciones
+        self.grid = GridPosters("Sin Imagen")
+        self.grid.pelicula_seleccionada.connect(self.mostrar_pelicula_recomendada)
+        self.layout.addWidget(self.grid)
 
         # Aplicar el estilo CSS
         self.setStyleSheet("""
@@ -128,45 +231,124 @@ class VistaRecomendaciones(QMainWindow):
             QPushButton:pressed {
                 background-color: #1F618D; /* Azul aún más oscuro al hacer clic */
             }
-            QScrollArea {
-                background-color: #F0F0F0;
-            }
         """)
 
     # Método para generar recomendaciones
     """
-    Genera las recomendaciones basadas en las votaciones del usuario y las muestra en formato de cuadrícula.
+    Lanza en segundo plano el cálculo de las recomendaciones basadas en las votaciones del usuario.
+    Una nueva petición deja obsoletas las anteriores: sus resultados ya no se mostrarán y su cálculo
+    se abandona en el siguiente bloque. Los resultados parciales se muestran en la cuadrícula
+    a medida que llegan y, mientras tanto, se muestra el indicador de actividad.
 
     Excepciones manejadas:
-        - ValueError: Si no se encuentran recomendaciones.
-        - Exception: Cualquier error durante el cálculo o visualización de las recomendaciones.
+        - Exception: Cualquier error al lanzar el cálculo.
     """
     def generar_recomendaciones(self):
         try:
-            # Recargar usuarios_df para obtener las votaciones más recientes
-            self.gestor_peliculas.usuarios_df = pd.read_csv(self.gestor_peliculas.file_path_usuarios)
-
+            self._token += 1
             cantidad = int(self.combo_quantity.currentText())
-            recomendaciones = self.gestor_peliculas.recomendar_peliculas_por_usuario(self.username)
+            self._calculando = True
+            self.barra_progreso.show()
+            self.pool_recomendaciones.start(_TareaRecomendaciones(self, self._token, self.username, cantidad))
+        except Exception as e:
+            self._terminar_calculo()
+            QMessageBox.critical(self, "Error", f"Ocurrió un error inesperado al generar recomendaciones: {str(e)}")
 
+    # Método para cambiar la cantidad de recomendaciones
+    """
+    Vuelve a generar las recomendaciones con la nueva cantidad si ya había unas mostradas
+    o calculándose.
+
+    Parámetros:
+        - indice (int): Índice de la cantidad seleccionada.
+    """
+    def cambiar_cantidad(self, indice):
+        if self._hay_recomendaciones():
+            self.generar_recomendaciones()
+
+    # Método para refrescar la vista tras un cambio de datos
+    """
+    Vuelve a generar las recomendaciones mostradas si cambian las votaciones del usuario.
+    Si la vista no está visible, se regeneran cuando se vuelva a mostrar.
+
+    Parámetros:
+        - cambio (dict): Cambio publicado por el gestor de películas.
+    """
+    def refrescar(self, cambio):
+        if self.username not in cambio.get('usuarios', []) or not self._hay_recomendaciones():
+            return
+        if self.isVisible():
+            self.generar_recomendaciones()
+        else:
+            self._pendiente_refrescar = True
+
+    # Método llamado al volver a mostrar la vista
+    """
+    Aplica el refresco aplazado, si lo hay.
+    """
+    def al_mostrar(self):
+        if self._pendiente_refrescar:
+            self._pendiente_refrescar = False
+            self.generar_recomendaciones()
+
+    # Método privado para saber si hay recomendaciones mostradas o en curso
+    """
+    Retorno:
+        - bool: `True` si hay recomendaciones en la cuadrícula o calculándose.
+    """
+    def _hay_recomendaciones(self):
+        return self._calculando or self.grid.model().rowCount() > 0
+
+    # Método privado para recibir recomendaciones del hilo de trabajo
+    """
+    Muestra un resultado parcial o final si pertenece a la petición vigente.
+
+    Parámetros:
+        - token (int): Petición a la que pertenece el resultado.
+        - recomendaciones (list): Mejores recomendaciones encontradas hasta el momento.
+        - final (bool): Indica si es el resultado definitivo.
+    """
+    def _recibir_recomendaciones(self, token, recomendaciones, final):
+        if token != self._token:
+            return
+        if recomendaciones or final:
+            self.mostrar_recomendaciones(recomendaciones)
+        if final:
+            self._terminar_calculo()
             if not recomendaciones:
-                raise ValueError("No se encontraron recomendaciones para este usuario.")
+                QMessageBox.warning(self, "Advertencia", "No se encontraron recomendaciones para este usuario.")
 
-            recomendaciones_ordenadas = sorted(
-                recomendaciones,
-                key=lambda x: x['similitud_ajustada'],  # Ordenar por similitud ajustada
-                reverse=True
-            )[:cantidad]
+    # Método privado para recibir un error del hilo de trabajo
+    """
+    Muestra el error de la petición vigente.
 
-            self.mostrar_recomendaciones(recomendaciones_ordenadas)
-        except ValueError as e:
-            QMessageBox.warning(self, "Advertencia", str(e))
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Ocurrió un error inesperado al generar recomendaciones: {str(e)}")
+    Parámetros:
+        - token (int): Petición que ha fallado.
+        - titulo (str): "Advertencia" para errores esperados o "Error" para los inesperados.
+        - mensaje (str): Descripción del error.
+    """
+    def _recibir_error(self, token, titulo, mensaje):
+        if token != self._token:
+            return
+        self._terminar_calculo()
+        if titulo == "Advertencia":
+            QMessageBox.warning(self, titulo, mensaje)
+        else:
+            QMessageBox.critical(self, titulo, mensaje)
+
+    # Método privado para ocultar el indicador de actividad
+    """
+    Marca la petición vigente como terminada.
+    """
+    def _terminar_calculo(self):
+        self._calculando = False
+        self.barra_progreso.hide()
 
     # Método para mostrar recomendaciones
     """
     Muestra las recomendaciones en formato de cuadrícula con imágenes, títulos y similitudes.
+    La cuadrícula se actualiza por diferencias, así que los resultados parciales sucesivos
+    solo repintan las celdas que cambian.
 
     Parámetros:
         - recomendaciones (list): Lista de diccionarios con información de las películas recomendadas.
@@ -176,90 +358,25 @@ class VistaRecomendaciones(QMainWindow):
     """
     def mostrar_recomendaciones(self, recomendaciones):
         try:
-            # Limpiar la cuadrícula de recomendaciones
-            while self.grid_layout.count():
-                item = self.grid_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-
             if not recomendaciones:
-                no_recommendation_label = QLabel("No se encontraron recomendaciones.")
-                no_recommendation_label.setStyleSheet("font-size: 18px; color: white;")
-                self.grid_layout.addWidget(no_recommendation_label, 0, 0, 1, 4)
+                self.grid.limpiar()
+                self.label_sin_recomendaciones.show()
                 return
 
-            # Mostrar las recomendaciones
-            row, col = 0, 0
+            self.label_sin_recomendaciones.hide()
+            items = []
             for rec in recomendaciones:
                 try:
                     titulo = rec["titulo"]
                     similitud = rec["similitud"]
-
-                    # Botón para la imagen
-                    image_button = QPushButton()
-                    image_button.setFixedSize(150, 225)
-                    image_url = self.gestor_peliculas.obtener_detalles_pelicula(titulo).get('poster_image_y', '')
-
-                    if image_url and QtCore.QUrl(image_url).isValid():
-                        manager = QtNetwork.QNetworkAccessManager(self)
-                        request = QtNetwork.QNetworkRequest(QtCore.QUrl(image_url))
-                        reply = manager.get(request)
-                        self.active_requests[reply] = image_button
-                        manager.finished.connect(self.onFinished)
-                    else:
-                        image_button.setText("Sin Imagen")
-
-                    image_button.clicked.connect(lambda _, p=titulo: self.mostrar_pelicula_recomendada(p))
-
-                    # Título y similitud
-                    title_label = QLabel(f"{titulo}\nSimilitud: {similitud:.2f}")
-                    title_label.setAlignment(Qt.AlignCenter)
-                    title_label.setWordWrap(True)
-                    title_label.setFixedWidth(150)
-                    title_label.setStyleSheet("font-size: 16px; color: white;")
-
-                    # Añadir a la cuadrícula
-                    self.grid_layout.addWidget(image_button, row, col)
-                    self.grid_layout.addWidget(title_label, row + 1, col)
-
-                    col += 1
-                    if col == 4:  # Máximo 4 columnas
-                        col = 0
-                        row += 2
+                    image_url = rec.get('poster_image_y', '')
+                    items.append({'titulo': titulo, 'texto': f"{titulo}\nSimilitud: {similitud:.2f}", 'url': image_url})
                 except Exception as e:
                     QMessageBox.warning(self, "Advertencia", f"Error al procesar recomendación: {str(e)}")
+            self.grid.actualizar(items)
         except Exception as e:
             QMessageBox.critical(self, "Error Crítico", f"Error al mostrar recomendaciones: {str(e)}")
 
-    # Método: onFinished
-    # Maneja la finalización de una solicitud de imagen y asigna la imagen descargada a un botón correspondiente.
-    #
-    # Parámetros:
-    #     - reply (QtNetwork.QNetworkReply): Respuesta de la solicitud HTTP que contiene los datos de la imagen.
-    #
-    # Funcionalidad:
-    #     - Recupera el botón asociado a la solicitud HTTP.
-    #     - Carga los datos de la imagen desde la respuesta.
-    #     - Asigna la imagen al botón si es válida, o muestra un mensaje de error en el botón si no lo es.
-    #
-    # Excepciones manejadas:
-    #     - Exception: Cualquier error que ocurra durante el procesamiento de la imagen.
-    @QtCore.pyqtSlot(QtNetwork.QNetworkReply)
-    def onFinished(self, reply):
-        try:
-            button = self.active_requests.pop(reply, None)
-            if button:
-                image = QtGui.QImage.fromData(reply.readAll())
-                if not image.isNull():
-                    button.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image).scaled(150, 225, QtCore.Qt.KeepAspectRatio)))
-                    button.setIconSize(button.size())
-                else:
-                    button.setText("Imagen no disponible")
-            reply.deleteLater()
-        except Exception as e:
-            QMessageBox.warning(self, "Advertencia", f"Error al cargar imagen: {str(e)}")
-    
     # Método: mostrar_pelicula_recomendada
     # Muestra la sinopsis y los detalles de una película recomendada.
     #
@@ -1,6 +1,5 @@
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QMessageBox
 from PyQt5.QtCore import Qt
-from gestores.GestorUsuarios import GestorUsuarios
 
 class VistaRegistro(QMainWindow):
     """
@@ -29,7 +28,7 @@ class VistaRegistro(QMainWindow):
             self.gestor_ventanas = gestor_ventanas
 
             # Referencia al gestor de usuarios
-            self.gestor_usuarios = GestorUsuarios()
+            self.gestor_usuarios = gestor_ventanas.motor.usuarios
 
             # Configuración de la interfaz gráfica
             self.central_widget = QWidget()
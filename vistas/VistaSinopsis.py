@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QTextEdit, QGridLayout, QScrollArea, QMessageBox
-from PyQt5 import QtCore, QtGui, QtNetwork
 from PyQt5.QtCore import Qt
+from gestores.GestorImagenes import GestorImagenes
+from vistas.TarjetaPelicula import PoolTarjetas
 
 class VistaSinopsis(QMainWindow):
     """
@@ -29,8 +30,8 @@ class VistaSinopsis(QMainWindow):
         self.gestor_ventanas = gestor_ventanas
         self.gestor_peliculas = gestor_peliculas
 
-        # Inicializar active_requests para manejar imágenes de recomendaciones
-        self.active_requests = {}
+        # Caché de pósteres compartida por todas las vistas
+        self.gestor_imagenes = GestorImagenes.instancia()
 
         try:
             # Crear un área de scroll para todo el contenido
@@ -84,17 +85,32 @@ class VistaSinopsis(QMainWindow):
             self.synopsis_text.setReadOnly(True)
             self.layout.addWidget(self.synopsis_text)
 
-            # Detalles adicionales centrados
+            # Detalles adicionales centrados, a todo el ancho para que no se recorten al cambiar de película
             self.details_layout = QVBoxLayout()
             self.details_widget = QWidget()
             self.details_widget.setLayout(self.details_layout)
-            self.layout.addWidget(self.details_widget, alignment=Qt.AlignCenter)
+            self.layout.addWidget(self.details_widget)
+
+            # Etiquetas de los detalles, creadas una vez y reutilizadas en cada película
+            self.detail_labels = {}
+            for campo in ("Año", "Género", "Director", "Duración"):
+                detail_label = QLabel()
+                detail_label.setStyleSheet("font-size: 18px; color: white; text-align: center;")
+                detail_label.setAlignment(Qt.AlignCenter)
+                self.details_layout.addWidget(detail_label)
+                self.detail_labels[campo] = detail_label
 
             # Título para las recomendaciones
             self.recommendations_label = QLabel("Otras Películas Que Podrían Interesarte")
             self.recommendations_label.setAlignment(Qt.AlignCenter)
             self.layout.addWidget(self.recommendations_label)
 
+            # Mensaje cuando no hay recomendaciones
+            self.label_sin_recomendaciones = QLabel()
+            self.label_sin_recomendaciones.setStyleSheet("font-size: 18px; color: white;")
+            self.label_sin_recomendaciones.hide()
+            self.layout.addWidget(self.label_sin_recomendaciones)
+
             # Área de recomendaciones
             self.recommendations_scroll_area = QScrollArea()
             self.recommendations_scroll_area.setWidgetResizable(True)
@@ -107,6 +123,10 @@ class VistaSinopsis(QMainWindow):
             # Diseño de cuadrícula para las recomendaciones
             self.recommendations_layout = QGridLayout(self.recommendations_content)
 
+            # Tarjetas de las recomendaciones: se reutilizan al cambiar de película
+            self.pool_tarjetas = PoolTarjetas(self.mostrar_pelicula_recomendada)
+            self.tarjetas = []
+
             # Botón para volver
             self.back_button = QPushButton("Volver")
             self.back_button.clicked.connect(self.volver)
@@ -130,14 +150,7 @@ class VistaSinopsis(QMainWindow):
             self.title_label.setText(detalles.get("title", "Título no disponible"))
             self.synopsis_text.setText(detalles.get("synopsis", "Sinopsis no disponible"))
 
-            # Limpiar detalles adicionales
-            while self.details_layout.count():
-                item = self.details_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-
-            # Añadir nuevos detalles centrados
+            # Actualizar los detalles adicionales
             detalles_items = {
                 "Año": detalles.get("year", "No disponible"),
                 "Género": detalles.get("genre", "No disponible"),
@@ -146,10 +159,7 @@ class VistaSinopsis(QMainWindow):
             }
 
             for label, value in detalles_items.items():
-                detail_label = QLabel(f"{label}: {value}")
-                detail_label.setStyleSheet("font-size: 18px; color: white; text-align: center;")
-                detail_label.setAlignment(Qt.AlignCenter)
-                self.details_layout.addWidget(detail_label)
+                self.detail_labels[label].setText(f"{label}: {value}")
 
             # Mostrar recomendaciones después de cargar los detalles de la película
             self.mostrar_recomendaciones(detalles.get("title"))
@@ -170,86 +180,48 @@ class VistaSinopsis(QMainWindow):
     """
     def mostrar_recomendaciones(self, title):
         try:
-            # Limpiar la cuadrícula de recomendaciones
-            while self.recommendations_layout.count():
-                item = self.recommendations_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
+            # Cancelar las descargas pendientes de las recomendaciones anteriores
+            self.gestor_imagenes.cancelar(self)
 
             # Obtener recomendaciones (máximo 8 películas)
             recomendaciones = self.gestor_peliculas.recomendar_peliculas(title)[:8]
+            self._ajustar_tarjetas(len(recomendaciones))
 
             if recomendaciones:
-                row, col = 0, 0
-                for rec in recomendaciones:
+                self.label_sin_recomendaciones.hide()
+                for tarjeta, rec in zip(self.tarjetas, recomendaciones):
                     titulo = rec["titulo"]
                     similitud = rec["similitud"]
-                    image_button = QPushButton()
-                    image_button.setFixedSize(150, 225)  # Tamaño fijo para la imagen
-                    image_url = self.gestor_peliculas.obtener_detalles_pelicula(titulo).get('poster_image_y', '')
-
-                    if image_url and QtCore.QUrl(image_url).isValid():
-                        manager = QtNetwork.QNetworkAccessManager(self)
-                        request = QtNetwork.QNetworkRequest(QtCore.QUrl(image_url))
-                        reply = manager.get(request)
-
-                        # Asociar el reply al botón
-                        self.active_requests[reply] = image_button
-
-                        # Conectar el manejador general
-                        manager.finished.connect(self.onFinished)
-                    else:
-                        image_button.setText("Sin Imagen")
-
-                    image_button.clicked.connect(lambda _, p=titulo: self.mostrar_pelicula_recomendada(p))
-
-                    title_label = QLabel(f"{titulo}\n(Similitud: {similitud:.2f})")
-                    title_label.setAlignment(Qt.AlignCenter)
-                    title_label.setWordWrap(True)
-                    title_label.setFixedWidth(150)
-
-                    self.recommendations_layout.addWidget(image_button, row, col)
-                    self.recommendations_layout.addWidget(title_label, row + 1, col)
-
-                    col += 1
-                    if col == 4:
-                        col = 0
-                        row += 2
+                    image_url = rec.get('poster_image_y', '')
+                    tarjeta.asignar(titulo, f"{titulo}\n(Similitud: {similitud:.2f})", image_url, "Sin Imagen", grupo=self)
             else:
                 raise ValueError("No se encontraron recomendaciones para esta película.")
             
         except ValueError as ve:
-            no_recommendation_label = QLabel(str(ve))
-            no_recommendation_label.setStyleSheet("font-size: 18px; color: white;")
-            self.recommendations_layout.addWidget(no_recommendation_label)
+            self.label_sin_recomendaciones.setText(str(ve))
+            self.label_sin_recomendaciones.show()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error al cargar recomendaciones: {str(e)}")
 
-    # Método para manejar la finalización de la solicitud de imagen
+    # Método privado para ajustar el número de tarjetas
     """
-    Maneja la finalización de la solicitud de imagen y asigna la imagen al botón correspondiente.
+    Deja en la cuadrícula el número de tarjetas indicado, en filas de 4. Las que sobran
+    vuelven a la reserva y las que faltan se toman de ella; las demás se quedan donde están.
 
     Parámetros:
-        - reply (QtNetwork.QNetworkReply): Respuesta de la solicitud de imagen.
-
-    Excepciones manejadas:
-        - Exception: Cualquier error al procesar la imagen.
+        - cantidad (int): Número de tarjetas necesarias.
     """
-    @QtCore.pyqtSlot(QtNetwork.QNetworkReply)
-    def onFinished(self, reply):
-        try:
-            button = self.active_requests.pop(reply, None)
-            if button:
-                image = QtGui.QImage.fromData(reply.readAll())
-                if not image.isNull():
-                    button.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image).scaled(150, 225, QtCore.Qt.KeepAspectRatio)))
-                    button.setIconSize(button.size())
-                else:
-                    button.setText("Imagen no disponible")
-            reply.deleteLater()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error al cargar imagen: {str(e)}")
+    def _ajustar_tarjetas(self, cantidad):
+        while len(self.tarjetas) > cantidad:
+            tarjeta = self.tarjetas.pop()
+            self.recommendations_layout.removeWidget(tarjeta)
+            self.pool_tarjetas.liberar(tarjeta)
+        while len(self.tarjetas) < cantidad:
+            posicion = len(self.tarjetas)
+            tarjeta = self.pool_tarjetas.obtener()
+            self.recommendations_layout.addWidget(tarjeta, posicion // 4, posicion % 4)
+            tarjeta.show()
+            self.tarjetas.append(tarjeta)
 
     # Método para mostrar una película recomendada
     """
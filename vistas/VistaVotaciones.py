@@ -1,7 +1,6 @@
-from PyQt5 import QtCore, QtGui, QtNetwork
-from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QScrollArea, QGridLayout, QHBoxLayout, QLineEdit, QMessageBox, QComboBox
-from PyQt5.QtCore import Qt
-from gestores.GestorPeliculas import GestorPeliculas
+from PyQt5.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QLineEdit, QMessageBox, QComboBox
+from PyQt5.QtCore import Qt, QTimer
+from vistas.GridPosters import GridPosters
 
 class VistaVotaciones(QMainWindow):
     """
@@ -29,8 +28,8 @@ class VistaVotaciones(QMainWindow):
         # Referencia al gestor de ventanas
         self.gestor_ventanas = gestor_ventanas
 
-        # Referencia al gestor de películas
-        self.gestor_peliculas = GestorPeliculas()
+        # Referencia al gestor de películas, compartido por todas las vistas
+        self.gestor_peliculas = gestor_ventanas.gestor_peliculas
 
         # Nombre de usuario
         self.username = username
@@ -75,17 +74,19 @@ class VistaVotaciones(QMainWindow):
         self.button_buscar.clicked.connect(self.buscar_peliculas)
         search_layout.addWidget(self.button_buscar)
 
-        # Crear un área de desplazamiento para mostrar películas
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.layout.addWidget(self.scroll_area)
+        # Búsqueda incremental: se lanza cuando se deja de escribir durante 150 ms
+        self.temporizador_busqueda = QTimer(self)
+        self.temporizador_busqueda.setSingleShot(True)
+        self.temporizador_busqueda.setInterval(150)
+        self.temporizador_busqueda.timeout.connect(self.buscar_incremental)
+        self.search_input.textChanged.connect(lambda _: self.temporizador_busqueda.start())
+        self._ultima_busqueda = ''
+        self._peliculas_iniciales = []
 
-        # Crear un widget de contenido para el área de desplazamiento
-        self.scroll_content = QWidget()
-        self.scroll_area.setWidget(self.scroll_content)
-
-        # Crear un diseño de cuadrícula para el contenido
-        self.grid_layout = QGridLayout(self.scroll_content)
+        # Cuadrícula virtualizada de pósteres
+        self.grid = GridPosters("Imagen no disponible")
+        self.grid.pelicula_seleccionada.connect(self.seleccionar_pelicula)
+        self.layout.addWidget(self.grid)
 
         # Campo de texto para mostrar la película seleccionada
         self.selected_movie_edit = QLineEdit()
@@ -150,7 +151,7 @@ class VistaVotaciones(QMainWindow):
 
     # Método para cargar películas en la cuadrícula
     """
-    Carga las películas proporcionadas en el diseño de cuadrícula.
+    Carga las películas proporcionadas en la cuadrícula de pósteres.
 
     Parámetros:
         - peliculas (list): Lista de diccionarios que contienen información de las películas.
@@ -164,63 +165,10 @@ class VistaVotaciones(QMainWindow):
             QMessageBox.warning(self, "Advertencia", "No hay películas disponibles para mostrar.")
             return
 
-        self.active_requests = {}
-        row, col = 0, 0
-        for pelicula in peliculas:
-            try:
-                image_button = QPushButton()
-                image_button.setFixedSize(150, 225)
-                image_url = pelicula.get('poster_image_y', '')
-
-                if image_url and QtCore.QUrl(image_url).isValid():
-                    manager = QtNetwork.QNetworkAccessManager(self)
-                    request = QtNetwork.QNetworkRequest(QtCore.QUrl(image_url))
-                    reply = manager.get(request)
-                    self.active_requests[reply] = image_button
-                    manager.finished.connect(self.onFinished)
-                else:
-                    image_button.setText("Imagen no disponible")
-
-                image_button.clicked.connect(lambda _, p=pelicula['title']: self.seleccionar_pelicula(p))
-
-                title_label = QLabel(pelicula['title'])
-                title_label.setAlignment(Qt.AlignCenter)
-                title_label.setWordWrap(True)
-                title_label.setFixedWidth(150)
-
-                self.grid_layout.addWidget(image_button, row, col)
-                self.grid_layout.addWidget(title_label, row + 1, col)
-
-                col += 1
-                if col == 4:
-                    col = 0
-                    row += 2
-
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Error al cargar película: {str(e)}")
-
-    # Método para manejar la finalización de solicitudes de imagen
-    """
-    Maneja la finalización de las solicitudes de imagen asociadas a las películas.
-
-    Parámetros:
-        - reply (QtNetwork.QNetworkReply): Respuesta de la solicitud de imagen.
-
-    Excepciones manejadas:
-        - Exception: Cualquier error al procesar la imagen recibida.
-    """
-    @QtCore.pyqtSlot(QtNetwork.QNetworkReply)
-    def onFinished(self, reply):
-        button = self.active_requests.pop(reply, None)
-        if button:
-            image = QtGui.QImage.fromData(reply.readAll())
-            if not image.isNull():
-                button.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image).scaled(150, 225, QtCore.Qt.KeepAspectRatio)))
-                button.setIconSize(button.size())
-            else:
-                button.setText("Imagen no disponible")
-        reply.deleteLater()
-
+        try:
+            self.grid.mostrar(self._items_grid(peliculas))
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error al cargar película: {str(e)}")
 
     # Método para buscar películas
     """
@@ -231,7 +179,9 @@ class VistaVotaciones(QMainWindow):
         - Exception: Si ocurre un error durante la búsqueda o al cargar los resultados.
     """
     def buscar_peliculas(self):
+        self.temporizador_busqueda.stop()  # La búsqueda explícita sustituye a la incremental pendiente
         nombre = self.search_input.text().strip()  # Eliminar espacios en blanco al inicio y al final
+        self._ultima_busqueda = nombre
         if not nombre:
             # Si no hay texto, limpia la cuadrícula y muestra todas las películas
             self.mostrar_peliculas_al_azar()
@@ -280,6 +230,38 @@ class VistaVotaciones(QMainWindow):
         mensaje = self.gestor_peliculas.votar_pelicula(self.username, pelicula, valoracion)
         QMessageBox.information(self, "Valoración Enviada", mensaje)
 
+    # Método para la búsqueda incremental
+    """
+    Busca mientras se escribe, cuando vence el temporizador de la búsqueda. Las pulsaciones
+    que llegan antes reinician el temporizador, así que solo se ejecuta la última consulta.
+    La cuadrícula se actualiza por diferencias y, sin texto, vuelve a las películas iniciales.
+
+    Excepciones manejadas:
+        - Exception: Cualquier error durante la búsqueda.
+    """
+    def buscar_incremental(self):
+        nombre = self.search_input.text().strip()
+        if nombre == self._ultima_busqueda:
+            return
+        self._ultima_busqueda = nombre
+
+        try:
+            peliculas = self.gestor_peliculas.buscar_peliculas2(nombre) if nombre else self._peliculas_iniciales
+            self.grid.actualizar(self._items_grid(peliculas))
+        except Exception as e:
+            print(f"Error en la búsqueda incremental: {e}")
+
+    # Método privado para preparar las películas para la cuadrícula
+    """
+    Convierte los resultados del gestor de películas en filas de la cuadrícula de pósteres.
+    """
+    @staticmethod
+    def _items_grid(peliculas):
+        return [
+            {'titulo': p['title'], 'texto': p['title'], 'url': p.get('poster_image_y', '')}
+            for p in peliculas
+        ]
+
     # Método para mostrar películas al azar
     """
     Muestra 12 películas al azar en la cuadrícula.
@@ -291,20 +273,17 @@ class VistaVotaciones(QMainWindow):
         try:
             peliculas_al_azar = self.gestor_peliculas.peliculas_al_azar()
             peliculas = self.gestor_peliculas.buscar_peliculas(peliculas_al_azar)
+            self._peliculas_iniciales = peliculas
             self.cargar_peliculas(peliculas)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Ocurrió un error al cargar películas al azar: {str(e)}")
 
     # Método para limpiar el diseño de cuadrícula
     """
-    Elimina todos los widgets del diseño de cuadrícula.
+    Vacía la cuadrícula y cancela sus descargas de pósteres pendientes.
     """
     def limpiar_grid_layout(self):
-        while self.grid_layout.count():
-            item = self.grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.deleteLater()
+        self.grid.limpiar()
 
     # Método para mostrar la vista principal
     """